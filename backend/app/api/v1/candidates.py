@@ -1,21 +1,23 @@
 from typing import List, Optional
 import re
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
 
 try:
     from ...db.session import get_session  # type: ignore
     from ...db.models.models import SearchCandidate, Track, SearchProvider  # type: ignore
-    from ...schemas.models import SearchCandidateCreate, SearchCandidateRead  # type: ignore
+    from ...schemas.models import SearchCandidateCreate, SearchCandidateRead, TrackRead  # type: ignore
+    from ...utils.json_response import construct_model  # type: ignore
     from ...utils.normalize import duration_delta_sec, normalize_track  # type: ignore
     from ...utils.images import youtube_thumbnail_url  # type: ignore
     from ...utils.youtube_search import get_score_components  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
     from db.models.models import SearchCandidate, Track, SearchProvider  # type: ignore
-    from schemas.models import SearchCandidateCreate, SearchCandidateRead  # type: ignore
+    from schemas.models import SearchCandidateCreate, SearchCandidateRead, TrackRead  # type: ignore
+    from utils.json_response import construct_model  # type: ignore
     from utils.normalize import duration_delta_sec, normalize_track  # type: ignore
     from utils.images import youtube_thumbnail_url  # type: ignore
     from utils.youtube_search import get_score_components  # type: ignore
@@ -23,17 +25,25 @@ except Exception:  # pragma: no cover
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
 
-def _attach_computed(track: Optional[Track], cand: SearchCandidate) -> SearchCandidateRead:
-    # Build pydantic object manually to inject computed field
-    base = SearchCandidateRead.model_validate(cand, from_attributes=True)
+def _attach_computed(
+    track: Optional[Track],
+    cand: SearchCandidate,
+    track_read: Optional[TrackRead] = None,
+) -> SearchCandidateRead:
+    """Build the read model of a stored candidate with its computed fields.
+
+    Rows come from the database, so models are constructed without validation. Callers
+    building many candidates of one track can pass its ``track_read`` once.
+    """
+    base = construct_model(SearchCandidateRead, cand)
     
     # Include track information
-    if track:
-        from ...schemas.models import TrackRead
-        base.track = TrackRead.model_validate(track, from_attributes=True)
+    if track_read is not None:
+        base.track = track_read
+    elif track:
+        base.track = construct_model(TrackRead, track)
     elif hasattr(cand, 'track') and cand.track:
-        from ...schemas.models import TrackRead
-        base.track = TrackRead.model_validate(cand.track, from_attributes=True)
+        base.track = construct_model(TrackRead, cand.track)
     
     if (track and track.duration_ms is not None) and (cand.duration_sec is not None):
         delta = duration_delta_sec(track.duration_ms, cand.duration_sec * 1000)
@@ -265,7 +275,8 @@ async def choose_candidate(candidate_id: int, session: AsyncSession = Depends(ge
     if not cand:
         raise HTTPException(status_code=404, detail="Candidate not found")
     # Clear existing chosen for this track
-    stmt = select(SearchCandidate).where(SearchCandidate.track_id == cand.track_id)
+    track_id = cand.track_id
+    stmt = lambda_stmt(lambda: select(SearchCandidate).where(SearchCandidate.track_id == track_id))
     result = await session.execute(stmt)
     for other in result.scalars():
         other.chosen = (other.id == cand.id)
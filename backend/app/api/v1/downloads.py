@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 import os
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -15,15 +15,22 @@ try:  # package mode
     from ...db.session import get_session  # type: ignore
     from ...db.models.models import Download, DownloadStatus, DownloadProvider, Track, SearchCandidate, LibraryFile  # type: ignore
     from ...schemas.models import DownloadRead  # type: ignore
+    from ...worker.downloads_worker import DownloadQueue  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
     from db.models.models import Download, DownloadStatus, DownloadProvider, Track, SearchCandidate, LibraryFile  # type: ignore
     from schemas.models import DownloadRead  # type: ignore
+    from worker.downloads_worker import DownloadQueue  # type: ignore
 
 
 router = APIRouter(prefix="/downloads", tags=["downloads"])
 
 
+def _download_queue(request: Request) -> Optional[DownloadQueue]:
+    """Return the queue started by the app lifespan (None when the worker is disabled or stopped)."""
+    return getattr(request.app.state, "download_queue", None)
+
+
 @router.get("/", response_model=List[DownloadRead])
 async def list_downloads(
     session: AsyncSession = Depends(get_session),
@@ -162,22 +169,18 @@ async def configure_logs(
 
 
 @router.get("/status")
-async def get_worker_status():
+async def get_worker_status(request: Request):
     """Get the current status of the download worker and queue."""
-    try:
-        from ...worker import downloads_worker as dw  # type: ignore
-    except Exception:  # pragma: no cover
-        from worker import downloads_worker as dw  # type: ignore
-    
-    worker_running = dw.download_queue is not None
+    dq = _download_queue(request)
+    worker_running = dq is not None
     queue_size = 0
     active_tasks = 0
     concurrency = 0
     
-    if dw.download_queue:
-        queue_size = dw.download_queue.queue.qsize()
-        active_tasks = len([t for t in dw.download_queue._tasks if not t.done()])
-        concurrency = dw.download_queue.concurrency
+    if dq:
+        queue_size = dq.queue.qsize()
+        active_tasks = len([t for t in dq._tasks if not t.done()])
+        concurrency = dq.concurrency
     
     return {
         "worker_running": worker_running,
@@ -201,15 +204,34 @@ async def get_download(download_id: int, session: AsyncSession = Depends(get_ses
 
 @router.post("/enqueue", response_model=DownloadRead)
 async def enqueue_download(
+    request: Request,
     track_id: int,
     candidate_id: Optional[int] = None,
     provider: DownloadProvider = DownloadProvider.yt_dlp,
     force: bool = Query(False, description="Bypass duplicate prevention to force download"),
     session: AsyncSession = Depends(get_session),
 ):
+    return await create_download(
+        track_id=track_id,
+        candidate_id=candidate_id,
+        provider=provider,
+        force=force,
+        session=session,
+        state=request.app.state,
+    )
+
+
+async def create_download(
+    track_id: int,
+    candidate_id: Optional[int],
+    provider: DownloadProvider,
+    force: bool,
+    session: AsyncSession,
+    state: Any,
+) -> Download:
+    """Create a download row and hand it to the queue on ``state.download_queue`` if one is running."""
     # Validate references exist
-    track = await session.get(Track, track_id)
-    if not track:
+    if await session.scalar(select(Track.id).where(Track.id == track_id)) is None:
         raise HTTPException(status_code=404, detail="Track not found")
     cand = None
     if candidate_id is not None:
@@ -291,9 +313,9 @@ async def enqueue_download(
         pass
     # Push to in-memory queue if worker is running
     try:  # pragma: no cover
-        from ...worker import downloads_worker as dw  # type: ignore
-        if dw.download_queue:
-            await dw.download_queue.enqueue(dl.id)
+        dq = getattr(state, "download_queue", None)
+        if dq:
+            await dq.enqueue(dl.id)
     except Exception:
         pass
     return dl
@@ -322,14 +344,11 @@ class _WorkerRestartBody(BaseModel):
 
 
 @router.post("/_restart_worker", include_in_schema=False)
-async def restart_worker(payload: _WorkerRestartBody):
-    try:  # pragma: no cover
-        from ...worker import downloads_worker as dw  # type: ignore
-    except Exception:  # pragma: no cover
-        from worker import downloads_worker as dw  # type: ignore
+async def restart_worker(payload: _WorkerRestartBody, request: Request):
     try:
-        if dw.download_queue:
-            await dw.download_queue.stop()
+        dq = _download_queue(request)
+        if dq:
+            await dq.stop()
     except Exception:
         pass
     concurrency = max(1, int(payload.concurrency))
@@ -337,19 +356,18 @@ async def restart_worker(payload: _WorkerRestartBody):
         simulate_seconds = float(payload.simulate_seconds)
     except Exception:
         simulate_seconds = 0.0
-    dw.download_queue = dw.DownloadQueue(concurrency=concurrency, simulate_seconds=simulate_seconds)
-    await dw.download_queue.start()
+    request.app.state.download_queue = DownloadQueue(concurrency=concurrency, simulate_seconds=simulate_seconds)
+    await request.app.state.download_queue.start()
     return {"ok": True, "concurrency": concurrency, "simulate_seconds": simulate_seconds}
 
 
 @router.post("/_wait_idle", include_in_schema=False)
-async def wait_idle(timeout: float = 3.0, track_id: Optional[int] = None, stop_after: bool = False):
-    try:  # pragma: no cover
-        from ...worker import downloads_worker as dw  # type: ignore
-    except Exception:  # pragma: no cover
-        from worker import downloads_worker as dw  # type: ignore
-    if dw.download_queue:
-        await dw.download_queue.wait_idle(timeout=timeout)
+async def wait_idle(
+    request: Request, timeout: float = 3.0, track_id: Optional[int] = None, stop_after: bool = False
+):
+    dq = _download_queue(request)
+    if dq:
+        await dq.wait_idle(timeout=timeout)
         # Optionally also wait for DB to reflect terminal states
         if track_id is not None:
             import asyncio
@@ -368,18 +386,18 @@ async def wait_idle(timeout: float = 3.0, track_id: Optional[int] = None, stop_a
                 await asyncio.sleep(0.05)
         if stop_after:
             try:
-                await dw.download_queue.stop()
+                await dq.stop()
             finally:
-                dw.download_queue = None
+                request.app.state.download_queue = None
             return {"ok": True, "stopped": True}
-        qsize = getattr(getattr(dw.download_queue, "queue", None), "qsize", lambda: 0)()
-        tasks = len(getattr(dw.download_queue, "_tasks", []) or [])
+        qsize = getattr(getattr(dq, "queue", None), "qsize", lambda: 0)()
+        tasks = len(getattr(dq, "_tasks", []) or [])
         return {"ok": True, "qsize": qsize, "tasks": tasks}
     return {"ok": False}
 
 
 @router.post("/stop_all")
-async def stop_all_downloads(session: AsyncSession = Depends(get_session)):
+async def stop_all_downloads(request: Request, session: AsyncSession = Depends(get_session)):
     """Stop the background worker and mark queued downloads as skipped.
 
     Running downloads will be interrupted best-effort by stopping the worker tasks.
@@ -398,14 +416,11 @@ async def stop_all_downloads(session: AsyncSession = Depends(get_session)):
 
     # Stop worker if running
     worker_stopped = False
-    try:  # pragma: no cover
-        from ...worker import downloads_worker as dw  # type: ignore
-    except Exception:  # pragma: no cover
-        from worker import downloads_worker as dw  # type: ignore
     try:
-        if dw.download_queue:
-            await dw.download_queue.stop()
-            dw.download_queue = None
+        dq = _download_queue(request)
+        if dq:
+            await dq.stop()
+            request.app.state.download_queue = None
             worker_stopped = True
     except Exception:
         worker_stopped = False
@@ -413,27 +428,23 @@ async def stop_all_downloads(session: AsyncSession = Depends(get_session)):
 
 
 @router.post("/restart_worker")
-async def restart_download_worker():
+async def restart_download_worker(request: Request):
     """Restart the download worker.
     
     This stops the current worker (if running) and starts a new one.
     Useful when downloads are stuck or the worker is unresponsive.
     """
-    try:  # pragma: no cover
-        from ...worker import downloads_worker as dw  # type: ignore
-    except Exception:  # pragma: no cover
-        from worker import downloads_worker as dw  # type: ignore
-    
     # Stop existing worker
     try:
-        if dw.download_queue:
-            await dw.download_queue.stop()
+        dq = _download_queue(request)
+        if dq:
+            await dq.stop()
     except Exception:
         pass
     
     # Start new worker with default settings
-    dw.download_queue = dw.DownloadQueue(concurrency=2, simulate_seconds=0.0)
-    await dw.download_queue.start()
+    request.app.state.download_queue = DownloadQueue(concurrency=2, simulate_seconds=0.0)
+    await request.app.state.download_queue.start()
     
     return {"ok": True, "message": "Download worker restarted successfully"}
 
@@ -55,8 +55,7 @@ async def list_identities(
 @router.post("/", response_model=TrackIdentityRead)
 async def create_identity(payload: TrackIdentityCreate, session: AsyncSession = Depends(get_session)):
     # ensure track exists
-    track = await session.get(Track, payload.track_id)
-    if not track:
+    if await session.scalar(select(Track.id).where(Track.id == payload.track_id)) is None:
         raise HTTPException(status_code=404, detail="Track not found")
     identity = TrackIdentity(**payload.model_dump())
     session.add(identity)
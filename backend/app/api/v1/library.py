@@ -21,12 +21,12 @@ from typing import Tuple, Dict, List
 try:
     from ...utils.http_range import parse_http_range, build_content_range_header, pick_audio_mime_from_path  # type: ignore
     from ...core.config import settings  # type: ignore
-    from ...utils.normalize import normalize_track  # type: ignore
+    from ...utils.normalize import normalize_track_cached  # type: ignore
     from ...db.models.models import Track  # type: ignore
 except Exception:  # pragma: no cover
     from utils.http_range import parse_http_range, build_content_range_header, pick_audio_mime_from_path  # type: ignore
     from core.config import settings  # type: ignore
-    from utils.normalize import normalize_track  # type: ignore
+    from utils.normalize import normalize_track_cached  # type: ignore
     from db.models.models import Track  # type: ignore
 
 try:  # package mode
@@ -308,7 +308,7 @@ async def _infer_track_id_from_filename(session: AsyncSession, filename: str) ->
     title = title.strip()
     if not artists or not title:
         return None
-    norm = normalize_track(artists, title)
+    norm = normalize_track_cached(artists, title)
     from sqlalchemy import select as _select, desc as _desc
     res = await session.execute(
         _select(Track)
@@ -334,7 +334,7 @@ def _normalized_key_from_filename(filename: str) -> Optional[Tuple[str, str]]:
     title = title.strip()
     if not artists or not title:
         return None
-    norm = normalize_track(artists, title)
+    norm = normalize_track_cached(artists, title)
     return (norm.normalized_artists, norm.normalized_title)
 
 
@@ -29,8 +29,7 @@ async def create_playlist_track(
     playlist = await session.get(Playlist, payload.playlist_id)
     if not playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
-    track = await session.get(Track, payload.track_id)
-    if not track:
+    if await session.scalar(select(Track.id).where(Track.id == payload.track_id)) is None:
         raise HTTPException(status_code=404, detail="Track not found")
 
     result = await session.execute(
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
 from sqlalchemy import select, and_, delete, func, distinct, case, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,24 +8,24 @@ try:
     from ...db.models.models import Playlist, SourceProvider, SourceAccount, OAuthToken, Track, TrackIdentity, PlaylistTrack  # type: ignore
     from ...schemas.models import PlaylistCreate, PlaylistRead, TrackRead  # type: ignore
     from ...core.config import settings  # type: ignore
-    from ...utils.normalize import normalize_track  # type: ignore
+    from ...utils.normalize import normalize_track_cached  # type: ignore
     from ...db.models.models import LibraryFile  # type: ignore
     from ...db.models.models import SearchCandidate, SearchProvider  # type: ignore
     from ...db.models.models import DownloadProvider  # type: ignore
-    from ...utils.youtube_search import search_youtube  # type: ignore
-    from ...api.v1.downloads import enqueue_download  # type: ignore
+    from ...utils.youtube_search import search_youtube_async  # type: ignore
+    from ...api.v1.downloads import create_download  # type: ignore
     from ...utils.images import youtube_thumbnail_url  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
     from db.models.models import Playlist, SourceProvider, SourceAccount, OAuthToken, Track, TrackIdentity, PlaylistTrack  # type: ignore
     from schemas.models import PlaylistCreate, PlaylistRead, TrackRead  # type: ignore
     from core.config import settings  # type: ignore
-    from utils.normalize import normalize_track  # type: ignore
+    from utils.normalize import normalize_track_cached  # type: ignore
     from db.models.models import LibraryFile  # type: ignore
     from db.models.models import SearchCandidate, SearchProvider  # type: ignore
     from db.models.models import DownloadProvider  # type: ignore
-    from utils.youtube_search import search_youtube  # type: ignore
-    from api.v1.downloads import enqueue_download  # type: ignore
+    from utils.youtube_search import search_youtube_async  # type: ignore
+    from api.v1.downloads import create_download  # type: ignore
     from utils.images import youtube_thumbnail_url  # type: ignore
 
 import os
@@ -201,6 +201,7 @@ async def _process_playlist_download(
     playlist_id: int,
     prefer_extended: bool,
     dry_run: bool,
+    state: Any,
 ):
     """Background task to process playlist downloads without blocking the API."""
     from ...db.session import async_session  # type: ignore
@@ -212,6 +213,7 @@ async def _process_playlist_download(
                 session=session,
                 prefer_extended=prefer_extended,
                 dry_run=dry_run,
+                state=state,
             )
             await session.commit()
         except Exception as e:
@@ -225,6 +227,7 @@ async def _auto_download_playlist_impl(
     session: AsyncSession,
     prefer_extended: bool,
     dry_run: bool,
+    state: Any,
 ) -> Dict[str, Any]:
     """Implementation of playlist auto-download logic."""
     pl = await session.get(Playlist, playlist_id)
@@ -279,7 +282,7 @@ async def _auto_download_playlist_impl(
             chosen_used += 1
         else:
             # Perform YouTube search and pick top result
-            scored = search_youtube(tr.artists, tr.title, tr.duration_ms, prefer_extended=prefer_extended)
+            scored = await search_youtube_async(tr.artists, tr.title, tr.duration_ms, prefer_extended=prefer_extended)
             top = scored[0] if scored else None
             # Record search attempt result count
             try:
@@ -349,12 +352,13 @@ async def _auto_download_playlist_impl(
 
         # Enqueue download (reuses duplicate prevention inside)
         try:
-            dl = await enqueue_download(
+            dl = await create_download(
                 track_id=tr.id,
                 candidate_id=cand_id,
                 provider=DownloadProvider.yt_dlp,
                 force=False,
                 session=session,
+                state=state,
             )
             # Count only when queued or marked already/done
             if getattr(dl, "status", None) is not None:
@@ -382,6 +386,7 @@ async def _auto_download_playlist_impl(
 
 @router.post("/{playlist_id}/auto_download")
 async def auto_download_playlist(
+    request: Request,
     playlist_id: int,
     background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
@@ -414,6 +419,7 @@ async def auto_download_playlist(
             session=session,
             prefer_extended=prefer_extended,
             dry_run=dry_run,
+            state=request.app.state,
         )
     
     # Count tracks to provide immediate feedback
@@ -429,6 +435,7 @@ async def auto_download_playlist(
         playlist_id=playlist_id,
         prefer_extended=prefer_extended,
         dry_run=dry_run,
+        state=request.app.state,
     )
     
     return {
@@ -441,6 +448,7 @@ async def auto_download_playlist(
 
 @router.post("/{playlist_id}/retry_not_found")
 async def retry_not_found_tracks(
+    request: Request,
     playlist_id: int,
     background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
@@ -488,6 +496,7 @@ async def retry_not_found_tracks(
     background_tasks.add_task(
         _process_playlist_retry_not_found,
         playlist_id=playlist_id,
+        state=request.app.state,
     )
 
     return {
@@ -501,12 +510,14 @@ async def retry_not_found_tracks(
 
 async def _process_playlist_retry_not_found(
     playlist_id: int,
+    state: Any,
 ):
     """
     Background task to retry searching for tracks that were previously not found.
     
     Args:
         playlist_id: The playlist ID
+        state: App state holding the running download queue
     """
     from ...db.session import async_session  # type: ignore
     
@@ -550,7 +561,7 @@ async def _process_playlist_retry_not_found(
                     await session.flush()
 
                     # Search YouTube for the track
-                    scored = search_youtube(
+                    scored = await search_youtube_async(
                         track.artists,
                         track.title,
                         track.duration_ms,
@@ -600,12 +611,13 @@ async def _process_playlist_retry_not_found(
 
                     # Enqueue download
                     try:
-                        await enqueue_download(
+                        await create_download(
                             track_id=track.id,
                             candidate_id=sc.id,
                             provider=DownloadProvider.yt_dlp,
                             force=False,
                             session=session,
+                            state=state,
                         )
                         retried += 1
                     except HTTPException:
@@ -983,7 +995,7 @@ async def spotify_sync_playlists(
                 # Normalize if changed
                 after = (track.title, track.artists, track.album, track.duration_ms, track.isrc, track.release_date)
                 if after != before:
-                    n = normalize_track(track.artists, track.title)
+                    n = normalize_track_cached(track.artists, track.title)
                     track.normalized_artists = n.normalized_artists
                     track.normalized_title = n.normalized_title
                     updated += 1
@@ -994,7 +1006,7 @@ async def spotify_sync_playlists(
                         track.cover_url = best.get("url")
             else:
                 # Create new track and identity
-                n = normalize_track(artists_names, title)
+                n = normalize_track_cached(artists_names, title)
                 track = Track(
                     title=title or "",
                     artists=artists_names or "",
@@ -2,15 +2,103 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from pathlib import Path
+import asyncio
 import os
+import re
+import shutil
+import subprocess
+from itertools import islice
 from typing import Optional
 
 router = APIRouter(prefix="/settings", tags=["Settings"])
 
+# Required cookies for YouTube age-restricted content
+REQUIRED_COOKIES = ("__Secure-1PSID", "__Secure-3PSID", "LOGIN_INFO")
+IMPORTANT_COOKIES = ("SID", "HSID", "SSID", "APISID", "SAPISID")
+_REQUIRED_COOKIE_SET = frozenset(REQUIRED_COOKIES)
+_IMPORTANT_COOKIE_SET = frozenset(IMPORTANT_COOKIES)
+
+# A line that is neither blank nor a comment (leading "#")
+_ENTRY_LINE_RE = re.compile(rb"(?m)^(?!#)[ \t\r\f\v]*[^\s]")
+# A Netscape cookie line: domain, flag, path, secure, expiration, name, value (tab-separated).
+# Leading/trailing whitespace is ignored, so at least 6 tabs must sit between non-blank characters.
+_NETSCAPE_LINE_RE = re.compile(r"(?m)^[^\S\n]*[^\s#](?:[^\t\n]*\t){6}[^\n]*[^\s]")
+# Number of lines returned by the preview endpoint
+_PREVIEW_LINES = 20
+
+
+def _count_entry_lines(data: bytes) -> int:
+    """Count non-blank, non-comment lines in a single scan of the raw file bytes."""
+    return len(_ENTRY_LINE_RE.findall(data))
+
+
+# Parsed results per cookies file path, reused while the file's (mtime_ns, size) is unchanged
+_STATUS_CACHE: dict[str, tuple[tuple[int, int], "CookiesStatus"]] = {}
+_CHECK_CACHE: dict[str, tuple[tuple[int, int], tuple[tuple[str, ...], tuple[str, ...], int]]] = {}
+
+
+def _clear_cookies_caches() -> None:
+    _STATUS_CACHE.clear()
+    _CHECK_CACHE.clear()
+
+
+def _stat_key(cookies_path: Path) -> Optional[tuple[int, int]]:
+    """Return the (mtime_ns, size) cache key of the file, or None when it is missing."""
+    try:
+        st = cookies_path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _scan_cookie_names_cached(cookies_path: Path) -> tuple[tuple[str, ...], tuple[str, ...], int]:
+    key = _stat_key(cookies_path)
+    cached = _CHECK_CACHE.get(str(cookies_path))
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1]
+    found_required, found_important, total_cookies = _scan_cookie_names(cookies_path)
+    result = (tuple(found_required), tuple(found_important), total_cookies)
+    if key is not None:
+        _CHECK_CACHE[str(cookies_path)] = (key, result)
+    return result
+
+
+def _scan_cookie_names(cookies_path: Path) -> tuple[list[str], list[str], int]:
+    """Return (found_required, found_important, total_cookies) from a Netscape cookies file."""
+    found_required: list[str] = []
+    found_important: list[str] = []
+    total_cookies = 0
+    with open(cookies_path, "r", encoding="utf-8", errors="ignore", buffering=1 << 16) as f:
+        for line in f:
+            if line[0] == "#" or line.isspace():
+                continue
+            # Netscape format: only the first 6 fields are needed to reach the cookie name
+            parts = line.split("\t", 6)
+            if len(parts) < 7:
+                continue
+            cookie_name = parts[5]
+            total_cookies += 1
+            if cookie_name in _REQUIRED_COOKIE_SET:
+                found_required.append(cookie_name)
+            elif cookie_name in _IMPORTANT_COOKIE_SET:
+                found_important.append(cookie_name)
+    return found_required, found_important, total_cookies
+
+
+# Resolved cookies file path (inside container or local); the upload/delete endpoints update it
+# when they change the env var
+_CACHED_COOKIES_PATH: Optional[Path] = None
+
 
-# Default cookies file path (inside container or local)
 def _get_cookies_file_path() -> Path:
-    """Get the path to the cookies file."""
+    """Get the path to the cookies file, resolving it from the environment on first use."""
+    global _CACHED_COOKIES_PATH
+    if _CACHED_COOKIES_PATH is None:
+        _CACHED_COOKIES_PATH = _resolve_cookies_file_path()
+    return _CACHED_COOKIES_PATH
+
+
+def _resolve_cookies_file_path() -> Path:
     env_path = os.environ.get("YT_DLP_COOKIES_FILE")
     if env_path:
         return Path(env_path)
@@ -37,25 +125,36 @@ class CookiesUpload(BaseModel):
 async def get_cookies_status():
     """Get the current status of YouTube cookies configuration."""
     cookies_path = _get_cookies_file_path()
-    file_exists = cookies_path.exists()
+    # File I/O runs in a worker thread so concurrent requests are not blocked
+    return await asyncio.to_thread(_read_cookies_status, cookies_path)
+
+
+def _read_cookies_status(cookies_path: Path) -> CookiesStatus:
+    key = _stat_key(cookies_path)
+    if key is None:
+        return CookiesStatus(configured=False, file_path=str(cookies_path), file_exists=False)
+    
+    cached = _STATUS_CACHE.get(str(cookies_path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
     
+    file_size = key[1]
     line_count = None
-    file_size = None
-    if file_exists:
-        try:
-            file_size = cookies_path.stat().st_size
-            with open(cookies_path, "r", encoding="utf-8", errors="ignore") as f:
-                line_count = sum(1 for line in f if line.strip() and not line.startswith("#"))
-        except Exception:
-            pass
+    try:
+        line_count = _count_entry_lines(cookies_path.read_bytes())
+    except Exception:
+        pass
     
-    return CookiesStatus(
-        configured=file_exists and (file_size or 0) > 0,
+    status = CookiesStatus(
+        configured=file_size > 0,
         file_path=str(cookies_path),
-        file_exists=file_exists,
+        file_exists=True,
         file_size=file_size,
         line_count=line_count,
     )
+    if line_count is not None:
+        _STATUS_CACHE[str(cookies_path)] = (key, status)
+    return status
 
 
 @router.post("/cookies")
@@ -67,25 +166,14 @@ async def upload_cookies(body: CookiesUpload):
     - "Get cookies.txt LOCALLY" for Chrome/Firefox
     - "EditThisCookie" for Chrome
     """
+    global _CACHED_COOKIES_PATH
     if not body.content or not body.content.strip():
         raise HTTPException(status_code=400, detail="Cookie content cannot be empty")
     
     cookies_path = _get_cookies_file_path()
     
-    # Ensure parent directory exists
-    cookies_path.parent.mkdir(parents=True, exist_ok=True)
-    
     # Validate basic format (should start with # or have tab-separated lines)
-    lines = body.content.strip().split("\n")
-    valid_lines = 0
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        # Netscape format: domain, flag, path, secure, expiration, name, value (tab-separated)
-        parts = line.split("\t")
-        if len(parts) >= 7:
-            valid_lines += 1
+    valid_lines = len(_NETSCAPE_LINE_RE.findall(body.content))
     
     if valid_lines == 0:
         raise HTTPException(
@@ -93,15 +181,23 @@ async def upload_cookies(body: CookiesUpload):
             detail="Invalid cookies format. Expected Netscape cookies.txt format with tab-separated fields."
         )
     
-    # Write cookies file
-    try:
+    def _write() -> None:
+        # Ensure parent directory exists
+        cookies_path.parent.mkdir(parents=True, exist_ok=True)
         with open(cookies_path, "w", encoding="utf-8") as f:
             f.write(body.content)
+    
+    # Write cookies file
+    try:
+        await asyncio.to_thread(_write)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to write cookies file: {e}")
+    finally:
+        _clear_cookies_caches()
     
     # Set environment variable for immediate use
     os.environ["YT_DLP_COOKIES_FILE"] = str(cookies_path)
+    _CACHED_COOKIES_PATH = cookies_path
     
     return {
         "success": True,
@@ -114,19 +210,23 @@ async def upload_cookies(body: CookiesUpload):
 @router.delete("/cookies")
 async def delete_cookies():
     """Delete the YouTube cookies file."""
+    global _CACHED_COOKIES_PATH
     cookies_path = _get_cookies_file_path()
     
-    if not cookies_path.exists():
+    if not await asyncio.to_thread(cookies_path.exists):
         return {"success": True, "message": "No cookies file to delete"}
     
     try:
-        cookies_path.unlink()
+        await asyncio.to_thread(cookies_path.unlink)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete cookies file: {e}")
+    finally:
+        _clear_cookies_caches()
     
     # Clear environment variable
     if "YT_DLP_COOKIES_FILE" in os.environ:
         del os.environ["YT_DLP_COOKIES_FILE"]
+    _CACHED_COOKIES_PATH = None
     
     return {"success": True, "message": "Cookies file deleted"}
 
@@ -136,12 +236,15 @@ async def preview_cookies():
     """Preview the first few lines of the cookies file (sanitized)."""
     cookies_path = _get_cookies_file_path()
     
-    if not cookies_path.exists():
+    if not await asyncio.to_thread(cookies_path.exists):
         raise HTTPException(status_code=404, detail="No cookies file found")
     
-    try:
+    def _read_head() -> list[str]:
         with open(cookies_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()[:20]  # First 20 lines
+            return list(islice(f, _PREVIEW_LINES))
+    
+    try:
+        lines = await asyncio.to_thread(_read_head)
         
         # Sanitize: show domain and cookie name but mask the value
         sanitized = []
@@ -170,45 +273,25 @@ async def check_cookies():
     """Check if cookies file contains required YouTube authentication cookies."""
     cookies_path = _get_cookies_file_path()
     
-    if not cookies_path.exists():
+    if not await asyncio.to_thread(cookies_path.exists):
         return {
             "valid": False,
             "error": "No cookies file found",
             "found_cookies": [],
-            "missing_cookies": ["__Secure-1PSID", "__Secure-3PSID", "LOGIN_INFO"],
+            "missing_cookies": list(REQUIRED_COOKIES),
         }
     
-    # Required cookies for YouTube age-restricted content
-    required_cookies = ["__Secure-1PSID", "__Secure-3PSID", "LOGIN_INFO"]
-    important_cookies = ["SID", "HSID", "SSID", "APISID", "SAPISID"]
-    
-    found_required = []
-    found_important = []
-    all_cookie_names = []
-    
     try:
-        with open(cookies_path, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                parts = line.split("\t")
-                if len(parts) >= 7:
-                    cookie_name = parts[5]
-                    all_cookie_names.append(cookie_name)
-                    if cookie_name in required_cookies:
-                        found_required.append(cookie_name)
-                    if cookie_name in important_cookies:
-                        found_important.append(cookie_name)
+        found_required, found_important, total_cookies = await asyncio.to_thread(_scan_cookie_names_cached, cookies_path)
         
-        missing_required = [c for c in required_cookies if c not in found_required]
+        missing_required = [c for c in REQUIRED_COOKIES if c not in found_required]
         
         return {
             "valid": len(missing_required) == 0,
-            "found_required": found_required,
-            "found_important": found_important,
+            "found_required": list(found_required),
+            "found_important": list(found_important),
             "missing_required": missing_required,
-            "total_cookies": len(all_cookie_names),
+            "total_cookies": total_cookies,
             "hint": "Missing __Secure-1PSID or LOGIN_INFO means the cookies won't authenticate. Re-export from browser while logged in." if missing_required else None,
         }
     except Exception as e:
@@ -216,44 +299,53 @@ async def check_cookies():
             "valid": False,
             "error": str(e),
             "found_cookies": [],
-            "missing_cookies": required_cookies,
+            "missing_cookies": list(REQUIRED_COOKIES),
         }
 
 
+# Resolved yt-dlp executable, re-resolved only when the cached binary disappears
+_YTDLP_PATH: Optional[str] = None
+
+
+def _resolve_ytdlp() -> str:
+    global _YTDLP_PATH
+    if _YTDLP_PATH and os.path.isfile(_YTDLP_PATH):
+        return _YTDLP_PATH
+    _YTDLP_PATH = shutil.which("yt-dlp") or "/opt/venv/bin/yt-dlp"
+    return _YTDLP_PATH
+
+
 @router.post("/cookies/test")
 async def test_cookies_with_ytdlp():
     """Test if cookies work by attempting to get video info for an age-restricted video."""
-    import subprocess
-    import shutil
-    
     cookies_path = _get_cookies_file_path()
     
-    if not cookies_path.exists():
+    if not await asyncio.to_thread(cookies_path.exists):
         return {"success": False, "error": "No cookies file configured"}
     
-    # Find yt-dlp
-    ytdlp = shutil.which("yt-dlp")
-    if not ytdlp:
-        ytdlp = "/opt/venv/bin/yt-dlp"
+    ytdlp = await asyncio.to_thread(_resolve_ytdlp)
     
     # Test with an age-restricted video (just get info, don't download)
     test_video = "https://www.youtube.com/watch?v=AnzL4GT_jFg"
     
+    # subprocess.run in a worker thread rather than an asyncio subprocess, which the selector
+    # event loop used on Windows does not support; on timeout it kills and reaps the child
     try:
-        result = subprocess.run(
+        proc = await asyncio.to_thread(
+            subprocess.run,
             [ytdlp, "--cookies", str(cookies_path), "--remote-components", "ejs:github", "--dump-json", "--no-download", test_video],
             capture_output=True,
-            text=True,
             timeout=60,
         )
+        stdout, stderr = proc.stdout, proc.stderr
         
-        if result.returncode == 0:
+        if proc.returncode == 0:
             return {
                 "success": True,
                 "message": "Cookies are working! Age-restricted videos can be downloaded.",
             }
         else:
-            error = result.stderr or result.stdout
+            error = (stderr or stdout).decode("utf-8", errors="replace")
             if "Sign in to confirm your age" in error:
                 return {
                     "success": False,
@@ -1,25 +1,49 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 try:
     from ...db.session import get_session  # type: ignore
-    from ...db.models.models import SourceAccount  # type: ignore
+    from ...db.models.models import SourceAccount, SourceProvider  # type: ignore
     from ...schemas.models import SourceAccountCreate, SourceAccountRead  # type: ignore
+    from ...utils.json_response import orjson_list_response, read_columns  # type: ignore
+    from ...utils.pk_cache import PkCache  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
-    from db.models.models import SourceAccount  # type: ignore
+    from db.models.models import SourceAccount, SourceProvider  # type: ignore
     from schemas.models import SourceAccountCreate, SourceAccountRead  # type: ignore
+    from utils.json_response import orjson_list_response, read_columns  # type: ignore
+    from utils.pk_cache import PkCache  # type: ignore
 
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
+# Serialized accounts for get_account, evicted whenever a SourceAccount row is written through async_session.
+# Writes from elsewhere (raw engine connections, other processes) can be served stale for up to the 30 s TTL.
+_ACCOUNT_CACHE = PkCache(SourceAccount, maxsize=256, ttl=30.0)
+# SourceAccount columns exposed by SourceAccountRead, selected directly by list_accounts
+_ACCOUNT_READ_COLUMNS = read_columns(SourceAccountRead, SourceAccount)
+
 
 @router.get("/accounts", response_model=List[SourceAccountRead])
-async def list_accounts(session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(SourceAccount))
-    return result.scalars().all()
+async def list_accounts(
+    session: AsyncSession = Depends(get_session),
+    provider: Optional[SourceProvider] = Query(None, alias="type", description="Filter by provider type"),
+    enabled: Optional[bool] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum accounts to return; all when omitted"),
+    offset: int = Query(0, ge=0),
+):
+    stmt = select(*_ACCOUNT_READ_COLUMNS)
+    if provider is not None:
+        stmt = stmt.where(SourceAccount.type == provider)
+    if enabled is not None:
+        stmt = stmt.where(SourceAccount.enabled == enabled)
+    stmt = stmt.order_by(SourceAccount.id).offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await session.execute(stmt)
+    return orjson_list_response(SourceAccountRead, result.all())
 
 
 @router.post("/accounts", response_model=SourceAccountRead)
@@ -32,7 +56,12 @@ async def create_account(payload: SourceAccountCreate, session: AsyncSession = D
 
 @router.get("/accounts/{account_id}", response_model=SourceAccountRead)
 async def get_account(account_id: int, session: AsyncSession = Depends(get_session)):
+    cached = _ACCOUNT_CACHE.get(account_id)
+    if cached is not None:
+        return cached
     account = await session.get(SourceAccount, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="SourceAccount not found")
-    return account
+    data = SourceAccountRead.model_validate(account)
+    _ACCOUNT_CACHE.put(account_id, data)
+    return data
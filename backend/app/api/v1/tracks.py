@@ -1,118 +1,208 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import asyncio
+import base64
 import re
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, delete, desc, asc
+import orjson
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, delete, insert, desc, asc, func, or_, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 try:
     from ...db.session import get_session  # type: ignore
     from ...db.models.models import (
+        Playlist,
         Track,
         TrackIdentity,
         SourceProvider,
         SearchCandidate,
         Download,
         DownloadProvider,
+        DownloadStatus,
         PlaylistTrack,
         LibraryFile,
+        track_references,
     )  # type: ignore
     from ...schemas.models import TrackCreate, TrackRead, SearchCandidateRead  # type: ignore
-    from ...utils.normalize import normalize_track, duration_delta_sec  # type: ignore
-    from ...utils.youtube_search import search_youtube  # type: ignore
+    from ...utils.normalize import normalize_track_cached  # type: ignore
+    from ...utils.youtube_search import search_youtube_async, get_score_components  # type: ignore
     from ...utils.images import youtube_thumbnail_url  # type: ignore
-    from ...db.models.models import SearchCandidate, SearchProvider  # type: ignore
+    from ...utils.json_response import (  # type: ignore
+        NDJSON_MEDIA_TYPE,
+        construct_model,
+        not_modified,
+        orjson_dump_model,
+        orjson_list_response,
+        orjson_models_response,
+        orjson_rows_body,
+        read_columns,
+        wants_ndjson,
+        weak_etag,
+    )
+    from ...utils.pk_cache import PkCache, QueryCache  # type: ignore
+    from ...db.models.models import SearchProvider  # type: ignore
     from ...core.config import settings  # type: ignore
+    from .candidates import _attach_computed  # type: ignore
     import httpx  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
     from db.models.models import (
+        Playlist,
         Track,
         TrackIdentity,
         SourceProvider,
         SearchCandidate,
         Download,
         DownloadProvider,
+        DownloadStatus,
         PlaylistTrack,
         LibraryFile,
+        track_references,
     )  # type: ignore
     from schemas.models import TrackCreate, TrackRead, SearchCandidateRead  # type: ignore
-    from utils.normalize import normalize_track, duration_delta_sec  # type: ignore
-    from utils.youtube_search import search_youtube  # type: ignore
+    from utils.normalize import normalize_track_cached  # type: ignore
+    from utils.youtube_search import search_youtube_async, get_score_components  # type: ignore
     from utils.images import youtube_thumbnail_url  # type: ignore
-    from db.models.models import SearchCandidate, SearchProvider  # type: ignore
+    from utils.json_response import (  # type: ignore
+        NDJSON_MEDIA_TYPE,
+        construct_model,
+        not_modified,
+        orjson_dump_model,
+        orjson_list_response,
+        orjson_models_response,
+        orjson_rows_body,
+        read_columns,
+        wants_ndjson,
+        weak_etag,
+    )
+    from utils.pk_cache import PkCache, QueryCache  # type: ignore
+    from db.models.models import SearchProvider  # type: ignore
     from core.config import settings  # type: ignore
+    from api.v1.candidates import _attach_computed  # type: ignore
     import httpx  # type: ignore
 
 
 router = APIRouter(prefix="/tracks", tags=["tracks"])
 
+# (JSON body, ETag) pairs served by get_track, evicted whenever a Track row is written through async_session.
+# Writes from elsewhere (the db/migrations scripts, raw engine connections, other processes) are not seen and
+# can be served stale for up to the 30 s TTL.
+_TRACK_CACHE = PkCache(Track, maxsize=4096, ttl=30.0)
+# (JSON body, next cursor) pairs served by list_tracks_with_playlist_info, cleared on any write to the joined tables
+# made through async_session. Writes from elsewhere (the db/migrations scripts, raw engine connections, other
+# processes) are not seen and can be served stale for up to the 30 s TTL. Pages can reach several MB at high
+# limits, so the bodies are bounded to 32 MB in total.
+_PLAYLIST_INFO_CACHE = QueryCache(
+    (Track, PlaylistTrack, Playlist, Download, LibraryFile), maxsize=256, ttl=30.0, maxbytes=32 * 1024 * 1024
+)
+# Track columns exposed by TrackRead, selected directly by list_tracks
+_TRACK_READ_COLUMNS = read_columns(TrackRead, Track)
+
+
+def _encode_cursor(updated_at: datetime, track_id: int) -> str:
+    """Opaque keyset cursor pointing just past the track ``(updated_at, track_id)``."""
+    raw = f"{updated_at.isoformat()}|{track_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, track_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(track_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _search_condition(q: str):
+    """Substring match on title or artists.
+
+    SQLite's LIKE already ignores ASCII case, so the columns are compared as stored
+    rather than through a per-row lower().
+    """
+    like = f"%{q}%"
+    return or_(Track.title.like(like), Track.artists.like(like))
+
+
 @router.get("/raw_min")
 async def list_tracks_raw_min(
     session: AsyncSession = Depends(get_session),
     limit: int = Query(5, ge=1, le=1000),
 ):
-    stmt = select(Track).order_by(desc(Track.updated_at)).limit(limit)
-    rows = (await session.execute(stmt)).scalars().all()
-    out = []
-    for t in rows:
-        out.append({
-            "id": t.id,
-            "title": t.title,
-            "artists": t.artists,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "updated_at": t.updated_at.isoformat() if t.updated_at else None,
-        })
-    return out
+    # Project just the needed columns; no ORM instances are built
+    stmt = (
+        select(Track.id, Track.title, Track.artists, Track.created_at, Track.updated_at)
+        .order_by(desc(Track.updated_at))
+        .limit(limit)
+    )
+    rows = (await session.execute(stmt)).all()
+    # orjson writes datetimes in isoformat() form natively, without a Python call per value
+    out = [r._asdict() for r in rows]
+    return Response(content=orjson.dumps(out), media_type="application/json")
 
 
+# Accept both with and without trailing slash
 @router.get("/", response_model=List[TrackRead])
+@router.get("", response_model=List[TrackRead])
 async def list_tracks(
-    session: AsyncSession = Depends(get_session),
+    request: Request,
     q: Optional[str] = Query(None, description="Filter by title/artists contains (case-insensitive)"),
     playlist_id: Optional[int] = Query(None, description="Filter by playlist id and order by playlist position"),
     limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's X-Next-Cursor header"),
+    session: AsyncSession = Depends(get_session),
 ):
-    # Default ordering
-    stmt = select(Track)
-    order_cols = [desc(Track.updated_at)]
+    if cursor is not None and playlist_id is not None:
+        raise HTTPException(status_code=400, detail="cursor cannot be combined with playlist_id")
+    if cursor is not None and offset:
+        raise HTTPException(status_code=400, detail="cursor cannot be combined with offset")
+    after = _decode_cursor(cursor) if cursor is not None else None
+    stmt = select(*_TRACK_READ_COLUMNS).select_from(Track)
+    # Fingerprint of the filtered set, read before any row is fetched or serialized. Updates bump
+    # max(updated_at); inserts and deletes change the count or the id sum, so swapping one row
+    # for another also changes it.
+    fingerprint = select(
+        func.count(), func.max(Track.updated_at), func.min(Track.id), func.max(Track.id), func.total(Track.id)
+    ).select_from(Track)
+    # Default ordering (id breaks ties so offset pages are stable)
+    order_cols = [desc(Track.updated_at), desc(Track.id)]
 
     # Filter by search query
     if q:
-        from sqlalchemy import or_, func
-        like = f"%{q.lower()}%"
-        stmt = select(Track).where(
-            or_(func.lower(Track.title).like(like), func.lower(Track.artists).like(like))
-        )
+        cond = _search_condition(q)
+        stmt = stmt.where(cond)
+        fingerprint = fingerprint.where(cond)
 
     # Filter by playlist: join PlaylistTrack to constrain and order by position
     if playlist_id is not None:
         stmt = stmt.join(PlaylistTrack, PlaylistTrack.track_id == Track.id).where(
             PlaylistTrack.playlist_id == playlist_id
         )
-        order_cols = [asc(PlaylistTrack.position.nullslast()), desc(Track.updated_at)]
-
-    stmt = stmt.order_by(*order_cols).limit(limit)
-    result = await session.execute(stmt)
-    rows = result.scalars().all()
-    try:
-        import logging
-        logging.getLogger("tracks").info("list_tracks returned %s rows (limit=%s, playlist_id=%s)", len(rows), limit, playlist_id)
-        if rows:
-            logging.getLogger("tracks").debug("first track id=%s title=%s", rows[0].id, rows[0].title)
-    except Exception:
-        pass
-    return rows
-
-
-# Accept both with and without trailing slash
-@router.get("", response_model=List[TrackRead])
-async def list_tracks_no_slash(
-    session: AsyncSession = Depends(get_session),
-    q: Optional[str] = Query(None, description="Filter by title/artists contains (case-insensitive)"),
-    playlist_id: Optional[int] = Query(None, description="Filter by playlist id and order by playlist position"),
-    limit: int = Query(100, ge=1, le=1000),
-):
-    return await list_tracks(session=session, q=q, playlist_id=playlist_id, limit=limit)
+        fingerprint = fingerprint.add_columns(func.total(PlaylistTrack.position)).join(
+            PlaylistTrack, PlaylistTrack.track_id == Track.id
+        ).where(PlaylistTrack.playlist_id == playlist_id)
+        order_cols = [asc(PlaylistTrack.position).nullslast(), desc(Track.updated_at), desc(Track.id)]
+
+    ndjson = wants_ndjson(request)
+    state = (await session.execute(fingerprint)).one()
+    headers = {"Vary": "Accept", "ETag": weak_etag(*state, q, playlist_id, limit, offset, cursor, ndjson)}
+    if not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Keyset pagination: seek past the cursor on the (updated_at, id) index instead of skipping rows
+    if after is not None:
+        stmt = stmt.where(tuple_(Track.updated_at, Track.id) < after)
+
+    rows = (await session.execute(stmt.order_by(*order_cols).limit(limit).offset(offset))).all()
+    if playlist_id is None and len(rows) == limit:
+        headers["X-Next-Cursor"] = _encode_cursor(rows[-1].updated_at, rows[-1].id)
+    # The page is serialized in one piece rather than streamed: X-Next-Cursor comes from its last
+    # row and must be sent before the body, and limit caps a page at 1000 rows
+    body = orjson_rows_body(TrackRead, rows, ndjson=ndjson)
+    return Response(content=body, media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json", headers=headers)
 
 
 @router.get("/with_playlist_info", response_model=List[dict])
@@ -124,108 +214,136 @@ async def list_tracks_with_playlist_info(
     sort_by: Optional[str] = Query("updated_at", description="Sort by: updated_at, release_date, playlist_added_at"),
     sort_order: Optional[str] = Query("desc", description="Sort order: asc or desc"),
     limit: int = Query(100, ge=1, le=10000),  # Increased limit to support larger libraries
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's X-Next-Cursor header (updated_at sort only)"),
 ):
-    """Return tracks enriched with playlist information for enhanced sorting and display."""
-    from sqlalchemy import func, case
-    from ...db.models.models import Playlist, Download, DownloadStatus, LibraryFile  # type: ignore
-    
-    # Base query with playlist join and download info
-    stmt = (
-        select(
-            Track,
-            PlaylistTrack.added_at.label("playlist_added_at"),
-            PlaylistTrack.position.label("playlist_position"),
-            Playlist.name.label("playlist_name"),
-            Download.finished_at.label("downloaded_at"),
-            LibraryFile.actual_duration_ms.label("actual_duration_ms")
-        )
-        .outerjoin(PlaylistTrack, PlaylistTrack.track_id == Track.id)
-        .outerjoin(Playlist, Playlist.id == PlaylistTrack.playlist_id)
-        .outerjoin(Download, (Download.track_id == Track.id) & (Download.status == DownloadStatus.done))
-        .outerjoin(LibraryFile, LibraryFile.track_id == Track.id)
+    """Return tracks enriched with playlist information for enhanced sorting and display.
+
+    One row is selected per track; playlist memberships are loaded with a single IN query
+    and download/file details come from correlated subqueries, so tracks in several
+    playlists do not multiply the result rows. Serialized pages are cached until the
+    next write to any of the tables they read.
+    """
+    ascending = sort_order == "asc"
+    keyset = sort_by not in ("release_date", "playlist_added_at")
+    if cursor is not None and not keyset:
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort_by=updated_at")
+
+    cache_key = (q, playlist_id, track_id, sort_by, sort_order, limit, cursor)
+    cached = _PLAYLIST_INFO_CACHE.get(cache_key)
+    if cached is None:
+        generation = _PLAYLIST_INFO_CACHE.generation
+        cached = await _playlist_info_page(session, q, playlist_id, track_id, sort_by, ascending, keyset, limit, cursor)
+        if _PLAYLIST_INFO_CACHE.generation == generation:
+            _PLAYLIST_INFO_CACHE.put(cache_key, cached, len(cached[0]))
+    body, next_cursor = cached
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _playlist_info_page(
+    session: AsyncSession,
+    q: Optional[str],
+    playlist_id: Optional[int],
+    track_id: Optional[int],
+    sort_by: Optional[str],
+    ascending: bool,
+    keyset: bool,
+    limit: int,
+    cursor: Optional[str],
+) -> Tuple[bytes, Optional[str]]:
+    """Serialized page of list_tracks_with_playlist_info and its next keyset cursor."""
+
+    downloaded_at = (
+        select(func.max(Download.finished_at))
+        .where(Download.track_id == Track.id, Download.status == DownloadStatus.done)
+        .scalar_subquery()
+    )
+    actual_duration_ms = (
+        select(LibraryFile.actual_duration_ms)
+        .where(LibraryFile.track_id == Track.id)
+        .order_by(desc(LibraryFile.id))
+        .limit(1)
+        .scalar_subquery()
     )
+    entries = Track.playlist_entries
+    entry_conds = [PlaylistTrack.track_id == Track.id]
+    if playlist_id is not None:
+        # Only the filtered playlist's membership is reported
+        entries = entries.and_(PlaylistTrack.playlist_id == playlist_id)
+        entry_conds.append(PlaylistTrack.playlist_id == playlist_id)
+
+    stmt = select(
+        Track,
+        downloaded_at.label("downloaded_at"),
+        actual_duration_ms.label("actual_duration_ms"),
+    ).options(selectinload(entries).joinedload(PlaylistTrack.playlist))
 
     # Filter by search query
     if q:
-        from sqlalchemy import or_
-        like = f"%{q.lower()}%"
-        stmt = stmt.where(
-            or_(func.lower(Track.title).like(like), func.lower(Track.artists).like(like))
-        )
+        stmt = stmt.where(_search_condition(q))
 
     # Filter by specific playlist
     if playlist_id is not None:
-        stmt = stmt.where(PlaylistTrack.playlist_id == playlist_id)
+        stmt = stmt.where(select(PlaylistTrack.id).where(*entry_conds).exists())
 
     # Filter by specific track ID
     if track_id is not None:
         stmt = stmt.where(Track.id == track_id)
 
-    # Determine sort column
-    sort_column = desc(Track.updated_at)  # default
+    # Determine sort columns (id breaks ties so pages are stable)
+    direction = asc if ascending else desc
     if sort_by == "release_date":
-        if sort_order == "asc":
-            sort_column = asc(Track.release_date.nullslast())
-        else:
-            sort_column = desc(Track.release_date.nullslast())
+        order_cols = [direction(Track.release_date).nullslast(), direction(Track.id)]
     elif sort_by == "playlist_added_at":
-        if sort_order == "asc":
-            sort_column = asc(PlaylistTrack.added_at.nullslast())
-        else:
-            sort_column = desc(PlaylistTrack.added_at.nullslast())
-    elif sort_by == "updated_at":
-        if sort_order == "asc":
-            sort_column = asc(Track.updated_at)
-        else:
-            sort_column = desc(Track.updated_at)
-
-    stmt = stmt.order_by(sort_column).limit(limit)
-    result = await session.execute(stmt)
-    rows = result.all()
+        # A track sorts by its newest membership when descending and its oldest when ascending
+        added_at = (func.min if ascending else func.max)(PlaylistTrack.added_at)
+        added_at = select(added_at).where(*entry_conds).scalar_subquery()
+        order_cols = [direction(added_at).nullslast(), direction(Track.id)]
+    else:
+        order_cols = [direction(Track.updated_at), direction(Track.id)]
+        if cursor is not None:
+            key = tuple_(Track.updated_at, Track.id)
+            bound = _decode_cursor(cursor)
+            stmt = stmt.where(key > bound if ascending else key < bound)
 
-    # Transform results to include playlist info
-    tracks_with_playlist = []
-    tracks_dict = {}
-    
-    for row in rows:
-        track = row[0]
-        track_id = track.id
-        
-        # If track not yet in dict, create base track object
-        if track_id not in tracks_dict:
-            tracks_dict[track_id] = {
-                "id": track.id,
-                "title": track.title,
-                "artists": track.artists,
-                "album": track.album,
-                "duration_ms": track.duration_ms,
-                "actual_duration_ms": row.actual_duration_ms,  # Actual duration from file
-                "isrc": track.isrc,
-                "year": track.year,
-                "explicit": track.explicit,
-                "cover_url": track.cover_url,
-                "normalized_title": track.normalized_title,
-                "normalized_artists": track.normalized_artists,
-                "genre": track.genre,
-                "bpm": track.bpm,
-                "release_date": track.release_date.isoformat() if track.release_date else None,  # Date de release de la track sur Spotify
-                "downloaded_at": row.downloaded_at.isoformat() if row.downloaded_at else None,  # Date de téléchargement
-                "playlists": []
-            }
-        
-        # Add playlist info if exists
-        if row.playlist_added_at and row.playlist_name:
-            playlist_info = {
-                "playlist_name": row.playlist_name,
-                "playlist_added_at": row.playlist_added_at.isoformat(),  # When added to playlist
-                "position": row.playlist_position
-            }
-            tracks_dict[track_id]["playlists"].append(playlist_info)
-    
-    # Convert dict to list
-    tracks_with_playlist = list(tracks_dict.values())
+    stmt = stmt.order_by(*order_cols).limit(limit)
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if keyset and len(rows) == limit:
+        last = rows[-1][0]
+        next_cursor = _encode_cursor(last.updated_at, last.id)
 
-    return tracks_with_playlist
+    out = []
+    for track, downloaded, actual_duration in rows:
+        out.append({
+            "id": track.id,
+            "title": track.title,
+            "artists": track.artists,
+            "album": track.album,
+            "duration_ms": track.duration_ms,
+            "actual_duration_ms": actual_duration,  # Actual duration from file
+            "isrc": track.isrc,
+            "year": track.year,
+            "explicit": track.explicit,
+            "cover_url": track.cover_url,
+            "normalized_title": track.normalized_title,
+            "normalized_artists": track.normalized_artists,
+            "genre": track.genre,
+            "bpm": track.bpm,
+            "release_date": track.release_date,  # Spotify release date of the track
+            "downloaded_at": downloaded,  # When the track was downloaded
+            "playlists": [
+                {
+                    "playlist_name": entry.playlist.name,
+                    "playlist_added_at": entry.added_at,  # When added to playlist
+                    "position": entry.position,
+                }
+                for entry in track.playlist_entries
+                if entry.added_at and entry.playlist is not None and entry.playlist.name
+            ],
+        })
+    # Datetimes are left to orjson, which renders them exactly like isoformat()
+    return orjson.dumps(out), next_cursor
 
 
 @router.post("/", response_model=TrackRead)
@@ -233,21 +351,20 @@ async def create_track(payload: TrackCreate, session: AsyncSession = Depends(get
     data = payload.model_dump()
     # Auto-normalize if missing
     if not data.get("normalized_title") or not data.get("normalized_artists"):
-        norm = normalize_track(data["artists"], data["title"],)
+        norm = normalize_track_cached(data["artists"], data["title"],)
         data["normalized_artists"] = norm.normalized_artists
         data["normalized_title"] = norm.normalized_title
-    track = Track(**data)
-    session.add(track)
-    await session.flush()
+    # Insert with RETURNING so the new row comes back without a unit-of-work flush
+    track = (await session.scalars(insert(Track).returning(Track), [data])).one()
     # Auto-create a manual identity if none exists yet
-    identity = TrackIdentity(
-        track_id=track.id,
-        provider=SourceProvider.manual,
-        provider_track_id=f"manual:{track.id}",
-        provider_url=None,
+    await session.execute(
+        insert(TrackIdentity).values(
+            track_id=track.id,
+            provider=SourceProvider.manual,
+            provider_track_id=f"manual:{track.id}",
+            provider_url=None,
+        )
     )
-    session.add(identity)
-    await session.flush()
     return track
 
 
@@ -256,26 +373,20 @@ async def ready_for_download(
     session: AsyncSession = Depends(get_session),
     include_downloaded: bool = Query(False, description="Include tracks that already have a successful download"),
 ):
-    """Return tracks that have a chosen candidate. By default excludes tracks that already have a done download."""
-    # Tracks with chosen candidate
-    cand_stmt = select(SearchCandidate.track_id).where(SearchCandidate.chosen.is_(True))
-    cand_ids = set((await session.execute(cand_stmt)).scalars().all())
-    if not cand_ids:
-        return []
-    # Optionally exclude tracks that already have a library file on disk
-    ready_ids: list[int]
-    if include_downloaded:
-        ready_ids = list(cand_ids)
-    else:
-        from ...db.models.models import LibraryFile  # type: ignore
-        lf_stmt = select(LibraryFile.track_id)
-        lf_ids = set((await session.execute(lf_stmt)).scalars().all())
-        ready_ids = list(cand_ids - lf_ids)
-    if not ready_ids:
-        return []
-    q = select(Track).where(Track.id.in_(ready_ids)).order_by(desc(Track.updated_at))
-    rows = (await session.execute(q)).scalars().all()
-    return rows
+    """Return tracks that have a chosen candidate. By default excludes tracks that already have a library file."""
+    stmt = (
+        select(*_TRACK_READ_COLUMNS)
+        .where(
+            select(SearchCandidate.id)
+            .where(SearchCandidate.track_id == Track.id, SearchCandidate.chosen.is_(True))
+            .exists()
+        )
+        .order_by(desc(Track.updated_at))
+    )
+    if not include_downloaded:
+        stmt = stmt.where(~select(LibraryFile.id).where(LibraryFile.track_id == Track.id).exists())
+    rows = (await session.execute(stmt)).all()
+    return orjson_list_response(TrackRead, rows)
 
 
 @router.delete("/{track_id}", status_code=204)
@@ -285,51 +396,55 @@ async def delete_track(track_id: int, session: AsyncSession = Depends(get_sessio
     
     logger = logging.getLogger("tracks")
     
-    track = await session.get(Track, track_id)
-    if not track:
+    # Paths of the library files associated with this track, removed from disk once the row is gone
+    stmt = select(LibraryFile.filepath).where(LibraryFile.track_id == track_id)
+    filepaths = (await session.execute(stmt)).scalars().all()
+
+    # Dependent rows are deleted explicitly, one indexed statement per referencing table, so a
+    # database that lost the startup cascade trigger cannot keep orphans; the trigger then finds
+    # nothing left. Bulk DELETEs also keep the ORM from loading each backref collection.
+    for column in track_references():
+        await session.execute(delete(column.table).where(column == track_id))
+    deleted = await session.execute(delete(Track).where(Track.id == track_id).returning(Track.id))
+    if deleted.first() is None:
         raise HTTPException(status_code=404, detail="Track not found")
-    
-    # Get all library files associated with this track to delete them from disk
-    stmt = select(LibraryFile).where(LibraryFile.track_id == track_id)
-    result = await session.execute(stmt)
-    library_files = result.scalars().all()
-    
-    # Delete physical files from disk
-    for lib_file in library_files:
-        try:
-            if os.path.exists(lib_file.filepath):
-                os.remove(lib_file.filepath)
-                logger.info(f"Deleted file from disk: {lib_file.filepath}")
-            else:
-                logger.warning(f"File not found on disk (already deleted?): {lib_file.filepath}")
-        except Exception as e:
-            logger.error(f"Failed to delete file {lib_file.filepath}: {e}")
-            # Continue with database deletion even if file deletion fails
-    
-    # Manually cascade delete dependent rows (SQLite without FK cascades enabled by default here)
-    await session.execute(delete(TrackIdentity).where(TrackIdentity.track_id == track_id))
-    await session.execute(delete(SearchCandidate).where(SearchCandidate.track_id == track_id))
-    await session.execute(delete(Download).where(Download.track_id == track_id))
-    await session.execute(delete(PlaylistTrack).where(PlaylistTrack.track_id == track_id))
-    await session.execute(delete(LibraryFile).where(LibraryFile.track_id == track_id))
-    await session.delete(track)
-    await session.flush()
+
+    def _remove_files() -> None:
+        for filepath in filepaths:
+            try:
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                    logger.info(f"Deleted file from disk: {filepath}")
+                else:
+                    logger.warning(f"File not found on disk (already deleted?): {filepath}")
+            except Exception as e:
+                logger.error(f"Failed to delete file {filepath}: {e}")
+
+    if filepaths:
+        await asyncio.to_thread(_remove_files)
     return None
 
 
 @router.get("/{track_id}", response_model=TrackRead)
-async def get_track(track_id: int, session: AsyncSession = Depends(get_session)):
-    track = await session.get(Track, track_id)
-    if not track:
-        raise HTTPException(status_code=404, detail="Track not found")
-    return track
+async def get_track(track_id: int, request: Request, session: AsyncSession = Depends(get_session)):
+    cached = _TRACK_CACHE.get(track_id)
+    if cached is None:
+        track = await session.get(Track, track_id)
+        if not track:
+            raise HTTPException(status_code=404, detail="Track not found")
+        body = orjson_dump_model(construct_model(TrackRead, track))
+        cached = (body, weak_etag(body))
+        _TRACK_CACHE.put(track_id, cached)
+    body, etag = cached
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/{track_id}/identities")
 async def get_track_identities(track_id: int, session: AsyncSession = Depends(get_session)):
-    # Verify track exists
-    track = await session.get(Track, track_id)
-    if not track:
+    # Verify track exists (an id probe; the row itself is not needed)
+    if await session.scalar(select(Track.id).where(Track.id == track_id)) is None:
         raise HTTPException(status_code=404, detail="Track not found")
     
     # Get all identities for this track
@@ -404,7 +519,7 @@ async def update_track(track_id: int, payload: TrackCreate, session: AsyncSessio
     title_changed = data.get("title") and data["title"] != track.title
     artists_changed = data.get("artists") and data["artists"] != track.artists
     if (title_changed or artists_changed) and (not data.get("normalized_title") or not data.get("normalized_artists")):
-        norm = normalize_track(data.get("artists", track.artists), data.get("title", track.title))
+        norm = normalize_track_cached(data.get("artists", track.artists), data.get("title", track.title))
         data.setdefault("normalized_artists", norm.normalized_artists)
         data.setdefault("normalized_title", norm.normalized_title)
     for k, v in data.items():
@@ -415,11 +530,14 @@ async def update_track(track_id: int, payload: TrackCreate, session: AsyncSessio
 
 @router.get("/normalize/preview")
 async def preview_normalization(
+    response: Response,
     artists: str = Query("", description="Original artists string"),
     title: str = Query("", description="Original title string"),
 ):
     """Return normalized fields and flags for a given artist/title pair."""
-    result = normalize_track(artists, title)
+    result = normalize_track_cached(artists, title)
+    # Pure function of the query string: let browsers reuse repeated previews
+    response.headers["Cache-Control"] = "public, max-age=300"
     return {
         "primary_artist": result.primary_artist,
         "clean_artists": result.clean_artists,
@@ -440,69 +558,78 @@ async def youtube_search_track(
     persist: bool = Query(True, description="Persist top scored results as candidates"),
     limit: Optional[int] = Query(None, description="Override search limit"),
 ):
-    track = await session.get(Track, track_id)
+    if persist:
+        # Track and its stored YouTube candidates in one joined query
+        result = await session.execute(
+            select(Track)
+            .where(Track.id == track_id)
+            .options(joinedload(Track.candidates.and_(SearchCandidate.provider == SearchProvider.youtube)))
+        )
+        track = result.unique().scalars().first()
+    else:
+        track = await session.get(Track, track_id)
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
     max_results = limit or settings.youtube_search_limit
-    scored = search_youtube(track.artists, track.title, track.duration_ms, prefer_extended=prefer_extended, limit=max_results)
+    scored = await search_youtube_async(track.artists, track.title, track.duration_ms, prefer_extended=prefer_extended, limit=max_results)
 
     # Optionally persist as SearchCandidate (avoid duplicates by external_id)
     out: List[SearchCandidateRead] = []
     if persist:
-        existing_stmt = select(SearchCandidate.external_id).where(
-            SearchCandidate.track_id == track.id,
-            SearchCandidate.provider == SearchProvider.youtube,
-        )
-        existing = set((await session.execute(existing_stmt)).scalars().all())
         rank_cut = 10  # persist at most top 10 even if search limit larger
-        for sr in scored[:rank_cut]:
-            if sr.external_id in existing:
-                continue
-            sc = SearchCandidate(
-                track_id=track.id,
-                provider=SearchProvider.youtube,
-                external_id=sr.external_id,
-                url=sr.url,
-                title=sr.title,
-                channel=sr.channel,
-                duration_sec=sr.duration_sec,
-                score=sr.score,
+        # New candidates are inserted and merged in memory with the ones loaded alongside the track
+        rows: List[SearchCandidate] = list(track.candidates)
+        known = {c.external_id for c in rows}
+        new_values = [
+            {
+                "track_id": track.id,
+                "provider": SearchProvider.youtube,
+                "external_id": sr.external_id,
+                "url": sr.url,
+                "title": sr.title,
+                "channel": sr.channel,
+                "duration_sec": sr.duration_sec,
+                "score": sr.score,
+            }
+            for sr in scored[:rank_cut]
+            if sr.external_id not in known
+        ]
+        if new_values:
+            # Rows stored concurrently are skipped by the uq_candidate_unique constraint
+            inserted = await session.scalars(
+                sqlite_insert(SearchCandidate).on_conflict_do_nothing().returning(SearchCandidate),
+                new_values,
             )
-            session.add(sc)
+            rows.extend(inserted.all())
         # If track has no cover yet, set it from the top scored candidate's thumbnail
         if not track.cover_url and scored:
             thumb = youtube_thumbnail_url(scored[0].external_id) or youtube_thumbnail_url(scored[0].url)
             if thumb:
                 track.cover_url = thumb
-        await session.flush()
-        # Re-query all youtube candidates for this track sorted by score desc
-        result = await session.execute(
-            select(SearchCandidate).where(
-                SearchCandidate.track_id == track.id,
-                SearchCandidate.provider == SearchProvider.youtube,
-            ).order_by(desc(SearchCandidate.score))
-        )
-        rows: List[SearchCandidate] = result.scalars().all()
-        for c in rows:
-            # Build pydantic object manually to add duration_delta_sec like candidates API does
-            from ..v1.candidates import _attach_computed  # type: ignore
-            out.append(_attach_computed(track, c))
+        # All youtube candidates for this track sorted by score desc
+        rows.sort(key=lambda c: c.score, reverse=True)
+        # Build pydantic objects manually to add duration_delta_sec like candidates API does
+        track_read = construct_model(TrackRead, track)
+        out.extend(_attach_computed(track, c, track_read) for c in rows)
     else:
-        # Return transient scored list
-        from ...utils.youtube_search import get_score_components  # type: ignore
+        # Return transient scored list. Track attributes are read once since ORM attribute
+        # access is instrumented.
+        t_artists, t_title, t_duration_ms = track.artists, track.title, track.duration_ms
+        t_id, t_created_at = track.id, track.created_at
         for sr in scored:
+            delta = abs(t_duration_ms - sr.duration_sec * 1000) / 1000.0 if (t_duration_ms and sr.duration_sec) else None
             comps = get_score_components(
-                query_artists=track.artists,
-                query_title=track.title,
-                track_duration_ms=track.duration_ms,
+                query_artists=t_artists,
+                query_title=t_title,
+                track_duration_ms=t_duration_ms,
                 result_duration_sec=sr.duration_sec,
                 result_title=sr.title,
                 result_channel=sr.channel,
             )
             out.append(
-                SearchCandidateRead(
+                SearchCandidateRead.model_construct(
                     id=0,  # transient placeholder
-                    track_id=track.id,
+                    track_id=t_id,
                     provider=SearchProvider.youtube,  # type: ignore[arg-type]
                     external_id=sr.external_id,
                     url=sr.url,
@@ -511,9 +638,9 @@ async def youtube_search_track(
                     duration_sec=sr.duration_sec,
                     score=sr.score,
                     chosen=False,
-                    created_at=track.created_at,
-                    duration_delta_sec=duration_delta_sec(track.duration_ms, sr.duration_sec * 1000) if (track.duration_ms and sr.duration_sec) else None,  # type: ignore[arg-type]
-                    score_breakdown=SearchCandidateRead.ScoreBreakdown(
+                    created_at=t_created_at,
+                    duration_delta_sec=delta,
+                    score_breakdown=SearchCandidateRead.ScoreBreakdown.model_construct(
                         artist=comps[0],
                         title=comps[1],
                         duration=comps[3],
@@ -522,11 +649,11 @@ async def youtube_search_track(
                     ),
                 )
             )
-    return out
+    return orjson_models_response(out)
 
 
 @router.post("/{track_id}/cover/refresh", response_model=TrackRead)
-async def refresh_track_cover(track_id: int, session: AsyncSession = Depends(get_session)):
+async def refresh_track_cover(track_id: int, request: Request, session: AsyncSession = Depends(get_session)):
     """Refresh track cover from available identities.
 
     Strategy:
@@ -572,11 +699,14 @@ async def refresh_track_cover(track_id: int, session: AsyncSession = Depends(get
             access_token = os.environ.get("SPOTIFY_ACCESS_TOKEN")
         if access_token:
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
-                    resp = await client.get(
-                        f"https://api.spotify.com/v1/tracks/{sp_identity.provider_track_id}",
-                        headers={"Authorization": f"Bearer {access_token}"},
-                    )
+                url = f"https://api.spotify.com/v1/tracks/{sp_identity.provider_track_id}"
+                headers = {"Authorization": f"Bearer {access_token}"}
+                client = getattr(request.app.state, "httpx", None)
+                if client is not None:
+                    resp = await client.get(url, headers=headers)
+                else:
+                    async with httpx.AsyncClient(timeout=10) as client:
+                        resp = await client.get(url, headers=headers)
                 if resp.status_code == 200:
                     data = resp.json()
                     images = (((data or {}).get("album") or {}).get("images") or [])
@@ -604,6 +734,7 @@ async def refresh_track_cover(track_id: int, session: AsyncSession = Depends(get
 
 @router.post("/{track_id}/youtube/manual_download")
 async def manual_youtube_download(
+    request: Request,
     track_id: int,
     youtube_url: str = Query(..., description="YouTube video URL (e.g., https://www.youtube.com/watch?v=...)"),
     session: AsyncSession = Depends(get_session),
@@ -677,11 +808,6 @@ async def manual_youtube_download(
             raise HTTPException(status_code=500, detail=f"Error fetching video metadata: {str(e)}")
         
         # Calculate score (simple version for manual entry)
-        try:
-            from ...utils.youtube_search import get_score_components  # type: ignore
-        except Exception:
-            from utils.youtube_search import get_score_components  # type: ignore
-        
         logger.info(f"Calculating score for track: {track.artists} - {track.title}")
         score_components = get_score_components(
             query_artists=track.artists,
@@ -728,19 +854,20 @@ async def manual_youtube_download(
         
         await session.flush()
         
-        # Use the existing enqueue_download logic
+        # Use the shared download creation logic
         try:
-            from ..v1.downloads import enqueue_download  # type: ignore
+            from ..v1.downloads import create_download  # type: ignore
         except Exception:
-            from api.v1.downloads import enqueue_download  # type: ignore
+            from api.v1.downloads import create_download  # type: ignore
         
-        # Enqueue the download using the existing endpoint logic
-        download = await enqueue_download(
+        # Enqueue the download on the app's running queue
+        download = await create_download(
             track_id=track_id,
             candidate_id=candidate.id,
             provider=DownloadProvider.yt_dlp,
             force=False,
             session=session,
+            state=request.app.state,
         )
         
         logger.info(f"Manual download completed successfully for track {track_id}, download_id={download.id}")
@@ -1,30 +1,28 @@
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional, Set, Tuple
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-import json
-from sqlalchemy import select, func
+import re
+import orjson
+from sqlalchemy import select, func, insert, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 try:
     from ...db.session import get_session  # type: ignore
     from ...db.models.models import Track, TrackIdentity, SourceProvider, Playlist, PlaylistTrack  # type: ignore
-    from ...utils.normalize import normalize_track  # type: ignore
+    from ...utils.normalize import normalize_track_cached  # type: ignore
 except Exception:  # pragma: no cover
     from db.session import get_session  # type: ignore
     from db.models.models import Track, TrackIdentity, SourceProvider, Playlist, PlaylistTrack  # type: ignore
-    from utils.normalize import normalize_track  # type: ignore
+    from utils.normalize import normalize_track_cached  # type: ignore
 
 router = APIRouter(prefix="/tracks/import", tags=["tracks"])
 
-# Expected English keys (primary) with fallback legacy French keys mapping for backward compatibility.
+# Expected English keys (primary) with fallback to the legacy French keys for backward compatibility:
+# Artiste -> artists, Titre -> title, Genre -> genre, BPM -> bpm, Durée -> duration.
 # Only artists and title are strictly required; genre/bpm/duration may be blank if unknown.
-REQUIRED_KEYS = ["artists", "title"]
-LEGACY_FR_MAP = {
-    "Artiste": "artists",
-    "Titre": "title",
-    "Genre": "genre",
-    "BPM": "bpm",
-    "Durée": "duration",
-}
+_ABSENT = object()
+
+# "m:ss" durations
+_DURATION_RE = re.compile(r"(\d+):(\d+)")
 
 
 def _parse_duration_str(s: Optional[str]) -> Optional[int]:
@@ -33,14 +31,32 @@ def _parse_duration_str(s: Optional[str]) -> Optional[int]:
     if isinstance(s, (int, float)):
         # Already seconds maybe
         return int(float(s) * 1000)
-    parts = str(s).strip().split(":")
-    if len(parts) == 2 and all(p.isdigit() for p in parts):
-        minutes, seconds = parts
-        try:
-            return (int(minutes) * 60 + int(seconds)) * 1000
-        except Exception:
-            return None
-    return None
+    m = _DURATION_RE.fullmatch(str(s).strip())
+    if m is None:
+        return None
+    return (int(m[1]) * 60 + int(m[2])) * 1000
+
+
+# Pairs per IN (...) query. Each pair binds two tuple values plus one leading-column value,
+# so a batch stays within the 999 bound variables allowed by SQLite before 3.32
+_PAIR_BATCH = 999 // 3
+
+
+async def _existing_pairs(session: AsyncSession, cols: tuple, pairs: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """Return the subset of ``pairs`` matching the (two-column) ``cols`` of some track.
+
+    The extra IN on the first column lets SQLite search the composite index on ``cols``;
+    a row-value IN alone makes it scan the whole index.
+    """
+    pending = list(pairs)
+    found: Set[Tuple[str, str]] = set()
+    key = tuple_(*cols)
+    for i in range(0, len(pending), _PAIR_BATCH):
+        batch = pending[i : i + _PAIR_BATCH]
+        firsts = {a for a, _ in batch}
+        result = await session.execute(select(*cols).where(cols[0].in_(firsts), key.in_(batch)).distinct())
+        found.update((a, t) for a, t in result.all())
+    return found
 
 
 @router.post("/json")
@@ -57,8 +73,9 @@ async def import_tracks_json(
     """
     content = await file.read()
     try:
-        data = json.loads(content.decode("utf-8"))
-    except Exception as e:  # pragma: no cover - invalid JSON path
+        # orjson parses the UTF-8 bytes directly (no intermediate str) and rejects invalid UTF-8
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
     if not isinstance(data, list):
         raise HTTPException(status_code=400, detail="Root JSON must be an array")
@@ -70,16 +87,19 @@ async def import_tracks_json(
         if not isinstance(raw, dict):
             errors.append({"index": idx, "error": "Item is not an object"})
             continue
-        # Transparent legacy conversion: if required english key absent but french key present, copy it.
-        for fr_key, en_key in LEGACY_FR_MAP.items():
-            if en_key not in raw and fr_key in raw:
-                raw[en_key] = raw[fr_key]
-        missing = [k for k in REQUIRED_KEYS if k not in raw or (isinstance(raw.get(k), str) and raw.get(k, "").strip() == "")]
-        if missing:
-            errors.append({"index": idx, "error": f"Missing required field(s): {', '.join(missing)}"})
+        # Resolve each field once: English key first, legacy French key otherwise
+        artists = raw["artists"] if "artists" in raw else raw.get("Artiste", _ABSENT)
+        title = raw["title"] if "title" in raw else raw.get("Titre", _ABSENT)
+        artists_missing = artists is _ABSENT or (isinstance(artists, str) and not artists.strip())
+        title_missing = title is _ABSENT or (isinstance(title, str) and not title.strip())
+        if artists_missing or title_missing:
+            missing = ", ".join(k for k, m in (("artists", artists_missing), ("title", title_missing)) if m)
+            errors.append({"index": idx, "error": f"Missing required field(s): {missing}"})
             continue
+        genre = raw["genre"] if "genre" in raw else raw.get("Genre")
+        bpm_value = raw["bpm"] if "bpm" in raw else raw.get("BPM")
+        duration = raw["duration"] if "duration" in raw else raw.get("Durée")
         bpm_int: Optional[int] = None
-        bpm_value = raw.get("bpm")
         if bpm_value not in (None, ""):
             try:
                 if isinstance(bpm_value, (int, float)):
@@ -92,38 +112,38 @@ async def import_tracks_json(
                 errors.append({"index": idx, "error": f"Invalid BPM: {e}"})
                 continue
 
-        duration_ms = _parse_duration_str(raw.get("duration"))
+        duration_ms = _parse_duration_str(duration)
         mapped = {
-            "artists": str(raw.get("artists")).strip(),
-            "title": str(raw.get("title")).strip(),
-            "genre": (str(raw.get("genre")).strip() or None) if raw.get("genre") is not None else None,
+            "artists": str(artists).strip(),
+            "title": str(title).strip(),
+            "genre": (str(genre).strip() or None) if genre is not None else None,
             "bpm": bpm_int,
             "duration_ms": duration_ms,
         }
-        norm = normalize_track(mapped["artists"], mapped["title"])
+        norm = normalize_track_cached(mapped["artists"], mapped["title"])
         mapped["normalized_artists"] = norm.normalized_artists
         mapped["normalized_title"] = norm.normalized_title
-
-        # Per-item duplicate check ensures we see committed rows from previous imports
-        dup_query = await session.execute(
-            select(Track.id).where(
-                Track.normalized_artists == mapped["normalized_artists"],
-                Track.normalized_title == mapped["normalized_title"],
-            )
-        )
-        if dup_query.scalar_one_or_none() is not None:
-            mapped["duplicate"] = True
-        else:
-            # Fallback: raw case-insensitive title/artists duplicate check
-            raw_dup = await session.execute(
-                select(Track.id).where(
-                    func.lower(Track.artists) == mapped["artists"].lower(),
-                    func.lower(Track.title) == mapped["title"].lower(),
-                )
-            )
-            mapped["duplicate"] = raw_dup.scalar_one_or_none() is not None
         to_create.append(mapped)
 
+    # Duplicate detection against committed tracks: normalized pairs first, then a
+    # case-insensitive raw artists/title fallback for the items still unmatched
+    norm_dups = await _existing_pairs(
+        session,
+        (Track.normalized_artists, Track.normalized_title),
+        {(m["normalized_artists"], m["normalized_title"]) for m in to_create},
+    )
+    unmatched = [m for m in to_create if (m["normalized_artists"], m["normalized_title"]) not in norm_dups]
+    raw_dups = await _existing_pairs(
+        session,
+        (func.lower(Track.artists), func.lower(Track.title)),
+        {(m["artists"].lower(), m["title"].lower()) for m in unmatched},
+    )
+    for m in to_create:
+        m["duplicate"] = (m["normalized_artists"], m["normalized_title"]) in norm_dups or (
+            m["artists"].lower(),
+            m["title"].lower(),
+        ) in raw_dups
+
     created_count = 0
     others_playlist_id: Optional[int] = None
     if not dry_run:
@@ -151,29 +171,30 @@ async def import_tracks_json(
                 await session.flush()
         others_playlist_id = others.id
 
-        for item in to_create:
-            if item["duplicate"]:
-                continue
-            track = Track(**{k: v for k, v in item.items() if k != "duplicate"})
-            session.add(track)
-            await session.flush()
-            identity = TrackIdentity(
-                track_id=track.id,
-                provider=SourceProvider.manual,
-                provider_track_id=f"manual:{track.id}",
-                provider_url=None,
+        rows = [{k: v for k, v in item.items() if k != "duplicate"} for item in to_create if not item["duplicate"]]
+        if rows:
+            # Multi-row INSERT ... RETURNING; ids come back in parameter order
+            track_ids = (
+                await session.scalars(insert(Track).returning(Track.id, sort_by_parameter_order=True), rows)
+            ).all()
+            await session.execute(
+                insert(TrackIdentity),
+                [
+                    {
+                        "track_id": tid,
+                        "provider": SourceProvider.manual,
+                        "provider_track_id": f"manual:{tid}",
+                        "provider_url": None,
+                    }
+                    for tid in track_ids
+                ],
             )
-            session.add(identity)
-            await session.flush()
-            # Link to Others playlist if available (avoid duplicates via unique constraint)
-            if others_playlist_id is not None:
-                try:
-                    session.add(PlaylistTrack(playlist_id=others_playlist_id, track_id=track.id, position=None))
-                    await session.flush()
-                except Exception:
-                    # Ignore if unique constraint violation occurs due to race or re-import
-                    pass
-            created_count += 1
+            # Link to the Others playlist; the tracks are new, so no membership can exist yet
+            await session.execute(
+                insert(PlaylistTrack),
+                [{"playlist_id": others_playlist_id, "track_id": tid, "position": None} for tid in track_ids],
+            )
+            created_count = len(track_ids)
 
     return {
         "dry_run": dry_run,
@@ -3,12 +3,15 @@
 Keep human-friendly name here; semantic version is read from the project-level VERSION file.
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def _load_version() -> str:
-	"""Read the semantic version from the repository VERSION file."""
-	version_file = Path(__file__).resolve().parents[2] / "VERSION"
+	"""Read the semantic version from the repository VERSION file (once per process)."""
+	# Module paths are already absolute, so walking up avoids a resolve() syscall
+	version_file = Path(__file__).parent.parent.parent / "VERSION"
 	try:
 		return version_file.read_text(encoding="utf-8").strip()
 	except FileNotFoundError:  # pragma: no cover - only when repository is missing VERSION
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional
 
-from dotenv import load_dotenv
-from pydantic import BaseModel
 try:
     from ..app_meta import __version__, __app_name__  # type: ignore
 except Exception:  # pragma: no cover
@@ -14,57 +14,87 @@ except Exception:  # pragma: no cover
 # Load environment variables from .env files without overriding existing env vars.
 # Priority: backend/.env first (co-located with app), then project-root/.env as fallback.
 from pathlib import Path
-_backend_env = Path(__file__).resolve().parents[2] / ".env"
-_root_env = Path(__file__).resolve().parents[3] / ".env"
+# Resolved once; backend/ and the project root are derived from it
+_THIS = Path(__file__).resolve()
+_BACKEND_DIR = _THIS.parents[2]
+_ROOT_DIR = _THIS.parents[3]
+_backend_env = _BACKEND_DIR / ".env"
+_root_env = _ROOT_DIR / ".env"
 # When running in a container with a bind mount at /config we also optionally load /config/.env
 _config_mount_env = Path("/config/.env")
-# Load backend/.env if present
-load_dotenv(dotenv_path=str(_backend_env), override=False)
-# Load root/.env if present (values already set are not overridden)
-load_dotenv(dotenv_path=str(_root_env), override=False)
-# Finally load /config/.env if present (highest precedence among .env files but still not overriding real env vars)
-if _config_mount_env.exists():  # pragma: no cover - only in container/runtime
-    load_dotenv(dotenv_path=str(_config_mount_env), override=False)
+# Survives importlib.reload() so the files are parsed once per process. NO_DOTENV=1 (deployments
+# that set real environment variables) skips them; python-dotenv is only imported when a file exists.
+if not globals().get("_DOTENV_LOADED") and os.environ.get("NO_DOTENV", "0") not in {"1", "true", "TRUE", "True"}:
+    _env_files = [p for p in (_backend_env, _root_env, _config_mount_env) if p.is_file()]
+    if _env_files:
+        from dotenv import load_dotenv
 
+        # In order: backend/.env, root/.env, then /config/.env (container bind mount); a value
+        # already set, by the real environment or an earlier file, is never overridden
+        for _env_file in _env_files:
+            load_dotenv(dotenv_path=str(_env_file), override=False)
+    _DOTENV_LOADED = True
 
-def _split_csv(value: str | None) -> List[str]:
+# Plain-dict snapshot of the environment (after .env loading) read by the Settings defaults;
+# os.environ encodes and decodes every key and value in Python on each lookup
+_ENV = dict(os.environ)
+
+
+@lru_cache(maxsize=4)
+def _split_csv(value: str | None) -> tuple[str, ...]:
+    """Comma-separated values, trimmed and without empties; cached per raw string (hence a tuple)."""
     if not value:
-        return []
-    return [item.strip() for item in value.split(",") if item.strip()]
+        return ()
+    return tuple(item for item in map(str.strip, value.split(",")) if item)
 
 
-class Settings(BaseModel):
+# A plain dataclass: every value is read from the environment once at import, so model
+# validation would only add import and construction cost. Not frozen, since attributes
+# are overridden at runtime (e.g. by tests).
+@dataclass(slots=True)
+class Settings:
     # Name is sourced from code, not environment
     app_name: str = __app_name__
     # Version is sourced from code, not environment
     version: str = __version__
 
     # CORS
-    cors_origins: List[str] = _split_csv(os.environ.get("CORS_ORIGINS")) or [
-        "http://localhost:5173",
-        "http://127.0.0.1:5173",
-    ]
+    cors_origins: List[str] = field(
+        default_factory=lambda: list(_split_csv(_ENV.get("CORS_ORIGINS")))
+        or ["http://localhost:5173", "http://127.0.0.1:5173"]
+    )
 
     # Database and crypto
-    database_url: str = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./music.db")
-    secret_key: str = os.environ.get("SECRET_KEY", "")
+    database_url: str = _ENV.get("DATABASE_URL", "sqlite+aiosqlite:///./music.db")
+    secret_key: str = _ENV.get("SECRET_KEY", "")
+    # Connection pool for file-based databases; db_pool_size connections are opened at startup
+    db_pool_size: int = int(_ENV.get("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(_ENV.get("DB_MAX_OVERFLOW", "20"))
 
     # Spotify OAuth
-    spotify_client_id: str | None = os.environ.get("SPOTIFY_CLIENT_ID")
-    spotify_client_secret: str | None = os.environ.get("SPOTIFY_CLIENT_SECRET")
-    spotify_redirect_uri: str | None = os.environ.get("SPOTIFY_REDIRECT_URI")
+    spotify_client_id: str | None = _ENV.get("SPOTIFY_CLIENT_ID")
+    spotify_client_secret: str | None = _ENV.get("SPOTIFY_CLIENT_SECRET")
+    spotify_redirect_uri: str | None = _ENV.get("SPOTIFY_REDIRECT_URI")
 
     # YouTube search (Step 2.1)
-    youtube_search_limit: int = int(os.environ.get("YOUTUBE_SEARCH_LIMIT", "8"))
+    youtube_search_limit: int = int(_ENV.get("YOUTUBE_SEARCH_LIMIT", "8"))
     # When set (env only) YOUTUBE_SEARCH_FAKE=1 forces fake results (handled in utils.youtube_search)
 
     # Downloads (Step 2.3)
     # Default library under project root (one level above backend/)
-    library_dir: str = os.environ.get("LIBRARY_DIR", str((__import__('pathlib').Path(__file__).resolve().parents[3] / "library").resolve()))
-    yt_dlp_bin: Optional[str] = os.environ.get("YT_DLP_BIN") or None
-    ffmpeg_bin: Optional[str] = os.environ.get("FFMPEG_BIN") or None
-    preferred_audio_format: str = os.environ.get("PREFERRED_AUDIO_FORMAT", "mp3")
-    download_extractor_args: Optional[str] = os.environ.get("DOWNLOAD_YTDLP_EXTRACTOR_ARGS") or "youtube:player_client=android"
+    library_dir: str = (
+        _ENV["LIBRARY_DIR"] if "LIBRARY_DIR" in _ENV else str((_ROOT_DIR / "library").resolve())
+    )
+    yt_dlp_bin: Optional[str] = _ENV.get("YT_DLP_BIN") or None
+    ffmpeg_bin: Optional[str] = _ENV.get("FFMPEG_BIN") or None
+    preferred_audio_format: str = _ENV.get("PREFERRED_AUDIO_FORMAT", "mp3")
+    download_extractor_args: Optional[str] = _ENV.get("DOWNLOAD_YTDLP_EXTRACTOR_ARGS") or "youtube:player_client=android"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings instance; attributes may be reassigned at runtime (e.g. by tests)."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
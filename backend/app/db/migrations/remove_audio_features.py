@@ -9,7 +9,14 @@ Columns removed:
 
 Usage:
     (Activate your virtualenv)
-    python -m backend.app.db.migrations.remove_audio_features
+    python -m backend.app.db.migrations.remove_audio_features [--vacuum]
+
+The copy runs with journaling and fsync disabled (the original journal mode is
+restored afterwards); --vacuum also rewrites the database file to reclaim the
+space of the dropped columns.
+
+The rebuild drops the table's indexes and delete cascade trigger, so it resets
+PRAGMA user_version; the next app start sees no schema fingerprint and recreates them.
 
 The script is idempotent: if columns are already gone it exits quickly.
 """
@@ -17,6 +24,7 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 import sys
+from typing import List, Optional
 
 DB_PATH = Path(__file__).resolve().parents[4] / "music.db"
 
@@ -52,39 +60,43 @@ KEEP_COLUMNS_ORDER = [
     "updated_at",
 ]
 
-def main():
+# Bulk-copy tuning for this connection only; the copy is a single transaction that is
+# rolled back on error, so per-statement journaling and fsync buy nothing
+BULK_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    vacuum = "--vacuum" in args
     if not DB_PATH.exists():
         print(f"[migration] DB file not found: {DB_PATH}")
         return 1
     conn = sqlite3.connect(str(DB_PATH))
+    # journal_mode persists in the file (e.g. WAL), so it is switched back when done
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
     try:
-        cur = conn.execute("PRAGMA table_info(tracks)")
-        cols = [r[1] for r in cur.fetchall()]
+        # (cid, name, type, notnull, dflt_value, pk) per column
+        info = conn.execute("PRAGMA table_info(tracks)").fetchall()
+        cols = [r[1] for r in info]
         present_removed = [c for c in cols if c in REMOVED_COLUMNS]
         if not present_removed:
             print("[migration] No deprecated audio feature columns present. Nothing to do.")
             return 0
         print(f"[migration] Will drop columns: {', '.join(present_removed)}")
-        # Build create statement for temp table
-        # Extract types from existing schema
-        col_types = {}
-        cur = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='tracks'")
-        row = cur.fetchone()
-        if not row or not row[0]:
-            print("[migration] Could not retrieve original CREATE TABLE for tracks")
-            return 2
-        create_sql = row[0]
-        # Very simple parse: lines between parentheses
-        import re
-        body = create_sql.split('(', 1)[1].rsplit(')', 1)[0]
-        for line in body.split(','):
-            line = line.strip()
-            if not line or line.upper().startswith('CONSTRAINT'):
-                continue
-            parts = line.split()
-            name = parts[0].strip('`"')
-            if name in cols:
-                col_types[name] = ' '.join(parts[1:])
+        # Column definitions of the new table, rebuilt from the declared schema
+        col_types = {
+            name: (
+                ctype
+                + (" NOT NULL" if notnull else "")
+                + (f" DEFAULT {default}" if default is not None else "")
+                + (" PRIMARY KEY" if pk else "")
+            )
+            for _, name, ctype, notnull, default, pk in info
+        }
         # Build column defs for kept columns that still exist
         col_defs = []
         for c in KEEP_COLUMNS_ORDER:
@@ -94,6 +106,9 @@ def main():
             col_defs.append(f"{c} {col_types[c]}")
         create_temp = f"CREATE TABLE tracks_new (\n  {', '.join(col_defs)}\n)"
         print("[migration] Creating new table without deprecated columns ...")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        for pragma in BULK_PRAGMAS:
+            conn.execute(pragma)
         conn.execute("BEGIN")
         conn.execute(create_temp)
         keep_cols_clause = ', '.join([c for c in KEEP_COLUMNS_ORDER if c in col_types])
@@ -101,14 +116,23 @@ def main():
         conn.execute("ALTER TABLE tracks RENAME TO tracks_old")
         conn.execute("ALTER TABLE tracks_new RENAME TO tracks")
         conn.execute("DROP TABLE tracks_old")
+        # The indexes and delete cascade trigger followed tracks_old and were dropped with it;
+        # resetting the schema fingerprint makes the next app start recreate them
+        conn.execute("PRAGMA user_version = 0")
         conn.commit()
+        if vacuum:
+            print("[migration] Vacuuming database ...")
+            conn.execute("VACUUM")
         print("[migration] Completed successfully.")
     except Exception as e:
         conn.rollback()
         print(f"[migration] ERROR: {e}")
         return 3
     finally:
-        conn.close()
+        try:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        finally:
+            conn.close()
     return 0
 
 if __name__ == "__main__":
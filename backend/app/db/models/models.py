@@ -14,6 +14,7 @@ from sqlalchemy import (
     Float,
     UniqueConstraint,
     Index,
+    func,
     Text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -108,6 +109,11 @@ class Track(Base):
 
     __table_args__ = (
         Index("ix_track_isrc", "isrc"),
+        # Backs the default (updated_at, id) ordering and keyset pagination of the track list
+        Index("ix_track_updated_id", updated_at.desc(), id.desc()),
+        # Duplicate lookups by (normalized_artists, normalized_title) and their case-insensitive raw fallback
+        Index("ix_track_norm", "normalized_artists", "normalized_title"),
+        Index("ix_track_lower", func.lower(artists), func.lower(title)),
     )
 
 
@@ -170,6 +176,9 @@ class SearchCandidate(Base):
     __table_args__ = (
         UniqueConstraint("track_id", "provider", "external_id", name="uq_candidate_unique"),
         Index("ix_candidate_track_score", "track_id", "score"),
+        # Serves the per-provider candidate lookup of a track in score order straight from the index
+        Index("ix_candidate_track_provider_score", "track_id", "provider", score.desc()),
+        Index("ix_candidate_track_chosen", "track_id", "chosen"),
     )
 
 
@@ -213,8 +222,11 @@ class Download(Base):
     candidate: Mapped[Optional[SearchCandidate]] = relationship()
 
     __table_args__ = (
-        Index("ix_download_status", "status"),
+        # Status filters ordered by creation time (also serves status-only filters)
+        Index("ix_download_status_created", "status", "created_at"),
         Index("ix_download_created_at", "created_at"),
+        # Per-track lookups; covers the latest finished download of a track with a given status
+        Index("ix_download_track_status_finished", "track_id", "status", "finished_at"),
     )
 
 
@@ -278,3 +290,36 @@ class OAuthState(Base):
     __table_args__ = (
         Index("ix_oauthstate_state", "state"),
     )
+
+
+# Index names dropped at startup from databases created before they were superseded
+OBSOLETE_INDEXES = ("ix_download_status",)
+
+
+# SQLite foreign keys are not enforced here, so track deletes cascade through a trigger instead.
+# It is recreated at startup so tables that gain a tracks.id reference are always covered.
+TRACK_DELETE_CASCADE_TRIGGER = "trg_tracks_delete_cascade"
+
+
+def track_references() -> list:
+    """Columns referencing ``tracks.id``, in the order their rows must be deleted.
+
+    Reverse dependency order: downloads go before the search candidates they reference.
+    """
+    return [
+        fk.parent
+        for table in reversed(Base.metadata.sorted_tables)
+        if table.name != "tracks"
+        for fk in table.foreign_keys
+        if fk.column.table.name == "tracks"
+    ]
+
+
+def track_delete_cascade_ddl() -> str:
+    """CREATE TRIGGER statement deleting every row that references a track before the track itself."""
+    deletes = [f"DELETE FROM {col.table.name} WHERE {col.name} = OLD.id;" for col in track_references()]
+    return (
+        f"CREATE TRIGGER {TRACK_DELETE_CASCADE_TRIGGER} BEFORE DELETE ON tracks FOR EACH ROW BEGIN "
+        + " ".join(deletes)
+        + " END"
+    )
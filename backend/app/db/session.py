@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from typing import AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy.orm import DeclarativeBase, Session
 import os
 
 
@@ -21,28 +24,87 @@ class Base(DeclarativeBase):
     pass
 
 
+# Parsed once; the flags below drive the engine options
+_URL = make_url(DATABASE_URL)
+_IS_SQLITE = _URL.get_backend_name() == "sqlite"
+_SQLITE_DB = _URL.database or ""
+# Private ":memory:" database (an empty path means the same to SQLite)
+_PRIVATE_MEMORY = _IS_SQLITE and _SQLITE_DB in ("", ":memory:")
+_IN_MEMORY = _PRIVATE_MEMORY or (_IS_SQLITE and _URL.query.get("mode") == "memory")
+
 engine_kwargs = {"echo": False, "future": True}
-if DATABASE_URL.startswith("sqlite+aiosqlite"):
+if _URL.drivername == "sqlite+aiosqlite":
     # Allow cross-thread usage and enable SQLite URI mode when using file: URLs.
     connect_args = {"check_same_thread": False}
     # If using the SQLite URI form (e.g., sqlite+aiosqlite:///file:memdb1?...&uri=true),
     # SQLAlchemy requires connect_args["uri"] = True so the driver interprets it as a URI.
-    if "file:" in DATABASE_URL or "uri=true" in DATABASE_URL:
+    if _SQLITE_DB.startswith("file:") or _URL.query.get("uri") == "true":
         connect_args["uri"] = True
     engine_kwargs["connect_args"] = connect_args
     # Ensure in-memory DB is shared across sessions (tests/workers)
-    if DATABASE_URL.endswith(":memory:") or ":memory:" in DATABASE_URL:
+    if _PRIVATE_MEMORY:
         engine_kwargs["poolclass"] = StaticPool  # type: ignore[assignment]
+if not _IN_MEMORY:
+    # Keep connections open between requests; aiosqlite otherwise defaults to NullPool for
+    # file databases, opening a new connection (and driver thread) per session
+    engine_kwargs["poolclass"] = AsyncAdaptedQueuePool  # type: ignore[assignment]
+    engine_kwargs["pool_size"] = settings.db_pool_size
+    engine_kwargs["max_overflow"] = settings.db_max_overflow
 
 engine = create_async_engine(
     DATABASE_URL, **engine_kwargs
 )
 
+if _IS_SQLITE and not _IN_MEMORY:
+    # WAL lets the download worker write while API requests read; with WAL, synchronous=NORMAL
+    # stays crash-safe and avoids an fsync on every commit. A writer waits up to busy_timeout ms
+    # for another writer's lock instead of failing with "database is locked", and temporary
+    # b-trees (sorts, DISTINCT) stay in memory. foreign_keys is left off: the tracks table
+    # rebuild at startup and the delete-cascade trigger assume unenforced references.
+    # Reads go through a memory map of up to 256 MB instead of a read() per page. page_size
+    # only applies to a database file that has not been written yet (new installs), so it is
+    # set before WAL mode, which writes the file header.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):  # pragma: no cover - file DBs only
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA page_size=8192")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+        finally:
+            cursor.close()
+
+
+class AppSession(Session):
+    """Sync session behind ``async_session``; session event listeners for the app attach here."""
+
+
 async_session = async_sessionmaker(
-    bind=engine, expire_on_commit=False, class_=AsyncSession
+    bind=engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=AppSession
 )
 
 
+async def warm_pool() -> int:
+    """Open the pool's base connections up front so early requests skip connection setup.
+
+    Returns the number of connections opened (0 for single-connection pools).
+    """
+    size = getattr(engine.pool, "size", None)
+    if isinstance(engine.pool, StaticPool) or size is None:
+        return 0
+    results = await asyncio.gather(*(engine.connect() for _ in range(size())), return_exceptions=True)
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    # Closing checks them back into the pool, where they stay open
+    await asyncio.gather(*(conn.close() for conn in conns))
+    for r in results:
+        if isinstance(r, BaseException):
+            raise r
+    return len(conns)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         try:
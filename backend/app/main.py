@@ -1,15 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+import asyncio
+import hashlib
 import logging
 import os
 import subprocess
 import shutil
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+import sys
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
 from pathlib import Path
 from typing import List, Dict, Any
+from contextlib import asynccontextmanager
 from logging.config import dictConfig
 
+from sqlalchemy.schema import CreateIndex, CreateTable
+
 # Apply logging configuration as early as possible (module import time)
 try:
     from .core.logging_config import get_uvicorn_log_config  # type: ignore
@@ -34,12 +38,16 @@ try:
     from .api.v1.playlist_tracks import router as playlist_tracks_router  # type: ignore
     from .api.v1.oauth import router as oauth_router  # type: ignore
     from .api.v1.oauth_spotify import router as oauth_spotify_router  # type: ignore
-    from .db.session import engine, Base  # type: ignore
+    from .db.session import engine, Base, warm_pool  # type: ignore
+    from .db.models.models import OBSOLETE_INDEXES, TRACK_DELETE_CASCADE_TRIGGER, track_delete_cascade_ddl  # type: ignore
     from .core.config import settings  # type: ignore
     from .api.v1.downloads import router as downloads_router  # type: ignore
     from .api.v1.library import router as library_router, stream_router  # type: ignore
     from .api.v1.settings import router as settings_router  # type: ignore
-    from .worker.downloads_worker import download_queue, DownloadQueue  # type: ignore
+    from .worker.downloads_worker import DownloadQueue  # type: ignore
+    from .utils.http_client import create_http_client  # type: ignore
+    from .utils.cors import CachedPreflightCORSMiddleware  # type: ignore
+    from .utils.static_files import PrecompressedStaticFiles, index_response, list_static_files, load_index  # type: ignore
 except Exception:  # pragma: no cover
     from api.v1.health import router as health_router  # type: ignore
     from api.v1.sources import router as sources_router  # type: ignore
@@ -51,12 +59,18 @@ except Exception:  # pragma: no cover
     from api.v1.playlist_tracks import router as playlist_tracks_router  # type: ignore
     from api.v1.oauth import router as oauth_router  # type: ignore
     from api.v1.oauth_spotify import router as oauth_spotify_router  # type: ignore
-    from db.session import engine, Base  # type: ignore
+    from db.session import engine, Base, warm_pool  # type: ignore
+    from db.models.models import OBSOLETE_INDEXES, TRACK_DELETE_CASCADE_TRIGGER, track_delete_cascade_ddl  # type: ignore
     from core.config import settings  # type: ignore
     from api.v1.downloads import router as downloads_router  # type: ignore
     from api.v1.library import router as library_router, stream_router  # type: ignore
     from api.v1.settings import router as settings_router  # type: ignore
-    from worker.downloads_worker import download_queue, DownloadQueue  # type: ignore
+    from worker.downloads_worker import DownloadQueue  # type: ignore
+    from utils.http_client import create_http_client  # type: ignore
+    from utils.cors import CachedPreflightCORSMiddleware  # type: ignore
+    from utils.static_files import PrecompressedStaticFiles, index_response, list_static_files, load_index  # type: ignore
+
+logger = logging.getLogger("backend.app.startup")
 
 tags_metadata = [
     {"name": "health", "description": "Health checks and basic service info."},
@@ -66,35 +80,224 @@ tags_metadata = [
     {"name": "oauth", "description": "OAuth token storage and provider-specific flows."},
 ]
 
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.version,
-    description=(
-        "API for ingesting music from external providers (e.g., Spotify),"
-        " searching/downloading candidates (e.g., YouTube), and managing a local library."
-    ),
-    openapi_tags=tags_metadata,
-    # Serve docs under /api/* to match API prefix
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json",
-    contact={"name": settings.app_name},
-    license_info={
-        "name": "MIT",
-    },
-)
 
-# CORS: allow Vite frontend during development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def _schema_fingerprint() -> int:
+    """Positive 31-bit hash of the DDL that _migrate_schema brings a database to.
+
+    It changes whenever a table, index, the cascade trigger or the legacy migrations change,
+    so databases are migrated again without a hand-maintained version number.
+    """
+    parts = [str(CreateTable(t).compile(dialect=engine.dialect)) for t in Base.metadata.sorted_tables]
+    parts += [
+        str(CreateIndex(i).compile(dialect=engine.dialect))
+        for t in Base.metadata.sorted_tables
+        for i in sorted(t.indexes, key=lambda i: i.name or "")
+    ]
+    parts += [track_delete_cascade_ddl(), *OBSOLETE_INDEXES, str(_LEGACY_MIGRATIONS_VERSION)]
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") & 0x7FFFFFFF or 1
+
+
+# Bump when the legacy column/table migrations in _migrate_schema change
+_LEGACY_MIGRATIONS_VERSION = 1
+
+
+def _expected_schema_objects() -> set:
+    """Names of the tables, indexes and trigger that _migrate_schema leaves in sqlite_master."""
+    names = {TRACK_DELETE_CASCADE_TRIGGER}
+    for table in Base.metadata.sorted_tables:
+        names.add(table.name)
+        names.update(index.name for index in table.indexes if index.name)
+    return names
+
+
+async def _migrate_schema(conn) -> bool:
+    """Create tables, apply legacy SQLite migrations, indexes and the cascade trigger.
+
+    Returns False when the index or trigger step failed, so it is retried on the next start.
+    """
+    complete = True
+    # Create tables (simple init, replace by migrations later)
+    await conn.run_sync(Base.metadata.create_all)
+    # Lightweight auto-migrations for legacy SQLite DBs (best-effort, replace with Alembic later)
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(track_identities)")
+        cols = [row[1] for row in result.fetchall()]
+        alter_statements = []
+        if "fingerprint" not in cols:
+            alter_statements.append("ALTER TABLE track_identities ADD COLUMN fingerprint VARCHAR(500)")
+        if "created_at" not in cols:
+            alter_statements.append("ALTER TABLE track_identities ADD COLUMN created_at DATETIME")
+        if "updated_at" not in cols:
+            alter_statements.append("ALTER TABLE track_identities ADD COLUMN updated_at DATETIME")
+        for stmt in alter_statements:
+            try:
+                await conn.exec_driver_sql(stmt)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    # Migration for tracks table
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
+        cols = [row[1] for row in result.fetchall()]
+        alter_statements = []
+        if "release_date" not in cols:
+            alter_statements.append("ALTER TABLE tracks ADD COLUMN release_date DATETIME")
+        if "spotify_added_at" not in cols:
+            alter_statements.append("ALTER TABLE tracks ADD COLUMN spotify_added_at DATETIME")
+        for stmt in alter_statements:
+            try:
+                await conn.exec_driver_sql(stmt)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    # Auto-migrate new Track columns (genre, bpm) if missing (Step 1.4)
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
+        tcols = [row[1] for row in result.fetchall()]
+        if "genre" not in tcols:
+            try:
+                await conn.exec_driver_sql("ALTER TABLE tracks ADD COLUMN genre VARCHAR(200)")
+            except Exception:
+                pass
+        if "bpm" not in tcols:
+            try:
+                await conn.exec_driver_sql("ALTER TABLE tracks ADD COLUMN bpm INTEGER")
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    # Repair legacy SQLite schemas where tracks.id is NOT a PRIMARY KEY (causes NOT NULL constraint on insert)
+    # We rebuild the table with the correct schema and preserve data.
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
+        rows = result.fetchall()
+        if rows:
+            # rows: cid, name, type, notnull, dflt_value, pk
+            id_row = next((r for r in rows if r[1] == "id"), None)
+            if id_row is not None:
+                id_pk_flag = id_row[5]
+                if not id_pk_flag:
+                    logger.info("Migrating tracks table to set id as PRIMARY KEY AUTOINCREMENT …")
+                    # Disable FKs for table rebuild
+                    await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                    # Create new table with correct schema
+                    await conn.exec_driver_sql(
+                        """
+                        CREATE TABLE IF NOT EXISTS tracks_new (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            title VARCHAR(500) NOT NULL,
+                            artists VARCHAR(500) NOT NULL,
+                            album VARCHAR(500),
+                            duration_ms INTEGER,
+                            isrc VARCHAR(50),
+                            year INTEGER,
+                            explicit BOOLEAN NOT NULL DEFAULT 0,
+                            cover_url VARCHAR(1000),
+                            normalized_title VARCHAR(500),
+                            normalized_artists VARCHAR(500),
+                            genre VARCHAR(200),
+                            bpm INTEGER,
+                            release_date DATETIME,
+                            spotify_added_at DATETIME,
+                            created_at DATETIME,
+                            updated_at DATETIME
+                        )
+                        """
+                    )
+                    # Determine columns present to copy
+                    existing_cols = [r[1] for r in rows]
+                    desired = [
+                        "id","title","artists","album","duration_ms","isrc","year","explicit","cover_url",
+                        "normalized_title","normalized_artists","genre","bpm","release_date","spotify_added_at","created_at","updated_at"
+                    ]
+                    copy_cols = [c for c in desired if c in existing_cols]
+                    cols_csv = ",".join(copy_cols)
+                    await conn.exec_driver_sql(
+                        f"INSERT INTO tracks_new ({cols_csv}) SELECT {cols_csv} FROM tracks"
+                    )
+                    await conn.exec_driver_sql("DROP TABLE tracks")
+                    await conn.exec_driver_sql("ALTER TABLE tracks_new RENAME TO tracks")
+                    # Recreate indexes
+                    await conn.exec_driver_sql(
+                        "CREATE INDEX IF NOT EXISTS ix_tracks_normalized_title ON tracks (normalized_title)"
+                    )
+                    await conn.exec_driver_sql(
+                        "CREATE INDEX IF NOT EXISTS ix_tracks_normalized_artists ON tracks (normalized_artists)"
+                    )
+                    await conn.exec_driver_sql(
+                        "CREATE INDEX IF NOT EXISTS ix_track_isrc ON tracks (isrc)"
+                    )
+                    await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+                    logger.info("Tracks table migration complete.")
+    except Exception as _e:
+        # Best-effort; continue startup if migration isn't applicable
+        try:
+            logger.warning("Tracks table migration skipped or failed: %s", _e)
+        except Exception:
+            pass
+
+    # Auto-migrate playlists.selected column (Step 3.1)
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(playlists)")
+        pcols = [row[1] for row in result.fetchall()]
+        if "selected" not in pcols:
+            try:
+                await conn.exec_driver_sql("ALTER TABLE playlists ADD COLUMN selected BOOLEAN DEFAULT 0 NOT NULL")
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    # Auto-migrate library_files.actual_duration_ms column
+    try:  # pragma: no cover
+        result = await conn.exec_driver_sql("PRAGMA table_info(library_files)")
+        lfcols = [row[1] for row in result.fetchall()]
+        if "actual_duration_ms" not in lfcols:
+            try:
+                await conn.exec_driver_sql("ALTER TABLE library_files ADD COLUMN actual_duration_ms INTEGER")
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    # (Removed: audio feature columns auto-migration no longer needed)
+
+    # create_all skips tables that already exist, so add indexes introduced since they were created.
+    # Existing names come from sqlite_master because reflection skips expression indexes.
+    def _create_missing_indexes(sync_conn):
+        # Indexes superseded by a composite one sharing their leading column
+        for name in OBSOLETE_INDEXES:
+            sync_conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        existing = set(sync_conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(sync_conn)
+
+    try:
+        await conn.run_sync(_create_missing_indexes)
+    except Exception as _e:
+        complete = False
+        logger.warning("Index creation skipped or failed: %s", _e)
+
+    # Cascade track deletes to dependent rows (after any tracks table rebuild above, which drops triggers)
+    try:
+        await conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TRACK_DELETE_CASCADE_TRIGGER}")
+        await conn.exec_driver_sql(track_delete_cascade_ddl())
+    except Exception as _e:
+        complete = False
+        logger.warning("Track delete cascade trigger not installed: %s", _e)
+    return complete
+
 
-@app.on_event("startup")
-async def on_startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     # Ensure a logging configuration with timestamps exists so module and uvicorn logs are visible
     try:
         level_name = os.environ.get("APP_LOG_LEVEL", "INFO").upper()
@@ -140,162 +343,47 @@ async def on_startup():
     except Exception:
         pass
     
-    # Create tables (simple init, replace by migrations later)
+    # Schema setup runs only when the database was not yet brought to the current models: the
+    # fingerprint is stored in SQLite's user_version header, read here in a single statement.
+    # Table rebuilds and restored backups can keep a matching user_version while losing indexes
+    # or the cascade trigger, so their presence in sqlite_master is checked before skipping.
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        # Lightweight auto-migrations for legacy SQLite DBs (best-effort, replace with Alembic later)
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(track_identities)")
-            cols = [row[1] for row in result.fetchall()]
-            alter_statements = []
-            if "fingerprint" not in cols:
-                alter_statements.append("ALTER TABLE track_identities ADD COLUMN fingerprint VARCHAR(500)")
-            if "created_at" not in cols:
-                alter_statements.append("ALTER TABLE track_identities ADD COLUMN created_at DATETIME")
-            if "updated_at" not in cols:
-                alter_statements.append("ALTER TABLE track_identities ADD COLUMN updated_at DATETIME")
-            for stmt in alter_statements:
-                try:
-                    await conn.exec_driver_sql(stmt)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        # Migration for tracks table
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
-            cols = [row[1] for row in result.fetchall()]
-            alter_statements = []
-            if "release_date" not in cols:
-                alter_statements.append("ALTER TABLE tracks ADD COLUMN release_date DATETIME")
-            if "spotify_added_at" not in cols:
-                alter_statements.append("ALTER TABLE tracks ADD COLUMN spotify_added_at DATETIME")
-            for stmt in alter_statements:
-                try:
-                    await conn.exec_driver_sql(stmt)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        # Auto-migrate new Track columns (genre, bpm) if missing (Step 1.4)
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
-            tcols = [row[1] for row in result.fetchall()]
-            if "genre" not in tcols:
-                try:
-                    await conn.exec_driver_sql("ALTER TABLE tracks ADD COLUMN genre VARCHAR(200)")
-                except Exception:
-                    pass
-            if "bpm" not in tcols:
-                try:
-                    await conn.exec_driver_sql("ALTER TABLE tracks ADD COLUMN bpm INTEGER")
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        fingerprint = _schema_fingerprint()
+        is_sqlite = engine.dialect.name == "sqlite"
+        current = (await conn.exec_driver_sql("PRAGMA user_version")).scalar() if is_sqlite else None
+        if current == fingerprint:
+            present = set((await conn.exec_driver_sql("SELECT name FROM sqlite_master")).scalars())
+            missing = _expected_schema_objects() - present
+            if missing:
+                logger.warning("Schema objects missing despite a current fingerprint: %s", ", ".join(sorted(missing)))
+                current = None
+        if current != fingerprint:
+            complete = await _migrate_schema(conn)
+            if is_sqlite and complete:
+                await conn.exec_driver_sql(f"PRAGMA user_version = {fingerprint}")
 
-        # Repair legacy SQLite schemas where tracks.id is NOT a PRIMARY KEY (causes NOT NULL constraint on insert)
-        # We rebuild the table with the correct schema and preserve data.
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(tracks)")
-            rows = result.fetchall()
-            if rows:
-                # rows: cid, name, type, notnull, dflt_value, pk
-                id_row = next((r for r in rows if r[1] == "id"), None)
-                if id_row is not None:
-                    id_pk_flag = id_row[5]
-                    if not id_pk_flag:
-                        print("[startup] Migrating tracks table to set id as PRIMARY KEY AUTOINCREMENT …")
-                        # Disable FKs for table rebuild
-                        await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
-                        # Create new table with correct schema
-                        await conn.exec_driver_sql(
-                            """
-                            CREATE TABLE IF NOT EXISTS tracks_new (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                title VARCHAR(500) NOT NULL,
-                                artists VARCHAR(500) NOT NULL,
-                                album VARCHAR(500),
-                                duration_ms INTEGER,
-                                isrc VARCHAR(50),
-                                year INTEGER,
-                                explicit BOOLEAN NOT NULL DEFAULT 0,
-                                cover_url VARCHAR(1000),
-                                normalized_title VARCHAR(500),
-                                normalized_artists VARCHAR(500),
-                                genre VARCHAR(200),
-                                bpm INTEGER,
-                                release_date DATETIME,
-                                spotify_added_at DATETIME,
-                                created_at DATETIME,
-                                updated_at DATETIME
-                            )
-                            """
-                        )
-                        # Determine columns present to copy
-                        existing_cols = [r[1] for r in rows]
-                        desired = [
-                            "id","title","artists","album","duration_ms","isrc","year","explicit","cover_url",
-                            "normalized_title","normalized_artists","genre","bpm","release_date","spotify_added_at","created_at","updated_at"
-                        ]
-                        copy_cols = [c for c in desired if c in existing_cols]
-                        cols_csv = ",".join(copy_cols)
-                        await conn.exec_driver_sql(
-                            f"INSERT INTO tracks_new ({cols_csv}) SELECT {cols_csv} FROM tracks"
-                        )
-                        await conn.exec_driver_sql("DROP TABLE tracks")
-                        await conn.exec_driver_sql("ALTER TABLE tracks_new RENAME TO tracks")
-                        # Recreate indexes
-                        await conn.exec_driver_sql(
-                            "CREATE INDEX IF NOT EXISTS ix_tracks_normalized_title ON tracks (normalized_title)"
-                        )
-                        await conn.exec_driver_sql(
-                            "CREATE INDEX IF NOT EXISTS ix_tracks_normalized_artists ON tracks (normalized_artists)"
-                        )
-                        await conn.exec_driver_sql(
-                            "CREATE INDEX IF NOT EXISTS ix_track_isrc ON tracks (isrc)"
-                        )
-                        await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
-                        print("[startup] Tracks table migration complete.")
-        except Exception as _e:
-            # Best-effort; continue startup if migration isn't applicable
-            try:
-                print(f"[startup] Tracks table migration skipped or failed: {_e}")
-            except Exception:
-                pass
-
-        # Auto-migrate playlists.selected column (Step 3.1)
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(playlists)")
-            pcols = [row[1] for row in result.fetchall()]
-            if "selected" not in pcols:
-                try:
-                    await conn.exec_driver_sql("ALTER TABLE playlists ADD COLUMN selected BOOLEAN DEFAULT 0 NOT NULL")
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    try:
+        await warm_pool()
+    except Exception as _e:
+        logger.warning("Connection pool warm-up skipped: %s", _e)
 
-        # Auto-migrate library_files.actual_duration_ms column
-        try:  # pragma: no cover
-            result = await conn.exec_driver_sql("PRAGMA table_info(library_files)")
-            lfcols = [row[1] for row in result.fetchall()]
-            if "actual_duration_ms" not in lfcols:
-                try:
-                    await conn.exec_driver_sql("ALTER TABLE library_files ADD COLUMN actual_duration_ms INTEGER")
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    app.state.httpx = create_http_client()
+    app.state.download_queue = None
 
-        # (Removed: audio feature columns auto-migration no longer needed)
+    # Keep the built SPA shell in memory, with a content hash ETag for conditional GETs, and
+    # list the other root static files once so the SPA fallback never touches the disk
+    app.state.index_bytes = app.state.index_etag = None
+    app.state.static_files = frozenset()
+    if static_dir.is_dir():
+        app.state.static_files = await asyncio.to_thread(list_static_files, static_dir)
+        if "index.html" in app.state.static_files:
+            app.state.index_bytes, app.state.index_etag = await asyncio.to_thread(
+                load_index, static_dir / "index.html"
+            )
 
     # Start download worker(s) unless disabled (e.g., in tests)
     if os.environ.get("DISABLE_DOWNLOAD_WORKER", "0") not in {"1", "true", "TRUE", "True"}:
         # Allow configuring concurrency and simulation via env; default to real downloads (simulate_seconds=0)
-        from .worker import downloads_worker as dw  # lazy import to set global
         try:
             conc = int(os.environ.get("DOWNLOAD_CONCURRENCY", "2"))
         except Exception:
@@ -304,14 +392,21 @@ async def on_startup():
             sim_seconds = float(os.environ.get("DOWNLOAD_SIMULATE_SECONDS", "0"))
         except Exception:
             sim_seconds = 0.0
-        dw.download_queue = DownloadQueue(concurrency=conc, simulate_seconds=sim_seconds)
-        print(f"[startup] Download worker started concurrency={conc} simulate_seconds={sim_seconds}")
-        await dw.download_queue.start()
+        app.state.download_queue = DownloadQueue(concurrency=conc, simulate_seconds=sim_seconds)
+        logger.info("Download worker started concurrency=%d simulate_seconds=%s", conc, sim_seconds)
+        await app.state.download_queue.start()
+
+    # Log the event loop in use; uvloop is expected wherever uvicorn[standard] installs it
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if loop_module.startswith("uvloop") or sys.platform.startswith("win"):
+        logger.info("Event loop: %s", loop_module)
+    else:
+        logger.warning("Event loop: %s (uvloop not active; install uvicorn[standard] for faster I/O)", loop_module)
 
     # Log effective library directory
     try:
         from .core.config import settings as _settings  # type: ignore
-        print(f"[startup] LIBRARY_DIR={_settings.library_dir}")
+        logger.info("LIBRARY_DIR=%s", _settings.library_dir)
     except Exception:
         pass
 
@@ -320,55 +415,108 @@ async def on_startup():
         yt = os.environ.get("YT_DLP_BIN") or shutil.which("yt-dlp")
         if yt:
             ver = subprocess.check_output([yt, "--version"], text=True, timeout=5).strip()
-            logging.getLogger("backend.app").info(f"yt-dlp version={ver} bin={yt}")
+            logger.info("yt-dlp version=%s bin=%s", ver, yt)
     except Exception:
         pass
 
-    # Enqueue any downloads that are already queued at startup
+    # Enqueue any downloads that are already queued at startup, oldest first (only ids are
+    # read; ix_download_status_created returns them in order)
     try:  # pragma: no cover
         from sqlalchemy import select
         from .db.models.models import Download, DownloadStatus  # type: ignore
         from .db.session import async_session  # type: ignore
-        async with async_session() as session:
-            result = await session.execute(select(Download).where(Download.status == DownloadStatus.queued))
-            for dl in result.scalars().all():
-                if dw.download_queue:
-                    await dw.download_queue.enqueue(dl.id)
+        dq = app.state.download_queue
+        if dq:
+            async with async_session() as session:
+                result = await session.scalars(
+                    select(Download.id)
+                    .where(Download.status == DownloadStatus.queued)
+                    .order_by(Download.created_at, Download.id)
+                )
+                queued_ids = list(result)
+            for download_id in queued_ids:
+                await dq.enqueue(download_id)
     except Exception:
         pass
 
-@app.on_event("shutdown")
-async def on_shutdown():
-    from .worker import downloads_worker as dw
     try:
-        dq = dw.download_queue
-        if dq:
-            await dq.stop()
-    except Exception:
-        # Ignore shutdown errors (e.g., event loop closed in test teardown)
-        pass
+        yield
     finally:
-        dw.download_queue = None
-
-# Routes
-app.include_router(health_router, prefix="/api/v1")
-app.include_router(sources_router, prefix="/api/v1")
-app.include_router(playlists_router, prefix="/api/v1")
-app.include_router(tracks_router, prefix="/api/v1")
-app.include_router(tracks_import_router, prefix="/api/v1")
-app.include_router(identities_router, prefix="/api/v1")
-app.include_router(candidates_router, prefix="/api/v1")
-app.include_router(playlist_tracks_router, prefix="/api/v1")
-app.include_router(oauth_router, prefix="/api/v1")
-app.include_router(oauth_spotify_router, prefix="/api/v1")
-app.include_router(downloads_router, prefix="/api/v1")
-app.include_router(library_router, prefix="/api/v1")
-app.include_router(stream_router, prefix="/api/v1")
-app.include_router(settings_router, prefix="/api/v1")
+        try:
+            dq = app.state.download_queue
+            if dq:
+                await dq.stop()
+        except Exception:
+            # Ignore shutdown errors (e.g., event loop closed in test teardown)
+            pass
+        finally:
+            app.state.download_queue = None
+            client = getattr(app.state, "httpx", None)
+            if client is not None:
+                app.state.httpx = None
+                try:
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+app = FastAPI(
+    title=settings.app_name,
+    version=settings.version,
+    description=(
+        "API for ingesting music from external providers (e.g., Spotify),"
+        " searching/downloading candidates (e.g., YouTube), and managing a local library."
+    ),
+    openapi_tags=tags_metadata,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    # Serve docs under /api/* to match API prefix
+    docs_url="/api/docs",
+    redoc_url="/api/redoc",
+    openapi_url="/api/openapi.json",
+    contact={"name": settings.app_name},
+    license_info={
+        "name": "MIT",
+    },
+)
+
+# CORS: allow Vite frontend during development. The origin set is frozen once here;
+# Starlette already pre-joins the method and header values at install time, and
+# preflight responses are reused per (origin, method, headers).
+app.add_middleware(
+    CachedPreflightCORSMiddleware,
+    allow_origins=frozenset(settings.cors_origins),
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    # Browsers may reuse a preflight for a day (Chromium caps this at 2 hours)
+    max_age=86400,
+)
+
+# Routes. Each router is included directly: an intermediate aggregate router would make
+# FastAPI build (and compile the path regex of) every route twice.
+API_ROUTERS = (
+    health_router,
+    sources_router,
+    playlists_router,
+    tracks_router,
+    tracks_import_router,
+    identities_router,
+    candidates_router,
+    playlist_tracks_router,
+    oauth_router,
+    oauth_spotify_router,
+    downloads_router,
+    library_router,
+    stream_router,
+    settings_router,
+)
+for _router in API_ROUTERS:
+    app.include_router(_router, prefix="/api/v1")
 
 # Temporary debug endpoint for diagnosing empty track list rendering
 from fastapi import Depends  # type: ignore
-from sqlalchemy import select as _select  # type: ignore
+from sqlalchemy import func as _func, select as _select  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
 try:
     from .db.session import get_session as _get_session  # type: ignore
@@ -379,57 +527,71 @@ except Exception:  # pragma: no cover
 
 @app.get("/api/v1/_debug/track_count")
 async def debug_track_count(session: AsyncSession = Depends(_get_session)):
-    rows = (await session.execute(_select(_Track))).scalars().all()
+    count = await session.scalar(_select(_func.count()).select_from(_Track))
+    rows = await session.execute(
+        _select(_Track.id, _Track.title, _Track.artists, _Track.created_at).order_by(_Track.id).limit(3)
+    )
     sample = []
-    for t in rows[:3]:
+    for t in rows:
         sample.append({
             "id": t.id,
             "title": t.title,
             "artists": t.artists,
             "created_at": str(t.created_at),
         })
-    return {"count": len(rows), "sample": sample}
+    return {"count": count, "sample": sample}
 
 
 @app.get("/api")
 def api_root():
     return {"name": settings.app_name, "version": settings.version}
 
-# Convenience redirects for default FastAPI docs paths
-@app.get("/docs", include_in_schema=False)
-async def docs_redirect():
-    return RedirectResponse(url="/api/docs")
+# Convenience redirects for default FastAPI docs paths. The targets never change, so each
+# path gets one permanent (browser-cacheable) response, built here and replayed.
+_DOCS_REDIRECTS = {
+    "/docs": RedirectResponse(url="/api/docs", status_code=308),
+    "/redoc": RedirectResponse(url="/api/redoc", status_code=308),
+}
+
+
+async def _docs_redirect(request: Request):
+    return _DOCS_REDIRECTS[request.scope["path"]]
 
-@app.get("/redoc", include_in_schema=False)
-async def redoc_redirect():
-    return RedirectResponse(url="/api/redoc")
+
+for _path in _DOCS_REDIRECTS:
+    app.add_route(_path, _docs_redirect, methods=["GET"], include_in_schema=False)
 
 # Static files (built frontend). When building the frontend, files will be placed under
 # backend/app/static. We mount them at / and provide an SPA fallback.
 static_dir = Path(__file__).resolve().parent / "static"
+ASSETS_CACHE_CONTROL = "public, max-age=31536000, immutable"
 if static_dir.exists():
-    # Serve static assets (JS, CSS, images, etc.)
+    # Serve static assets (JS, CSS, images, etc.). Vite puts a content hash in every
+    # asset file name, so browsers may cache them forever.
     assets_dir = static_dir / "assets"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+        app.mount(
+            "/assets",
+            PrecompressedStaticFiles(directory=str(assets_dir), cache_control=ASSETS_CACHE_CONTROL),
+            name="assets",
+        )
     
     # SPA fallback: serve index.html for all non-API routes
     # This must be defined as a catch-all route to handle client-side routing
     from starlette.exceptions import HTTPException
     
     @app.get("/{full_path:path}", include_in_schema=False)
-    async def spa_fallback(full_path: str):
+    async def spa_fallback(full_path: str, request: Request):
         # Don't intercept API routes - let FastAPI handle them and return proper 404
         if full_path.startswith("api/"):
             raise HTTPException(status_code=404, detail="Not Found")
         
-        # Check if the requested file exists in static_dir (e.g., favicon.ico, robots.txt)
-        requested_file = static_dir / full_path
-        if requested_file.is_file():
-            return FileResponse(str(requested_file))
+        # Files that exist in static_dir (e.g., favicon.ico, robots.txt), listed at startup
+        state = request.app.state
+        if full_path in state.static_files:
+            return FileResponse(str(static_dir / full_path))
         
         # For all other routes, serve index.html to let the frontend router handle it
-        index_file = static_dir / "index.html"
-        if index_file.exists():
-            return FileResponse(str(index_file))
-        raise HTTPException(status_code=404, detail="Not Found")
+        if state.index_etag is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        return index_response(state.index_bytes, state.index_etag, request.headers.get("if-none-match"))
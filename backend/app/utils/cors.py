@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+
+class CachedPreflightCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that replays preflight responses instead of rebuilding them.
+
+    A preflight answer depends only on the static configuration and the request's
+    origin, requested method and requested headers, so the response built for one
+    such triple is stored and reused. Preflights never reach the router either way.
+    The cache is cleared when it reaches ``max_cached_preflights`` entries, which
+    bounds memory when clients send arbitrary header lists.
+    """
+
+    def __init__(self, app: ASGIApp, max_cached_preflights: int = 256, **kwargs: Any) -> None:
+        super().__init__(app, **kwargs)
+        self.max_cached_preflights = max_cached_preflights
+        self._preflights: Dict[Tuple[str, str, Optional[str]], Response] = {}
+
+    def preflight_response(self, request_headers: Headers) -> Response:
+        key = (
+            request_headers["origin"],
+            request_headers["access-control-request-method"],
+            request_headers.get("access-control-request-headers"),
+        )
+        response = self._preflights.get(key)
+        if response is None:
+            response = super().preflight_response(request_headers)
+            if len(self._preflights) >= self.max_cached_preflights:
+                self._preflights.clear()
+            self._preflights[key] = response
+        return response
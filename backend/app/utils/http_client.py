@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Return the pooled client shared by request handlers (stored on ``app.state.httpx``).
+
+    HTTP/2 is enabled when the optional ``h2`` package is installed; otherwise the
+    client keeps HTTP/1.1 keep-alive connections.
+    """
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=10,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
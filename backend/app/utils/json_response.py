@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from typing import Any, Iterable, Tuple, Type
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import inspect as sa_inspect
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def read_columns(model: Type[BaseModel], entity: type) -> list:
+    """Mapped columns of ``entity`` that ``model`` exposes, in model field order.
+
+    Selecting these instead of the entity skips ORM instance construction; the
+    resulting rows support attribute access, so ``from_attributes`` models accept them.
+    """
+    mapped = set(sa_inspect(entity).column_attrs.keys())
+    return [getattr(entity, name) for name in model.model_fields if name in mapped]
+
+
+@lru_cache(maxsize=None)
+def _column_fields(model: Type[BaseModel], entity: type) -> Tuple[str, ...]:
+    """Fields of ``model`` that are column attributes of the mapped ``entity``."""
+    columns = set(sa_inspect(entity).column_attrs.keys())
+    return tuple(n for n in model.model_fields if n in columns)
+
+
+def construct_model(model: Type[BaseModel], obj: Any) -> BaseModel:
+    """Build ``model`` from the attributes of a trusted row without running validation.
+
+    Use for ORM instances and result rows read from the database. Only column values
+    are copied (relationships are never touched, so no lazy load is triggered); other
+    fields keep their model defaults and nested models are left for the caller to set.
+    """
+    mapper = sa_inspect(type(obj), raiseerr=False)
+    if mapper is None:
+        names = [name for name in model.model_fields if hasattr(obj, name)]
+    else:
+        names = _column_fields(model, mapper.class_)
+    return model.model_construct(**{name: getattr(obj, name) for name in names})
+
+
+def orjson_dump_model(item: BaseModel) -> bytes:
+    """JSON bytes of a single model, for callers that cache or wrap the payload themselves."""
+    return orjson.dumps(item.model_dump(mode="json"))
+
+
+def orjson_models_response(items: Iterable[BaseModel]) -> Response:
+    """Dump already-built models as a raw JSON array response.
+
+    Returning a ready-made Response lets FastAPI skip ``jsonable_encoder`` and the
+    response_model validation pass; the route's response_model still documents the schema.
+    """
+    return Response(content=orjson.dumps([m.model_dump(mode="json") for m in items]), media_type="application/json")
+
+
+def orjson_list_response(model: Type[BaseModel], rows: Iterable[Any]) -> Response:
+    """Serialize database rows (ORM instances or column rows) through ``model`` as a raw JSON response."""
+    return orjson_models_response(construct_model(model, r) for r in rows)
+
+
+def orjson_rows_body(model: Type[BaseModel], rows: Iterable[Any], ndjson: bool = False) -> bytes:
+    """JSON array of column ``rows`` serialized through ``model``.
+
+    With ``ndjson`` the rows are written as newline-delimited JSON objects instead,
+    one per line, so clients can parse rows one at a time; the body is still built whole.
+    """
+    # Rows come straight from the database, so skip validation with model_construct
+    items = [orjson.dumps(model.model_construct(**r._mapping).model_dump(mode="json")) for r in rows]
+    if ndjson:
+        return b"".join(item + b"\n" for item in items)
+    return b"[" + b",".join(items) + b"]"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for newline-delimited JSON via ``Accept``."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak ETag derived from ``parts`` (bytes are hashed as-is, anything else via ``str``)."""
+    h = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+        h.update(b"\x00")
+    return f'W/"{h.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True when the request's ``If-None-Match`` matches ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
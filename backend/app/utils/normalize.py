@@ -13,6 +13,7 @@ from __future__ import annotations
 import re
 import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
@@ -34,6 +35,32 @@ _PARENS_CONTENT_RE = re.compile(r"\([^)]*\)")
 # Match a trailing dash and any following descriptor (handles -, –, —)
 _DASH_SUFFIX_RE = re.compile(r"\s*[\-–—]\s*[^\-–—()]+$")
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_FEAT_MARKER_RE = re.compile(r"\b(feat\.?|ft\.?|featuring)\b", flags=re.IGNORECASE)
+_NON_WORD_PUNCT_RE = re.compile(r"[^a-zA-Z0-9&,+/\\'\- ]+")
+_ORPHAN_AMPERSANDS_RE = re.compile(r"& +&")
+_PRIMARY_SPLIT_RE = re.compile(r"\s*(,|&| x | and )\s*", flags=re.IGNORECASE)
+_REMIX_FLAG_RE = re.compile(r"\b(remix|edit|mix)\b", flags=re.IGNORECASE)
+_LIVE_FLAG_RE = re.compile(r"\blive\b", flags=re.IGNORECASE)
+_REMASTER_FLAG_RE = re.compile(r"\bremaster(?:ed)?\b", flags=re.IGNORECASE)
+
+# Artist separator rewrites, applied in order by _normalize_artist_separators
+_ARTIST_SEPARATOR_SUBS = [
+    # Only treat 'x' or '×' as a separator when surrounded by whitespace (e.g., 'Artist x Remix').
+    # Do NOT split inside artist names containing 'x' like 'Ausmax' or 'Phoenix'.
+    (re.compile(r"(?i)\s+[x×]\s+"), " & "),
+    (re.compile(r"\s*\+\s*"), " & "),
+    (re.compile(r"\s*/\s*"), " & "),
+    (re.compile(r"(?i)\s*\band\b\s*"), " & "),
+    (re.compile(r"(?i)\s*\bwith\b\s*"), " & "),
+    # Collapse multiple separators
+    (re.compile(r"\s*&\s*&\s*"), " & "),
+    (re.compile(r"\s*,\s*,\s*"), ", "),
+    # Normalize spaces around comma and ampersand
+    (re.compile(r"\s*,\s*"), ", "),
+    (re.compile(r"\s*&\s*"), " & "),
+]
+
 
 def _normalize_dash_variants(text: str) -> str:
     """Replace unicode dash variants with a simple ASCII hyphen.
@@ -43,7 +70,7 @@ def _normalize_dash_variants(text: str) -> str:
     # Replace en/em dashes with a plain hyphen; keep existing spacing to avoid breaking names like 'Jay-Z'
     text = text.replace("–", "-").replace("—", "-")
     # Collapse remaining whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
     return text
 
 
@@ -58,35 +85,27 @@ def _normalize_artist_separators(artists: str) -> str:
     s = artists
     # First normalize dash variants (rare inside artists) and spacing consistently
     s = _normalize_dash_variants(s)
-    # Replace various separators with ampersand.
-    # IMPORTANT: Only treat 'x' or '×' as a separator when surrounded by whitespace (e.g., 'Artist x Remix').
-    # Do NOT split inside artist names containing 'x' like 'Ausmax' or 'Phoenix'.
-    s = re.sub(r"(?i)\s+[x×]\s+", " & ", s)
-    s = re.sub(r"\s*\+\s*", " & ", s)
-    s = re.sub(r"\s*/\s*", " & ", s)
-    s = re.sub(r"(?i)\s*\band\b\s*", " & ", s)
-    s = re.sub(r"(?i)\s*\bwith\b\s*", " & ", s)
-    # Collapse multiple separators
-    s = re.sub(r"\s*&\s*&\s*", " & ", s)
-    s = re.sub(r"\s*,\s*,\s*", ", ", s)
-    # Normalize spaces around comma and ampersand
-    s = re.sub(r"\s*,\s*", ", ", s)
-    s = re.sub(r"\s*&\s*", " & ", s)
+    # Replace various separators with ampersand
+    for pattern, repl in _ARTIST_SEPARATOR_SUBS:
+        s = pattern.sub(repl, s)
     # Collapse whitespace
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _WHITESPACE_RE.sub(" ", s).strip()
     return s
 
 
 def _strip_accents(text: str) -> str:
     """Remove accents and normalize unicode to NFKD then ASCII-ish."""
+    if text.isascii():
+        # NFKD leaves ASCII unchanged and it has no combining marks
+        return text
     text = unicodedata.normalize("NFKD", text)
     return "".join(ch for ch in text if not unicodedata.combining(ch))
 
 
 def _clean_punctuation(text: str) -> str:
     # Keep alphanumerics and common separators, collapse spaces
-    text = re.sub(r"[^a-zA-Z0-9&,+/\\'\- ]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _NON_WORD_PUNCT_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
     return text
 
 
@@ -103,7 +122,7 @@ class NormalizedTrack:
 
 
 def _extract_primary_artist(artists: str) -> str:
-    parts = re.split(r"\s*(,|&| x | and )\s*", artists, flags=re.IGNORECASE)
+    parts = _PRIMARY_SPLIT_RE.split(artists)
     # parts will include delimiters; take first token
     primary = parts[0] if parts else artists
     return primary.strip()
@@ -124,8 +143,8 @@ def normalize_track(artists: str, title: str) -> NormalizedTrack:
 
     # Replace featured markers with a separator so collaborators are preserved:
     # 'Artist feat. Someone x Another' -> 'Artist & Someone x Another'
-    artists_wo_feat = re.sub(r"(?i)\b(feat\.?|ft\.?|featuring)\b", " & ", orig_artists)
-    title_wo_feat = re.sub(r"(?i)\b(feat\.?|ft\.?|featuring)\b", " & ", orig_title)
+    artists_wo_feat = _FEAT_MARKER_RE.sub(" & ", orig_artists)
+    title_wo_feat = _FEAT_MARKER_RE.sub(" & ", orig_title)
 
     # Strip bracketed content and dash suffixes that often include version info
     title_base = _PARENS_CONTENT_RE.sub("", title_wo_feat)
@@ -133,9 +152,9 @@ def normalize_track(artists: str, title: str) -> NormalizedTrack:
 
     # Feature flags from original title (so we do not miss bracketed keywords)
     flags_src = f"{orig_title} {orig_artists}"
-    is_remix_or_edit = bool(re.search(r"\b(remix|edit|mix)\b", flags_src, re.IGNORECASE))
-    is_live = bool(re.search(r"\blive\b", flags_src, re.IGNORECASE))
-    is_remaster = bool(re.search(r"\bremaster(?:ed)?\b", flags_src, re.IGNORECASE))
+    is_remix_or_edit = bool(_REMIX_FLAG_RE.search(flags_src))
+    is_live = bool(_LIVE_FLAG_RE.search(flags_src))
+    is_remaster = bool(_REMASTER_FLAG_RE.search(flags_src))
 
     # Remove descriptive keywords from cleaned title
     title_base = _FEATURE_RE.sub("", title_base)
@@ -149,7 +168,7 @@ def normalize_track(artists: str, title: str) -> NormalizedTrack:
     artists_no_accents = _normalize_artist_separators(artists_no_accents)
     clean_artists = _clean_punctuation(artists_no_accents)
     # After cleaning punctuation, collapse orphan ampersands (e.g., 'Artist &  Another')
-    clean_artists = re.sub(r"& +&", "&", clean_artists)
+    clean_artists = _ORPHAN_AMPERSANDS_RE.sub("&", clean_artists)
     clean_title = _clean_punctuation(title_no_accents)
 
     # Primary artist
@@ -162,7 +181,7 @@ def normalize_track(artists: str, title: str) -> NormalizedTrack:
     # If original artists string contained an explicit featured marker, collapse normalized_artists
     # to only the primary artist to keep normalization consistent with expectations while retaining
     # full collaborator info in clean_artists. This mirrors legacy behavior relied upon by tests.
-    if re.search(r"(?i)\b(feat\.?|ft\.?|featuring)\b", orig_artists):
+    if _FEAT_MARKER_RE.search(orig_artists):
         norm_artists = _clean_punctuation(_strip_accents(primary)).lower()
 
     return NormalizedTrack(
@@ -177,6 +196,27 @@ def normalize_track(artists: str, title: str) -> NormalizedTrack:
     )
 
 
+# Inputs longer than this (artists + title) bypass the memo cache to bound its memory
+_CACHE_MAX_INPUT_LEN = 512
+
+
+@lru_cache(maxsize=4096)
+def _normalize_track_memo(artists: str, title: str) -> NormalizedTrack:
+    return normalize_track(artists, title)
+
+
+def normalize_track_cached(artists: str, title: str) -> NormalizedTrack:
+    """Memoized normalize_track for hot paths that see the same pairs repeatedly.
+
+    NormalizedTrack is frozen, so sharing cached instances between callers is safe.
+    """
+    artists = artists or ""
+    title = title or ""
+    if len(artists) + len(title) > _CACHE_MAX_INPUT_LEN:
+        return normalize_track(artists, title)
+    return _normalize_track_memo(artists, title)
+
+
 def durations_close_ms(a_ms: Optional[int], b_ms: Optional[int], tolerance_ms: int = 2000) -> bool:
     """Return True if both durations are present and within tolerance in ms."""
     if a_ms is None or b_ms is None:
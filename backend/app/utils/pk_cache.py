@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Hashable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    from ..db.session import AppSession  # type: ignore
+except Exception:  # pragma: no cover
+    from db.session import AppSession  # type: ignore
+
+
+# Every live cache; one set of listeners on the app's session class fans events out to them
+_CACHES: "weakref.WeakSet[PkCache]" = weakref.WeakSet()
+# Marks a session whose DML touched a cached table without naming the rows
+_ALL_ROWS = object()
+
+
+class PkCache:
+    """Bounded TTL cache of serialized rows keyed by primary key.
+
+    Writes through ``async_session`` keep it current: an ORM flush that adds, changes
+    or deletes a row of ``model`` evicts that row, and an ``insert``/``update``/``delete``
+    statement on its table passed to ``session.execute`` clears the cache, since the
+    affected rows are not known. Both are repeated once the transaction commits so a
+    read racing the write cannot leave the pre-commit state cached. Writes outside
+    those sessions (raw connections, other processes) show up after ``ttl``.
+
+    With ``maxbytes``, least recently used entries are also evicted while the sizes
+    passed to :meth:`put` add up to more than that, and larger values are not stored.
+    """
+
+    def __init__(self, model: type, maxsize: int = 4096, ttl: float = 30.0, maxbytes: Optional[int] = None) -> None:
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._models = model if isinstance(model, tuple) else (model,)
+        self._tables = {m.__table__ for m in self._models}
+        self._data: "OrderedDict[Hashable, tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._info_key = f"pk_cache_{id(self)}"
+        _CACHES.add(self)
+
+    def get(self, pk: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(pk)
+            if entry is None:
+                return None
+            expires, value, _ = entry
+            if expires < time.monotonic():
+                self._discard(pk)
+                return None
+            self._data.move_to_end(pk)
+            return value
+
+    def put(self, pk: Hashable, value: Any, nbytes: int = 0) -> None:
+        """Store ``value``; ``nbytes`` is its size as counted against ``maxbytes``."""
+        with self._lock:
+            self._discard(pk)
+            if self.maxbytes is not None and nbytes > self.maxbytes:
+                return
+            self._data[pk] = (time.monotonic() + self.ttl, value, nbytes)
+            self._bytes += nbytes
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+                self._bytes -= self._data.popitem(last=False)[1][2]
+
+    def pop(self, pk: Hashable, session: Any = None) -> None:
+        """Evict ``pk``; when ``session`` is given, evict it again after that session commits."""
+        if session is not None:
+            sync_session = getattr(session, "sync_session", session)
+            sync_session.info.setdefault(self._info_key, set()).add(pk)
+        with self._lock:
+            self._discard(pk)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _discard(self, pk: Hashable) -> None:
+        entry = self._data.pop(pk, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _on_flush(self, session: Session, written: List[Any]) -> None:
+        for obj in written:
+            if isinstance(obj, self.model):
+                pk = getattr(obj, "id", None)
+                if pk is not None:
+                    self.pop(pk, session)
+
+    def _on_dml(self, session: Session) -> None:
+        session.info.setdefault(self._info_key, set()).add(_ALL_ROWS)
+        self.clear()
+
+    def _on_commit(self, session: Session) -> None:
+        touched = session.info.pop(self._info_key, ())
+        if _ALL_ROWS in touched:
+            self.clear()
+            return
+        for pk in touched:
+            self.pop(pk)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(self._info_key, None)
+
+
+class QueryCache(PkCache):
+    """Bounded TTL cache of query results, cleared whenever any of ``models`` is written.
+
+    ORM flushes and DML statements (``session.execute(insert(...))`` and friends)
+    touching those tables clear the cache immediately and again on commit. Compare
+    :attr:`generation` before computing a value and after, and skip :meth:`put`
+    if it changed, so a result read while a write was in flight is never stored.
+    """
+
+    def __init__(self, models: tuple, maxsize: int = 256, ttl: float = 30.0, maxbytes: Optional[int] = None) -> None:
+        self.generation = 0
+        super().__init__(tuple(models), maxsize, ttl, maxbytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def _on_flush(self, session: Session, written: List[Any]) -> None:
+        if any(isinstance(obj, self._models) for obj in written):
+            self._on_dml(session)
+
+
+@event.listens_for(AppSession, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    written = list(chain(session.new, session.dirty, session.deleted))
+    if written:
+        for cache in list(_CACHES):
+            cache._on_flush(session, written)
+
+
+@event.listens_for(AppSession, "do_orm_execute")
+def _on_execute(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        for cache in list(_CACHES):
+            if table in cache._tables:
+                cache._on_dml(orm_execute_state.session)
+
+
+@event.listens_for(AppSession, "after_commit")
+def _after_commit(session: Session) -> None:
+    for cache in list(_CACHES):
+        cache._on_commit(session)
+
+
+@event.listens_for(AppSession, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction: Any) -> None:
+    for cache in list(_CACHES):
+        cache._on_rollback(session)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import re
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+# Preferred first; each file may have a sibling with the suffix, built next to it
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# The SPA shell names the current hashed assets, so browsers must revalidate it
+INDEX_CACHE_CONTROL = "no-cache"
+
+_ZERO_QUALITY = re.compile(r"q\s*=\s*0(\.0*)?\s*$", re.IGNORECASE)
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """Content codings listed in an ``Accept-Encoding`` value, minus those with ``q=0``."""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if name and not _ZERO_QUALITY.search(params):
+            accepted.add(name)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a ``.br``/``.gz`` sibling when the client accepts that coding.
+
+    Siblings are produced at build time (see the Dockerfile), so nothing is compressed
+    per request; files without one are served as-is. ``cache_control``, when given, is
+    sent with every file, e.g. an immutable policy for content-hashed build assets.
+    """
+
+    def __init__(self, *args, cache_control: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        headers: Dict[str, str] = {"Vary": "Accept-Encoding"}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+
+        response: Optional[Response] = None
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            compressed = f"{full_path}{suffix}"
+            try:
+                compressed_stat = os.stat(compressed)
+            except OSError:
+                continue
+            response = FileResponse(
+                compressed,
+                status_code=status_code,
+                stat_result=compressed_stat,
+                media_type=guess_type(str(full_path))[0] or "text/plain",
+                headers={**headers, "Content-Encoding": encoding},
+            )
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def list_static_files(root: PathLike, exclude: Tuple[str, ...] = ("assets",)) -> FrozenSet[str]:
+    """Relative POSIX paths of the files under ``root``, skipping the top-level ``exclude`` directories.
+
+    Taken once at startup so per-request lookups are set membership tests with no ``stat``;
+    only listed paths are served, which also keeps ``..`` segments from escaping ``root``.
+    """
+    root = Path(root)
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        if Path(dirpath) == root:
+            dirnames[:] = [d for d in dirnames if d not in exclude]
+        rel = Path(dirpath).relative_to(root)
+        files.update((rel / name).as_posix() for name in filenames)
+    return frozenset(files)
+
+
+def load_index(path: PathLike) -> Tuple[bytes, str]:
+    """Read a built ``index.html`` and derive its strong ETag from a SHA-256 of the content."""
+    body = Path(path).read_bytes()
+    return body, '"' + base64.b64encode(hashlib.sha256(body).digest()).decode() + '"'
+
+
+def index_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """``index.html`` from memory, or ``304 Not Modified`` when the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": INDEX_CACHE_CONTROL}
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
@@ -13,16 +13,21 @@ YOUTUBE_SEARCH_FAKE=1 environment variable which returns canned results.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
 import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 import logging
 import concurrent.futures
 
-from .normalize import normalize_track
+from .normalize import normalize_track, normalize_track_cached
 from .ranking_service import RankingService
 
 try:
@@ -217,7 +222,7 @@ def _build_search_queries(artists: str, title: str, prefer_extended: bool) -> Li
        using both space and hyphen patterns: "Artists Title extended mix", "Artists - Title extended mix",
        and original mix counterparts. De-dup preserving order.
     """
-    norm = normalize_track(artists, title)
+    norm = normalize_track_cached(artists, title)
     primary = norm.primary_artist
     artists_list = _parse_artists(artists)
 
@@ -834,6 +839,121 @@ def search_youtube(
     return filtered_scored
 
 
+def _env_search_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("YOUTUBE_SEARCH_CONCURRENCY", "8")))
+    except Exception:
+        return 8
+
+
+# Dedicated bounded pool: caps how many blocking searches run at once so a burst
+# of requests cannot exhaust the default executor or hammer the provider. Extra
+# submissions queue until a worker frees up.
+_SEARCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_env_search_concurrency(), thread_name_prefix="yt-search"
+)
+
+
+def _env_cache_ttl() -> float:
+    try:
+        return max(0.0, float(os.environ.get("YOUTUBE_SEARCH_CACHE_TTL", "600")))
+    except Exception:
+        return 600.0
+
+
+_RESULT_CACHE_MAX = 1024
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[float, List[ScoredResult]]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _search_env_snapshot() -> tuple:
+    """Search knobs (``YOUTUBE_SEARCH_*``/``YTSP_*``) that change results, as a hashable tuple."""
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(("YOUTUBE_SEARCH_", "YTSP_"))))
+
+
+# Part of every result cache key; read once at import and again by clear_search_cache()
+_SEARCH_ENV = _search_env_snapshot()
+
+
+def _result_cache_key(
+    artists: str,
+    title: str,
+    track_duration_ms: Optional[int],
+    prefer_extended: bool,
+    limit: int,
+) -> tuple:
+    norm = normalize_track_cached(artists, title)
+    duration_s = track_duration_ms // 1000 if track_duration_ms is not None else None
+    return (norm.normalized_artists, norm.normalized_title, duration_s, bool(prefer_extended), limit, _SEARCH_ENV)
+
+
+def _result_cache_get(key: tuple) -> Optional[List[ScoredResult]]:
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return list(value)
+
+
+def _result_cache_put(key: tuple, value: List[ScoredResult], ttl: float) -> None:
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + ttl, list(value))
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    """Drop cached results and re-read the search settings that are part of the cache key."""
+    global _SEARCH_ENV
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+        _SEARCH_ENV = _search_env_snapshot()
+
+
+async def search_youtube_async(
+    artists: str,
+    title: str,
+    track_duration_ms: Optional[int],
+    prefer_extended: bool = False,
+    limit: int = 15,
+) -> List[ScoredResult]:
+    """Run :func:`search_youtube` off the event loop, memoizing non-empty results.
+
+    At most ``YOUTUBE_SEARCH_CONCURRENCY`` (default 8) searches run concurrently;
+    further callers wait for a free worker. Results are cached for
+    ``YOUTUBE_SEARCH_CACHE_TTL`` seconds (default 600, ``0`` disables) keyed on the
+    normalized artists/title, the duration in seconds, ``prefer_extended`` and
+    ``limit``. Empty results are not cached since they are often transient.
+    """
+    ttl = _env_cache_ttl()
+    key = _result_cache_key(artists, title, track_duration_ms, prefer_extended, limit) if ttl > 0 else None
+    if key is not None:
+        cached = _result_cache_get(key)
+        if cached is not None:
+            return cached
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(
+        _SEARCH_EXECUTOR,
+        functools.partial(
+            search_youtube,
+            artists,
+            title,
+            track_duration_ms,
+            prefer_extended=prefer_extended,
+            limit=limit,
+        ),
+    )
+    if key is not None and results:
+        _result_cache_put(key, results, ttl)
+    return results
+
+
 def filter_scored_results(
     results: List[ScoredResult],
     *,
@@ -332,7 +332,3 @@ async def reset_stale_running_downloads() -> int:
         _log("WARN", f"Reset {count} stale 'running' download(s) to 'failed'")
     
     return count
-
-
-# Singleton queue instance (managed by app startup/shutdown)
-download_queue: Optional[DownloadQueue] = None
@@ -38,41 +38,34 @@ os.environ.setdefault("DISABLE_DOWNLOAD_WORKER", "1")
 
 @pytest.fixture(scope="session", autouse=True)
 async def _startup_and_shutdown_app():
-    """Ensure FastAPI startup/shutdown events run once per test session.
+    """Ensure the FastAPI lifespan runs once per test session.
 
-    This creates all tables on startup as defined in app.main.on_startup.
+    This creates all tables on startup as defined in app.main.lifespan.
     """
     try:
         from backend.app.main import app  # type: ignore
     except Exception:  # pragma: no cover
         from app.main import app  # type: ignore
 
-    # Starlette exposes startup/shutdown helpers via the router
-    await app.router.startup()
-    yield
-    # Ensure in-process worker is stopped before shutting down the app to avoid pending tasks
-    try:
-        try:
-            from backend.app.worker import downloads_worker as dw  # type: ignore
-        except Exception:  # pragma: no cover
-            from app.worker import downloads_worker as dw  # type: ignore
-        if dw.download_queue:
+    async with app.router.lifespan_context(app):
+        yield
+        # Ensure in-process worker is stopped before shutting down the app to avoid pending tasks
+        dq = getattr(app.state, "download_queue", None)
+        if dq:
             try:
-                await dw.download_queue.wait_idle(timeout=1.0)
+                await dq.wait_idle(timeout=1.0)
             except Exception:
                 pass
             try:
-                await dw.download_queue.stop()
+                await dq.stop()
             except Exception:
                 pass
-            dw.download_queue = None
+            app.state.download_queue = None
             # Allow cancellation callbacks to flush before loop shutdown
             try:
                 await asyncio.sleep(0.05)
             except Exception:
                 pass
-    finally:
-        await app.router.shutdown()
 
 
 @pytest.fixture(autouse=True)
@@ -85,19 +78,20 @@ async def _ensure_worker_stopped_after_each_test():
     yield
     try:
         try:
-            from backend.app.worker import downloads_worker as dw  # type: ignore
+            from backend.app.main import app  # type: ignore
         except Exception:  # pragma: no cover
-            from app.worker import downloads_worker as dw  # type: ignore
-        if dw.download_queue:
+            from app.main import app  # type: ignore
+        dq = getattr(app.state, "download_queue", None)
+        if dq:
             try:
-                await dw.download_queue.wait_idle(timeout=0.5)
+                await dq.wait_idle(timeout=0.5)
             except Exception:
                 pass
             try:
-                await dw.download_queue.stop()
+                await dq.stop()
             except Exception:
                 pass
-            dw.download_queue = None
+            app.state.download_queue = None
             # allow callbacks to drain
             with contextlib.suppress(Exception):
                 await asyncio.sleep(0.02)
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+try:
+    from backend.app import app_meta  # type: ignore
+except Exception:  # pragma: no cover
+    from app import app_meta  # type: ignore
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_version_matches_version_file_and_is_read_once():
+    expected = (ROOT / "VERSION").read_text(encoding="utf-8").strip()
+    assert app_meta.__version__ == expected
+    assert app_meta._load_version() == expected
+    before = app_meta._load_version.cache_info().hits
+    app_meta._load_version()
+    assert app_meta._load_version.cache_info().hits == before + 1
@@ -66,4 +66,40 @@ async def test_candidates_crud_sort_and_choose():
         # Delete one
         del_id = data[1]["id"]
         r5 = await ac.delete(f"/api/v1/candidates/{del_id}")
-        assert r5.status_code == 200
\ No newline at end of file
+        assert r5.status_code == 200
+
+@pytest.mark.asyncio
+async def test_ready_for_download_lists_chosen_tracks_without_files():
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import LibraryFile  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import LibraryFile  # type: ignore
+    from datetime import datetime
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        chosen_id, _ = await _create_track(ac, title="Ready Chosen", artists="Ready")
+        on_disk_id, _ = await _create_track(ac, title="Ready On Disk", artists="Ready")
+        unchosen_id, _ = await _create_track(ac, title="Ready Unchosen", artists="Ready")
+        for tid, ext in ((chosen_id, "rdy1"), (on_disk_id, "rdy2"), (unchosen_id, "rdy3")):
+            r = await ac.post(
+                "/api/v1/candidates/",
+                json={"track_id": tid, "provider": "youtube", "external_id": ext, "url": f"http://y/{ext}", "title": ext, "score": 0.5},
+            )
+            if tid != unchosen_id:
+                assert (await ac.post(f"/api/v1/candidates/{r.json()['id']}/choose")).status_code == 200
+        async with async_session() as s:
+            s.add(LibraryFile(track_id=on_disk_id, filepath="/tmp/ready-on-disk.mp3", file_mtime=datetime(2024, 1, 1), file_size=1))
+            await s.commit()
+
+        r = await ac.get("/api/v1/tracks/ready_for_download")
+        assert r.status_code == 200
+        ids = {t["id"] for t in r.json()}
+        assert chosen_id in ids
+        assert on_disk_id not in ids and unchosen_id not in ids
+
+        r = await ac.get("/api/v1/tracks/ready_for_download", params={"include_downloaded": True})
+        ids = {t["id"] for t in r.json()}
+        assert {chosen_id, on_disk_id} <= ids
+        assert unchosen_id not in ids
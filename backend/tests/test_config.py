@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+_RELOAD = """
+import importlib, os
+import dotenv
+from app.core import config
+
+calls = []
+dotenv.load_dotenv = lambda *a, **k: calls.append(a or k)
+importlib.reload(config)
+print(config.get_settings() is config.settings, len(calls))
+os._exit(0)
+"""
+
+
+def test_get_settings_returns_the_module_singleton():
+    try:
+        from backend.app.core import config  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.core import config  # type: ignore
+
+    assert config.get_settings() is config.settings
+    assert config.get_settings() is config.get_settings()
+
+
+def test_reload_does_not_parse_env_files_again():
+    out = subprocess.run(
+        [sys.executable, "-c", _RELOAD], cwd=BACKEND, env=dict(os.environ), capture_output=True, text=True, timeout=60
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "True 0"
+
+
+def test_library_dir_defaults_to_project_library_folder():
+    env = {k: v for k, v in os.environ.items() if k != "LIBRARY_DIR"}
+    # Local .env files are skipped so they cannot provide LIBRARY_DIR
+    code = (
+        "import os, dotenv\ndotenv.load_dotenv = lambda *a, **k: False\n"
+        "from app.core.config import settings\nprint(settings.library_dir)\nos._exit(0)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == str((BACKEND.parent / "library").resolve())
+
+
+def test_split_csv_trims_skips_empties_and_caches():
+    try:
+        from backend.app.core.config import _split_csv  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.core.config import _split_csv  # type: ignore
+
+    raw = " http://a.test , ,http://b.test,, "
+    assert _split_csv(raw) == ("http://a.test", "http://b.test")
+    assert _split_csv(raw) is _split_csv(raw)
+    assert _split_csv(None) == () and _split_csv("") == ()
+
+
+def test_settings_defaults_read_the_environment_snapshot():
+    env = dict(os.environ, DB_POOL_SIZE="7", YOUTUBE_SEARCH_LIMIT="3", CORS_ORIGINS="http://x.test, http://y.test")
+    code = (
+        "import os\nfrom app.core import config\ns = config.settings\n"
+        "print(type(config._ENV) is dict, s.db_pool_size, s.youtube_search_limit, ','.join(s.cors_origins))\nos._exit(0)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "True 7 3 http://x.test,http://y.test"
+
+
+def test_settings_is_a_mutable_dataclass(monkeypatch):
+    import dataclasses
+
+    try:
+        from backend.app.core.config import Settings, settings  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.core.config import Settings, settings  # type: ignore
+
+    assert dataclasses.is_dataclass(settings)
+    monkeypatch.setattr(settings, "youtube_search_limit", 2)
+    assert settings.youtube_search_limit == 2
+    # Instances do not share the mutable default list
+    assert Settings().cors_origins is not Settings().cors_origins
+
+
+def test_dotenv_is_not_imported_without_env_files():
+    import pytest
+
+    if (BACKEND / ".env").is_file() or (BACKEND.parent / ".env").is_file() or Path("/config/.env").is_file():
+        pytest.skip("a local .env file is present")
+    code = "import os, sys\nfrom app.core import config\nprint('dotenv' in sys.modules)\nos._exit(0)\n"
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=dict(os.environ), capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "False"
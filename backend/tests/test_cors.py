@@ -0,0 +1,69 @@
+from httpx import AsyncClient
+
+try:
+    from backend.app.main import app  # type: ignore
+    from backend.app.core.config import settings  # type: ignore
+except Exception:  # pragma: no cover
+    from app.main import app  # type: ignore
+    from app.core.config import settings  # type: ignore
+
+
+def test_cors_origins_are_frozen_at_install_time():
+    mw = next(m for m in app.user_middleware if m.cls.__name__ == "CachedPreflightCORSMiddleware")
+    assert mw.kwargs["allow_origins"] == frozenset(settings.cors_origins)
+
+
+async def test_preflight_allows_only_configured_origins():
+    origin = settings.cors_origins[0]
+    preflight = {"access-control-request-method": "POST", "access-control-request-headers": "x-custom"}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ok = await ac.options("/api/v1/health", headers={"origin": origin, **preflight})
+        denied = await ac.options("/api/v1/health", headers={"origin": "http://evil.test", **preflight})
+        plain = await ac.get("/api/v1/health")
+    assert ok.status_code == 200
+    assert ok.headers["access-control-allow-origin"] == origin
+    assert ok.headers["access-control-allow-headers"] == "x-custom"
+    assert ok.headers["access-control-max-age"] == "86400"
+    assert denied.status_code == 400
+    assert "access-control-allow-origin" not in plain.headers
+
+
+async def test_preflight_responses_are_reused_and_bounded():
+    from starlette.middleware.cors import CORSMiddleware
+
+    try:
+        from backend.app.utils.cors import CachedPreflightCORSMiddleware  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils.cors import CachedPreflightCORSMiddleware  # type: ignore
+
+    calls = []
+
+    async def endpoint(scope, receive, send):  # pragma: no cover - preflights never reach it
+        calls.append(scope["path"])
+
+    mw = CachedPreflightCORSMiddleware(
+        endpoint, max_cached_preflights=2, allow_origins=["http://a.test"], allow_methods=["*"], allow_headers=["*"]
+    )
+    assert isinstance(mw, CORSMiddleware)
+    async with AsyncClient(app=mw, base_url="http://test") as ac:
+
+        async def preflight(headers: str):
+            return await ac.options(
+                "/x",
+                headers={
+                    "origin": "http://a.test",
+                    "access-control-request-method": "GET",
+                    "access-control-request-headers": headers,
+                },
+            )
+
+        first = await preflight("x-one")
+        cached = mw._preflights[("http://a.test", "GET", "x-one")]
+        again = await preflight("x-one")
+        assert mw._preflights[("http://a.test", "GET", "x-one")] is cached
+        assert first.status_code == again.status_code == 200
+        assert again.headers["access-control-allow-headers"] == "x-one"
+        await preflight("x-two")
+        await preflight("x-three")
+        assert len(mw._preflights) == 1
+    assert calls == []
@@ -1,3 +1,4 @@
+import json
 import os
 import pytest
 from httpx import AsyncClient
@@ -78,4 +79,541 @@ async def test_tracks_crud():
         assert r.status_code == 204
         # ensure gone
         r = await ac.get(f"/api/v1/tracks/{tid}")
-        assert r.status_code == 404
\ No newline at end of file
+        assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_serialize_read_models():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Json Song", "artists": "Json Artist"})
+        assert r.status_code == 200
+        tid = r.json()["id"]
+
+        r = await ac.get("/api/v1/tracks/", params={"q": "json song"})
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/json")
+        rows = r.json()
+        assert [t["id"] for t in rows] == [tid]
+        assert rows[0]["title"] == "Json Song"
+        assert rows[0]["playlists"] is None
+        assert "T" in rows[0]["created_at"]
+
+        r = await ac.get("/api/v1/sources/accounts")
+        assert r.status_code == 200
+        assert all({"id", "type", "name", "created_at"} <= set(a) for a in r.json())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("with_trigger", [True, False])
+async def test_delete_track_removes_dependent_rows(with_trigger):
+    try:
+        from backend.app.db.session import async_session, engine  # type: ignore
+        from backend.app.db.models.models import (  # type: ignore
+            SearchAttempt,
+            SearchProvider,
+            TRACK_DELETE_CASCADE_TRIGGER,
+            TrackIdentity,
+            track_delete_cascade_ddl,
+        )
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session, engine  # type: ignore
+        from app.db.models.models import (  # type: ignore
+            SearchAttempt,
+            SearchProvider,
+            TRACK_DELETE_CASCADE_TRIGGER,
+            TrackIdentity,
+            track_delete_cascade_ddl,
+        )
+    from sqlalchemy import select
+
+    if not with_trigger:
+        # A table rebuild can drop the cascade trigger; the endpoint must not depend on it
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TRACK_DELETE_CASCADE_TRIGGER}")
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            r = await ac.post("/api/v1/tracks/", json={"title": "Gone Song", "artists": "Gone Artist"})
+            assert r.status_code == 200
+            tid = r.json()["id"]
+            r = await ac.post(
+                "/api/v1/identities/",
+                json={"track_id": tid, "provider": "spotify", "provider_track_id": f"gone-{tid}"},
+            )
+            assert r.status_code == 200
+            async with async_session() as s:
+                s.add(SearchAttempt(track_id=tid, provider=SearchProvider.youtube, results_count=0))
+                await s.commit()
+
+            r = await ac.delete(f"/api/v1/tracks/{tid}")
+            assert r.status_code == 204
+            r = await ac.get(f"/api/v1/tracks/{tid}")
+            assert r.status_code == 404
+
+        async with async_session() as s:
+            for model in (TrackIdentity, SearchAttempt):
+                rows = (await s.execute(select(model).where(model.track_id == tid))).scalars().all()
+                assert rows == []
+    finally:
+        if not with_trigger:
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql(track_delete_cascade_ddl())
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_paginate_and_filter():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ids = []
+        for i in range(3):
+            r = await ac.post("/api/v1/tracks/", json={"title": f"Paged Song {i}", "artists": "Paged Artist"})
+            ids.append(r.json()["id"])
+        r = await ac.get("/api/v1/tracks", params={"q": "paged song", "limit": 2})
+        first = [t["id"] for t in r.json()]
+        r = await ac.get("/api/v1/tracks", params={"q": "paged song", "limit": 2, "offset": 2})
+        rest = [t["id"] for t in r.json()]
+        assert len(first) == 2 and len(rest) == 1
+        assert sorted(first + rest) == sorted(ids)
+
+        await ac.post("/api/v1/sources/accounts", json={"type": "soundcloud", "name": "sc-paged", "enabled": False})
+        r = await ac.get("/api/v1/sources/accounts", params={"type": "soundcloud", "enabled": False})
+        assert r.status_code == 200
+        assert [a["name"] for a in r.json()] == ["sc-paged"]
+        r = await ac.get("/api/v1/sources/accounts", params={"limit": 1})
+        assert len(r.json()) == 1
+        for i in range(101):
+            await ac.post("/api/v1/sources/accounts", json={"type": "soundcloud", "name": f"sc-bulk-{i}", "enabled": True})
+        r = await ac.get("/api/v1/sources/accounts")
+        assert len(r.json()) > 101
+
+
+@pytest.mark.asyncio
+async def test_list_tracks_keyset_cursor_pages_through_all_rows():
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import Track  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import Track  # type: ignore
+    from datetime import datetime
+    from sqlalchemy import update
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ids = []
+        for i in range(5):
+            r = await ac.post("/api/v1/tracks/", json={"title": f"Keyset Song {i}", "artists": "Keyset Artist"})
+            ids.append(r.json()["id"])
+        # Identical timestamps exercise the id tie-breaker
+        async with async_session() as s:
+            await s.execute(update(Track).where(Track.id.in_(ids[1:4])).values(updated_at=datetime(2020, 1, 1)))
+            await s.commit()
+
+        offset_order = [t["id"] for t in (await ac.get("/api/v1/tracks/", params={"q": "keyset song"})).json()]
+        for page_size in (1, 2, 3, 5):
+            seen = []
+            cursor_seen = None
+            params = {"q": "keyset song", "limit": page_size}
+            while True:
+                r = await ac.get("/api/v1/tracks/", params=params)
+                assert r.status_code == 200
+                seen.extend(t["id"] for t in r.json())
+                cursor = r.headers.get("x-next-cursor")
+                if not cursor:
+                    break
+                cursor_seen = cursor_seen or cursor
+                params = {"q": "keyset song", "limit": page_size, "cursor": cursor}
+            # Every row exactly once, in the same order as one unpaged read
+            assert seen == offset_order
+            assert len(set(seen)) == len(seen) and sorted(seen) == sorted(ids)
+
+        r = await ac.get("/api/v1/tracks/", params={"cursor": "not-a-cursor"})
+        assert r.status_code == 400
+        r = await ac.get("/api/v1/tracks/", params={"cursor": cursor_seen, "offset": 2})
+        assert r.status_code == 400
+        r = await ac.get("/api/v1/tracks/", params={"cursor": "x", "playlist_id": 1})
+        assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tracks_queries_run_on_the_request_session():
+    try:
+        from backend.app.db.session import async_session, engine, get_session  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session, engine, get_session  # type: ignore
+    from sqlalchemy import event
+
+    sessions = []
+    selects = []
+
+    async def _tracked_session():
+        async with async_session() as session:
+            sessions.append(session)
+            yield session
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM tracks" in statement:
+            selects.append(statement)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for i in range(3):
+            await ac.post("/api/v1/tracks/", json={"title": f"Single Query Song {i}", "artists": "Single Query"})
+        app.dependency_overrides[get_session] = _tracked_session
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            params = {"q": "single query song", "limit": 2}
+            r = await ac.get("/api/v1/tracks/", params=params)
+            # One fingerprint and one page query; the next cursor needs no extra probe
+            assert r.status_code == 200 and len(r.json()) == 2
+            assert r.headers.get("x-next-cursor")
+            assert len(selects) == 2 and sum("LIMIT" in stmt for stmt in selects) == 1
+            # A matching If-None-Match is answered from the fingerprint alone
+            selects.clear()
+            r = await ac.get("/api/v1/tracks/", params=params, headers={"If-None-Match": r.headers["etag"]})
+            assert r.status_code == 304
+            assert len(selects) == 1 and "LIMIT" not in selects[0]
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+            app.dependency_overrides.pop(get_session, None)
+    assert len(sessions) == 2
+
+@pytest.mark.asyncio
+async def test_raw_min_returns_projected_columns():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Raw Min Song", "artists": "Raw Min Artist"})
+        created = r.json()
+        r = await ac.get("/api/v1/tracks/raw_min", params={"limit": 1})
+        assert r.status_code == 200
+        assert r.json() == [
+            {
+                "id": created["id"],
+                "title": "Raw Min Song",
+                "artists": "Raw Min Artist",
+                "created_at": created["created_at"],
+                "updated_at": created["updated_at"],
+            }
+        ]
+
+@pytest.mark.asyncio
+async def test_get_track_cache_is_invalidated_by_writes():
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import Track  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import Track  # type: ignore
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Cached Song", "artists": "Cached Artist"})
+        tid = r.json()["id"]
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        assert r.json()["title"] == "Cached Song"
+
+        r = await ac.put(
+            f"/api/v1/tracks/{tid}",
+            json={
+                "title": "Renamed Song",
+                "artists": "Cached Artist",
+                "normalized_title": "renamed song",
+                "normalized_artists": "cached artist",
+            },
+        )
+        assert r.status_code == 200
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        assert r.json()["title"] == "Renamed Song"
+
+        # Writes from other modules go through the ORM and evict the entry too
+        async with async_session() as s:
+            track = await s.get(Track, tid)
+            track.album = "Other Album"
+            await s.commit()
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        assert r.json()["album"] == "Other Album"
+
+        r = await ac.delete(f"/api/v1/tracks/{tid}")
+        assert r.status_code == 204
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        assert r.status_code == 404
+
+
+
+@pytest.mark.asyncio
+async def test_track_endpoints_honor_if_none_match():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Etag Song", "artists": "Etag Artist"})
+        tid = r.json()["id"]
+
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        etag = r.headers["etag"]
+        assert etag.startswith('W/"')
+        r = await ac.get(f"/api/v1/tracks/{tid}", headers={"If-None-Match": etag})
+        assert r.status_code == 304
+        assert r.content == b""
+
+        r = await ac.get("/api/v1/tracks/", params={"q": "etag song"})
+        list_etag = r.headers["etag"]
+        assert [t["id"] for t in r.json()] == [tid]
+        r = await ac.get("/api/v1/tracks/", params={"q": "etag song"}, headers={"If-None-Match": list_etag})
+        assert r.status_code == 304
+        # Other query parameters produce a different tag
+        r = await ac.get("/api/v1/tracks/", params={"q": "etag song", "limit": 5}, headers={"If-None-Match": list_etag})
+        assert r.status_code == 200
+        r = await ac.get(
+            "/api/v1/tracks/",
+            params={"q": "etag song"},
+            headers={"If-None-Match": list_etag, "Accept": "application/x-ndjson"},
+        )
+        assert r.status_code == 200
+
+        r = await ac.put(
+            f"/api/v1/tracks/{tid}",
+            json={
+                "title": "Etag Song",
+                "artists": "Etag Artist",
+                "album": "New Album",
+                "normalized_title": "etag song",
+                "normalized_artists": "etag artist",
+            },
+        )
+        assert r.status_code == 200
+        r = await ac.get(f"/api/v1/tracks/{tid}", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.json()["album"] == "New Album"
+        r = await ac.get("/api/v1/tracks/", params={"q": "etag song"}, headers={"If-None-Match": list_etag})
+        assert r.status_code == 200
+
+        await ac.delete(f"/api/v1/tracks/{tid}")
+
+def test_pk_cache_expires_and_bounds_entries(monkeypatch):
+    try:
+        from backend.app.utils import pk_cache  # type: ignore
+        from backend.app.db.models.models import SourceAccount  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils import pk_cache  # type: ignore
+        from app.db.models.models import SourceAccount  # type: ignore
+
+    now = [100.0]
+    monkeypatch.setattr(pk_cache.time, "monotonic", lambda: now[0])
+    cache = pk_cache.PkCache(SourceAccount, maxsize=2, ttl=5.0)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) == "a"
+    cache.put(3, "c")  # evicts least recently used (2)
+    assert cache.get(2) is None
+    now[0] += 6
+    assert cache.get(1) is None and cache.get(3) is None
+
+
+def test_pk_cache_bounds_total_bytes():
+    try:
+        from backend.app.utils import pk_cache  # type: ignore
+        from backend.app.db.models.models import SourceAccount  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils import pk_cache  # type: ignore
+        from app.db.models.models import SourceAccount  # type: ignore
+
+    cache = pk_cache.PkCache(SourceAccount, maxsize=10, ttl=5.0, maxbytes=10)
+    cache.put(1, "a", 4)
+    cache.put(2, "b", 4)
+    cache.put(3, "c", 4)  # 12 bytes: evicts least recently used (1)
+    assert cache.get(1) is None and cache.get(2) == "b" and cache.get(3) == "c"
+    cache.put(4, "big", 11)  # larger than the whole budget: not stored
+    assert cache.get(4) is None and cache.get(2) == "b"
+    cache.put(2, "b2", 2)  # replacing an entry releases its old size
+    cache.put(5, "e", 4)
+    assert cache.get(2) == "b2" and cache.get(3) == "c" and cache.get(5) == "e"
+    cache.clear()
+    cache.put(6, "f", 10)
+    assert cache.get(6) == "f"
+
+
+@pytest.mark.asyncio
+async def test_pk_cache_follows_app_sessions_only():
+    try:
+        from backend.app.utils import pk_cache  # type: ignore
+        from backend.app.db.models.models import SourceAccount, SourceProvider  # type: ignore
+        from backend.app.db.session import async_session, engine  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils import pk_cache  # type: ignore
+        from app.db.models.models import SourceAccount, SourceProvider  # type: ignore
+        from app.db.session import async_session, engine  # type: ignore
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    cache = pk_cache.PkCache(SourceAccount, maxsize=8, ttl=30.0)
+    async with async_session() as s:
+        acc = SourceAccount(type=SourceProvider.soundcloud, name="cache-events", enabled=True)
+        s.add(acc)
+        await s.commit()
+        cache.put(acc.id, "cached")
+
+        # Sessions from other sessionmakers are not watched
+        async with async_sessionmaker(bind=engine)() as other:
+            await other.execute(update(SourceAccount).where(SourceAccount.id == acc.id).values(name="elsewhere"))
+            await other.commit()
+        assert cache.get(acc.id) == "cached"
+
+        # Core DML through the app's sessions clears the cache, also after a racing put
+        await s.execute(update(SourceAccount).where(SourceAccount.id == acc.id).values(name="renamed"))
+        assert cache.get(acc.id) is None
+        cache.put(acc.id, "stale")
+        await s.commit()
+        assert cache.get(acc.id) is None
+
+        # ORM flushes evict the written row
+        cache.put(acc.id, "cached")
+        acc.enabled = False
+        await s.commit()
+        assert cache.get(acc.id) is None
+
+
+@pytest.mark.asyncio
+async def test_list_tracks_serializes_json_and_ndjson():
+    try:
+        from backend.app.utils.json_response import orjson_rows_body, read_columns  # type: ignore
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import Track  # type: ignore
+        from backend.app.schemas.models import TrackRead  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils.json_response import orjson_rows_body, read_columns  # type: ignore
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import Track  # type: ignore
+        from app.schemas.models import TrackRead  # type: ignore
+    from sqlalchemy import select
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for i in range(5):
+            await ac.post("/api/v1/tracks/", json={"title": f"Streamed Song {i}", "artists": "Streamed Artist"})
+        r = await ac.get("/api/v1/tracks/", params={"q": "no such streamed song"})
+        assert r.status_code == 200
+        assert r.json() == []
+
+    stmt = select(*read_columns(TrackRead, Track)).where(Track.artists == "Streamed Artist").order_by(Track.id)
+    async with async_session() as s:
+        rows = (await s.execute(stmt)).all()
+    body = orjson_rows_body(TrackRead, rows)
+    assert [t["title"] for t in json.loads(body)] == [f"Streamed Song {i}" for i in range(5)]
+    assert orjson_rows_body(TrackRead, []) == b"[]"
+
+    body = orjson_rows_body(TrackRead, rows, ndjson=True)
+    assert body.endswith(b"\n")
+    assert [json.loads(line)["title"] for line in body.splitlines()] == [f"Streamed Song {i}" for i in range(5)]
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get(
+            "/api/v1/tracks/",
+            params={"q": "streamed song", "limit": 3},
+            headers={"Accept": "application/x-ndjson"},
+        )
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        assert len(r.text.splitlines()) == 3
+        # Empty results are an empty body rather than an empty array
+        r = await ac.get("/api/v1/tracks/", params={"q": "no such streamed song"}, headers={"Accept": "application/x-ndjson"})
+        assert r.content == b""
+
+
+def test_read_columns_project_only_model_fields():
+    try:
+        from backend.app.utils.json_response import read_columns  # type: ignore
+        from backend.app.db.models.models import Track  # type: ignore
+        from backend.app.schemas.models import TrackRead  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils.json_response import read_columns  # type: ignore
+        from app.db.models.models import Track  # type: ignore
+        from app.schemas.models import TrackRead  # type: ignore
+
+    names = [c.key for c in read_columns(TrackRead, Track)]
+    assert names[:2] == ["title", "artists"]
+    assert {"id", "created_at", "updated_at"} <= set(names)
+    assert "playlists" not in names
+
+
+@pytest.mark.asyncio
+async def test_construct_model_matches_validation_for_db_rows():
+    try:
+        from backend.app.utils.json_response import construct_model, read_columns  # type: ignore
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import Track  # type: ignore
+        from backend.app.schemas.models import TrackRead  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils.json_response import construct_model, read_columns  # type: ignore
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import Track  # type: ignore
+        from app.schemas.models import TrackRead  # type: ignore
+    from sqlalchemy import select
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Construct Song", "artists": "Construct Artist"})
+        tid = r.json()["id"]
+        r = await ac.get(f"/api/v1/tracks/{tid}")
+        assert r.json()["title"] == "Construct Song"
+
+    async with async_session() as s:
+        track = await s.get(Track, tid)
+        expected = TrackRead.model_validate(track).model_dump(mode="json")
+        assert construct_model(TrackRead, track).model_dump(mode="json") == expected
+        row = (await s.execute(select(*read_columns(TrackRead, Track)).where(Track.id == tid))).one()
+        assert construct_model(TrackRead, row).model_dump(mode="json") == expected
+
+
+@pytest.mark.asyncio
+async def test_track_search_ignores_case_on_both_list_endpoints():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Été Casefold Song", "artists": "Casefold Artist"})
+        tid = r.json()["id"]
+        for q in ("CASEFOLD song", "casefold ARTIST", "Été Casefold"):
+            r = await ac.get("/api/v1/tracks/", params={"q": q})
+            assert [t["id"] for t in r.json()] == [tid], q
+            r = await ac.get("/api/v1/tracks/with_playlist_info", params={"q": q})
+            assert [t["id"] for t in r.json()] == [tid], q
+
+
+@pytest.mark.asyncio
+async def test_delete_track_removes_library_files_from_disk(tmp_path):
+    from datetime import datetime
+
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import LibraryFile  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import LibraryFile  # type: ignore
+
+    audio = tmp_path / "Disk Artist - Disk Song.mp3"
+    audio.write_bytes(b"ID3")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Disk Song", "artists": "Disk Artist"})
+        tid = r.json()["id"]
+        async with async_session() as s:
+            s.add(LibraryFile(track_id=tid, filepath=str(audio), file_mtime=datetime.utcnow(), file_size=3))
+            await s.commit()
+
+        r = await ac.delete(f"/api/v1/tracks/{tid}")
+        assert r.status_code == 204
+        assert not audio.exists()
+        r = await ac.delete(f"/api/v1/tracks/{tid}")
+        assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_track_existence_probes_return_404_for_unknown_track():
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import Playlist, SourceProvider  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import Playlist, SourceProvider  # type: ignore
+
+    async with async_session() as s:
+        pl = Playlist(provider=SourceProvider.manual, name="Probe Playlist")
+        s.add(pl)
+        await s.commit()
+        pl_id = pl.id
+
+    missing = 987654321
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        responses = [
+            await ac.get(f"/api/v1/tracks/{missing}/identities"),
+            await ac.post("/api/v1/identities/", json={"track_id": missing, "provider": "spotify", "provider_track_id": "probe"}),
+            await ac.post("/api/v1/playlist_tracks/", json={"playlist_id": pl_id, "track_id": missing}),
+            await ac.post("/api/v1/downloads/enqueue", params={"track_id": missing}),
+        ]
+    assert [r.status_code for r in responses] == [404, 404, 404, 404]
+    assert all(r.json()["detail"] == "Track not found" for r in responses)
@@ -0,0 +1,215 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import asyncio, os
+from app.db.session import engine
+
+async def main():
+    async with engine.connect() as conn:
+        mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+        sync = (await conn.exec_driver_sql("PRAGMA synchronous")).scalar()
+        busy = (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar()
+        temp = (await conn.exec_driver_sql("PRAGMA temp_store")).scalar()
+        mmap = (await conn.exec_driver_sql("PRAGMA mmap_size")).scalar()
+        page = (await conn.exec_driver_sql("PRAGMA page_size")).scalar()
+    await engine.dispose()
+    print(mode, sync, busy, temp, mmap, page)
+
+asyncio.run(main())
+os._exit(0)
+"""
+
+
+def _probe(database_url: str) -> str:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert out.returncode == 0, out.stderr
+    return out.stdout.strip().splitlines()[-1]
+
+
+def test_file_sqlite_connection_pragmas(tmp_path):
+    db = tmp_path / "music.db"
+    assert _probe(f"sqlite+aiosqlite:///{db.as_posix()}") == "wal 1 5000 2 268435456 8192"
+
+
+_STARTUP = """
+import asyncio, os
+from app.main import app
+from app.db.session import engine
+
+async def main():
+    async with app.router.lifespan_context(app):
+        pass
+    await engine.dispose()
+
+asyncio.run(main())
+os._exit(0)
+"""
+
+
+def test_startup_adds_indexes_missing_from_existing_tables(tmp_path):
+    import sqlite3
+
+    db = tmp_path / "music.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.as_posix()}", DISABLE_DOWNLOAD_WORKER="1")
+
+    def _startup():
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert out.returncode == 0, out.stderr
+
+    _startup()
+    with sqlite3.connect(db) as conn:
+        conn.execute("DROP INDEX ix_candidate_track_provider_score")
+        # Databases created before the schema fingerprint existed have user_version 0
+        conn.execute("PRAGMA user_version = 0")
+    _startup()
+    with sqlite3.connect(db) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM search_candidates "
+            "WHERE track_id = 1 AND provider = 'youtube' ORDER BY score DESC"
+        ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_candidate_track_provider_score" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_startup_replaces_single_column_download_status_index(tmp_path):
+    import sqlite3
+
+    db = tmp_path / "music.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.as_posix()}", DISABLE_DOWNLOAD_WORKER="1")
+
+    def _startup():
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert out.returncode == 0, out.stderr
+
+    _startup()
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE INDEX ix_download_status ON downloads (status)")
+        conn.execute("PRAGMA user_version = 0")
+    _startup()
+    with sqlite3.connect(db) as conn:
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        listing = " ".join(
+            r[-1]
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM downloads WHERE status = 'failed' ORDER BY created_at DESC LIMIT 50"
+            )
+        )
+        latest = " ".join(
+            r[-1]
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT max(finished_at) FROM downloads WHERE track_id = 1 AND status = 'done'"
+            )
+        )
+    assert "ix_download_status" not in names
+    assert "ix_download_status_created" in listing and "TEMP B-TREE" not in listing
+    assert "COVERING INDEX ix_download_track_status_finished" in latest
+
+
+def test_startup_skips_schema_setup_when_fingerprint_matches(tmp_path):
+    import sqlite3
+
+    db = tmp_path / "music.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.as_posix()}", DISABLE_DOWNLOAD_WORKER="1")
+
+    def _startup():
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert out.returncode == 0, out.stderr
+
+    def _state():
+        with sqlite3.connect(db) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        return version, "ix_track_norm" in names
+
+    def _names():
+        with sqlite3.connect(db) as conn:
+            return {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+
+    _startup()
+    version, has_index = _state()
+    assert version > 0 and has_index
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE INDEX ix_download_status ON downloads (status)")
+    # Matching fingerprint with every expected object present: no migration statements run
+    _startup()
+    assert _state() == (version, True)
+    assert "ix_download_status" in _names()
+
+    # A rebuild that lost indexes or the cascade trigger is repaired despite the fingerprint
+    with sqlite3.connect(db) as conn:
+        conn.execute("DROP INDEX ix_track_norm")
+        conn.execute("DROP TRIGGER trg_tracks_delete_cascade")
+    _startup()
+    assert _state() == (version, True)
+    assert "trg_tracks_delete_cascade" in _names()
+    assert "ix_download_status" not in _names()
+
+
+_WARM = """
+import asyncio, os
+from app.db.session import engine, warm_pool
+
+async def main():
+    opened = await warm_pool()
+    print(opened, engine.pool.checkedin(), engine.pool.checkedout())
+    await engine.dispose()
+
+asyncio.run(main())
+os._exit(0)
+"""
+
+
+def test_warm_pool_opens_configured_connections(tmp_path):
+    db = tmp_path / "music.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.as_posix()}", DB_POOL_SIZE="4")
+    out = subprocess.run([sys.executable, "-c", _WARM], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "4 4 0"
+
+
+_POOL = """
+import os
+from app.db import session
+print(session._IN_MEMORY, type(session.engine.pool).__name__)
+os._exit(0)
+"""
+
+
+def test_engine_options_follow_the_parsed_database_url(tmp_path):
+    cases = {
+        "sqlite+aiosqlite:///:memory:": "True StaticPool",
+        "sqlite+aiosqlite:///file:probe?mode=memory&cache=shared&uri=true": "True StaticPool",
+        f"sqlite+aiosqlite:///{(tmp_path / 'music.db').as_posix()}": "False AsyncAdaptedQueuePool",
+    }
+    for url, expected in cases.items():
+        env = dict(os.environ, DATABASE_URL=url)
+        out = subprocess.run([sys.executable, "-c", _POOL], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60)
+        assert out.returncode == 0, out.stderr
+        assert out.stdout.strip().splitlines()[-1] == expected, url
+
+
+def test_startup_messages_go_through_logging(tmp_path):
+    db = tmp_path / "music.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.as_posix()}", DISABLE_DOWNLOAD_WORKER="1")
+    out = subprocess.run(
+        [sys.executable, "-c", _STARTUP], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert out.returncode == 0, out.stderr
+    assert "[backend.app.startup] LIBRARY_DIR=" in out.stdout
+    assert "[backend.app.startup] Event loop: asyncio" in out.stdout
+    assert not any(line.startswith("[startup]") for line in out.stdout.splitlines())
@@ -55,3 +55,83 @@ async def test_enqueue_and_worker_runs_concurrently():
         assert r3.status_code == 200
         items_done = r3.json()
         assert sum(1 for d in items_done if d["status"] == "done") >= 3
+
+
+@pytest.mark.asyncio
+async def test_worker_queue_lives_on_app_state():
+    # Startup and shutdown run through the lifespan, not on_event handlers
+    assert not app.router.on_startup and not app.router.on_shutdown
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/downloads/status")
+        assert r.json()["worker_running"] is False
+
+        rr = await ac.post("/api/v1/downloads/_restart_worker", json={"concurrency": 3, "simulate_seconds": 0})
+        assert rr.status_code == 200
+        assert app.state.download_queue is not None
+        r = await ac.get("/api/v1/downloads/status")
+        assert r.json()["worker_running"] is True and r.json()["concurrency"] == 3
+
+        wr = await ac.post("/api/v1/downloads/_wait_idle", params={"timeout": 1.0, "stop_after": "true"})
+        assert wr.json() == {"ok": True, "stopped": True}
+        assert app.state.download_queue is None
+
+
+_RESUME = """
+import asyncio, os
+from datetime import datetime, timedelta
+from app.main import app
+from app.db.session import async_session, engine
+from app.db.models.models import Download, DownloadProvider, DownloadStatus, Track
+from app.worker.downloads_worker import DownloadQueue
+
+seen = []
+
+async def _record(self, download_id):
+    seen.append(download_id)
+
+async def _noop(self, *a, **k):
+    return None
+
+DownloadQueue.enqueue = _record
+DownloadQueue.start = DownloadQueue.stop = _noop
+
+async def main():
+    os.environ["DISABLE_DOWNLOAD_WORKER"] = "1"
+    async with app.router.lifespan_context(app):
+        async with async_session() as s:
+            track = Track(title="T", artists="A", normalized_title="t", normalized_artists="a")
+            s.add(track)
+            await s.flush()
+            base = datetime(2024, 1, 1)
+            for status, minutes in [("queued", 2), ("done", 0), ("queued", 1), ("queued", 3)]:
+                s.add(Download(track_id=track.id, provider=DownloadProvider.yt_dlp,
+                               status=DownloadStatus(status), created_at=base + timedelta(minutes=minutes)))
+            await s.commit()
+    os.environ["DISABLE_DOWNLOAD_WORKER"] = "0"
+    async with app.router.lifespan_context(app):
+        pass
+    await engine.dispose()
+    print(seen)
+
+try:
+    asyncio.run(main())
+except BaseException:
+    import traceback
+    traceback.print_exc()
+    os._exit(1)
+os._exit(0)
+"""
+
+
+def test_startup_requeues_queued_downloads_oldest_first(tmp_path):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    backend = Path(__file__).resolve().parents[1]
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{(tmp_path / 'music.db').as_posix()}")
+    out = subprocess.run(
+        [sys.executable, "-c", _RESUME], cwd=backend, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "[3, 1, 4]"
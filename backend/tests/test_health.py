@@ -27,3 +27,30 @@ async def test_info_endpoint():
         data = resp.json()
         assert "name" in data and "version" in data
         assert isinstance(data["name"], str) and isinstance(data["version"], str)
+
+
+@pytest.mark.asyncio
+async def test_debug_track_count_counts_in_sql_and_samples_three():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for i in range(4):
+            r = await ac.post("/api/v1/tracks/", json={"title": f"Debug {i}", "artists": "Counter"})
+            assert r.status_code == 200
+        resp = await ac.get("/api/v1/_debug/track_count")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] >= 4
+    assert len(data["sample"]) == 3
+    ids = [s["id"] for s in data["sample"]]
+    assert ids == sorted(ids)
+    assert set(data["sample"][0]) == {"id", "title", "artists", "created_at"}
+
+
+def test_every_api_router_is_mounted_once_under_api_v1():
+    try:
+        from backend.app.main import API_ROUTERS  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.main import API_ROUTERS  # type: ignore
+
+    expected = sorted("/api/v1" + r.path for router in API_ROUTERS for r in router.routes)
+    mounted = sorted(r.path for r in app.routes if r.path.startswith("/api/v1/") and r.path != "/api/v1/_debug/track_count")
+    assert mounted == expected
@@ -31,7 +31,11 @@ async def test_identity_auto_created_with_track():
         assert len(data) == 1
         ident = data[0]
         assert ident["provider"] == "manual"
-        assert ident["provider_track_id"].startswith("manual:")
+        assert ident["provider_track_id"] == f"manual:{track_id}"
+        # Column defaults are applied on the RETURNING insert
+        created = r.json()
+        assert created["explicit"] is False
+        assert created["created_at"] and created["updated_at"]
 
 
 @pytest.mark.asyncio
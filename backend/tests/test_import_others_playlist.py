@@ -47,3 +47,26 @@ async def test_import_creates_others_and_membership():
         assert isinstance(arr, list)
         # Ensure 'Others' membership is present
         assert any(m.get("playlist_id") == others.get("id") for m in arr)
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_links_identities_and_memberships_per_track():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        rows = [{"artists": "Bulk Tester", "title": f"Bulk Track {i}", "bpm": 100 + i} for i in range(4)]
+        files = {"file": ("tracks.json", json.dumps(rows), "application/json")}
+        r = await ac.post("/api/v1/tracks/import/json", files=files, data={"dry_run": "false"})
+        assert r.json()["created"] == 4
+
+        r = await ac.get("/api/v1/tracks/", params={"q": "bulk track", "limit": 10})
+        tracks = {t["title"]: t for t in r.json()}
+        assert sorted(tracks) == [f"Bulk Track {i}" for i in range(4)]
+        for i in range(4):
+            assert tracks[f"Bulk Track {i}"]["bpm"] == 100 + i
+
+        ids = [t["id"] for t in tracks.values()]
+        for tid in ids:
+            r = await ac.get(f"/api/v1/tracks/{tid}/identities")
+            assert [(i["provider"], i["provider_track_id"]) for i in r.json()] == [("manual", f"manual:{tid}")]
+        r = await ac.post("/api/v1/playlists/memberships", json={"track_ids": ids})
+        memberships = r.json()
+        assert all([m["playlist_name"] for m in memberships[str(tid)]] == ["Others"] for tid in ids)
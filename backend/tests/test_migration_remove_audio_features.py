@@ -0,0 +1,49 @@
+import sqlite3
+
+try:
+    from backend.app.db.migrations import remove_audio_features as migration  # type: ignore
+except Exception:  # pragma: no cover
+    from app.db.migrations import remove_audio_features as migration  # type: ignore
+
+
+def _legacy_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE tracks (id INTEGER NOT NULL, title VARCHAR(500) NOT NULL, artists VARCHAR(500) NOT NULL, "
+        "album VARCHAR(500), duration_ms INTEGER, isrc VARCHAR(50), year INTEGER, explicit BOOLEAN NOT NULL, "
+        "cover_url VARCHAR(1000), normalized_title VARCHAR(500), normalized_artists VARCHAR(500), genre VARCHAR(200), "
+        "bpm INTEGER, energy FLOAT, tempo FLOAT, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id))"
+    )
+    conn.executemany(
+        "INSERT INTO tracks (id, title, artists, explicit, energy, tempo, created_at, updated_at) "
+        "VALUES (?, ?, 'Artist', 0, 0.5, 120, '2024-01-01', '2024-01-01')",
+        [(i, f"Song {i}") for i in range(1, 51)],
+    )
+    # Fingerprint left by an earlier app start
+    conn.execute("PRAGMA user_version = 12345")
+    conn.commit()
+    conn.close()
+
+
+def test_remove_audio_features_copies_rows_and_restores_journal_mode(tmp_path, monkeypatch):
+    db = tmp_path / "music.db"
+    _legacy_db(db)
+    monkeypatch.setattr(migration, "DB_PATH", db)
+
+    assert migration.main(["--vacuum"]) == 0
+
+    with sqlite3.connect(db) as conn:
+        info = {r[1]: r for r in conn.execute("PRAGMA table_info(tracks)")}
+        assert not set(info) & migration.REMOVED_COLUMNS
+        # Declared types and constraints carry over, including the table-level primary key
+        assert info["title"][2:4] == ("VARCHAR(500)", 1)
+        assert info["album"][2:4] == ("VARCHAR(500)", 0)
+        assert info["id"][5] == 1
+        assert conn.execute("SELECT count(*), max(title) FROM tracks").fetchone() == (50, "Song 9")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # Indexes and triggers went with the old table, so startup must recreate them
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+
+    # Second run is a no-op
+    assert migration.main([]) == 0
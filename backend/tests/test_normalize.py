@@ -1,9 +1,9 @@
 import pytest
 
 try:
-    from backend.app.utils.normalize import normalize_track, durations_close_ms, duration_delta_sec
+    from backend.app.utils.normalize import normalize_track, normalize_track_cached, durations_close_ms, duration_delta_sec
 except Exception:
-    from app.utils.normalize import normalize_track, durations_close_ms, duration_delta_sec
+    from app.utils.normalize import normalize_track, normalize_track_cached, durations_close_ms, duration_delta_sec
 
 
 def test_normalize_basic_feat_and_parens():
@@ -31,3 +31,21 @@ def test_duration_helpers():
     assert durations_close_ms(None, 1000) is False
     assert duration_delta_sec(2000, 1500) == 0.5
     assert duration_delta_sec(None, 1500) is None
+
+
+def test_normalize_track_cached_matches_and_reuses_results():
+    first = normalize_track_cached("Artist feat. Guest", "Song (Extended Mix)")
+    assert first == normalize_track("Artist feat. Guest", "Song (Extended Mix)")
+    assert normalize_track_cached("Artist feat. Guest", "Song (Extended Mix)") is first
+    # Oversized inputs are computed but not memoized
+    long_title = "x" * 600
+    assert normalize_track_cached("A", long_title) is not normalize_track_cached("A", long_title)
+
+
+def test_normalize_separators_and_unicode_folding():
+    n = normalize_track("Daft Punk / Pharrell + Nile and Chic with Guest x Other", "Ｓｏｎｇ ﬁre — Radio Edit")
+    assert n.clean_artists == "Daft Punk & Pharrell & Nile & Chic & Guest & Other"
+    assert n.primary_artist == "Daft Punk"
+    # Compatibility characters are folded, ASCII input is returned untouched
+    assert n.normalized_title == "song fire"
+    assert normalize_track("Phoenix", "Ausmax").normalized_artists == "phoenix"
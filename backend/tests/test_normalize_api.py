@@ -20,3 +20,4 @@ async def test_preview_normalization_endpoint():
         assert data["normalized_title"] == "song"
         assert data["is_live"] is True
         assert data["is_remix_or_edit"] is True
+        assert r.headers["cache-control"] == "public, max-age=300"
@@ -0,0 +1,25 @@
+import os
+import runpy
+from pathlib import Path
+
+import uvicorn
+
+RUN_API = Path(__file__).resolve().parents[2] / "run_api.py"
+
+
+def _run(monkeypatch, **env):
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda *a, **k: calls.append(k))
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    for name in ("API_UDS", "UVICORN_ACCESS_LOG"):
+        os.environ.pop(name, None)
+    os.environ.update(env)
+    runpy.run_path(str(RUN_API), run_name="__main__")
+    return calls[-1]
+
+
+def test_run_api_listens_on_unix_socket_when_configured(monkeypatch):
+    assert _run(monkeypatch)["uds"] is None
+    opts = _run(monkeypatch, API_UDS="/tmp/musicdl.sock", UVICORN_ACCESS_LOG="false")
+    assert opts["uds"] == "/tmp/musicdl.sock"
+    assert opts["access_log"] is False
@@ -0,0 +1,226 @@
+import os
+import pytest
+from httpx import AsyncClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+try:
+    from backend.app.main import app
+    from backend.app.api.v1 import settings as settings_api  # type: ignore
+except Exception:  # pragma: no cover
+    from app.main import app
+    from app.api.v1 import settings as settings_api  # type: ignore
+
+
+def _cookie_line(name: str, value: str = "value123456", domain: str = ".youtube.com") -> str:
+    return "\t".join([domain, "TRUE", "/", "TRUE", "1999999999", name, value])
+
+
+def _cookies_content(names) -> str:
+    lines = ["# Netscape HTTP Cookie File", "# generated for tests", ""]
+    lines.extend(_cookie_line(n) for n in names)
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(autouse=True)
+def _reset_cookies_path(monkeypatch):
+    # Each test points YT_DLP_COOKIES_FILE elsewhere, so drop the resolved path
+    monkeypatch.setattr(settings_api, "_CACHED_COOKIES_PATH", None)
+
+
+@pytest.fixture
+def cookies_file(tmp_path, monkeypatch):
+    path = tmp_path / "cookies.txt"
+    monkeypatch.setenv("YT_DLP_COOKIES_FILE", str(path))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_check_cookies_reports_required_and_important(cookies_file):
+    cookies_file.write_text(
+        _cookies_content(["__Secure-1PSID", "SID", "PREF", "LOGIN_INFO", "HSID", "__Secure-3PSID"]),
+        encoding="utf-8",
+    )
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/settings/cookies/check")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["valid"] is True
+        assert body["found_required"] == ["__Secure-1PSID", "LOGIN_INFO", "__Secure-3PSID"]
+        assert body["found_important"] == ["SID", "HSID"]
+        assert body["missing_required"] == []
+        assert body["total_cookies"] == 6
+        assert body["hint"] is None
+
+
+@pytest.mark.asyncio
+async def test_check_cookies_missing_required(cookies_file):
+    cookies_file.write_text(_cookies_content(["SID", "__Secure-1PSID"]), encoding="utf-8")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/settings/cookies/check")
+        body = r.json()
+        assert body["valid"] is False
+        assert body["missing_required"] == ["__Secure-3PSID", "LOGIN_INFO"]
+        assert body["total_cookies"] == 2
+        assert body["hint"]
+
+
+@pytest.mark.asyncio
+async def test_check_cookies_without_file(cookies_file):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/settings/cookies/check")
+        body = r.json()
+        assert body["valid"] is False
+        assert body["missing_cookies"] == ["__Secure-1PSID", "__Secure-3PSID", "LOGIN_INFO"]
+
+
+@pytest.mark.asyncio
+async def test_cookies_status_counts_entry_lines(cookies_file):
+    content = _cookies_content(["SID", "HSID"]) + "   \n#HttpOnly comment\n" + _cookie_line("LOGIN_INFO")
+    cookies_file.write_text(content, encoding="utf-8")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/settings/cookies")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["configured"] is True
+        assert body["file_exists"] is True
+        assert body["file_size"] == len(content.encode("utf-8"))
+        assert body["line_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_upload_preview_and_delete_cookies(tmp_path, monkeypatch):
+    target = tmp_path / "nested" / "cookies.txt"
+    monkeypatch.setenv("YT_DLP_COOKIES_FILE", str(target))
+    content = _cookies_content(["SID", "LOGIN_INFO"])
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/settings/cookies", json={"content": content})
+        assert r.status_code == 200
+        assert r.json()["cookie_count"] == 2
+        assert target.read_text(encoding="utf-8") == content
+
+        r = await ac.get("/api/v1/settings/cookies/preview")
+        assert r.status_code == 200
+        preview = r.json()
+        assert preview["lines"][0] == "# Netscape HTTP Cookie File"
+        assert ".youtube.com\t...\tSID\tvalu..." in preview["lines"]
+
+        r = await ac.delete("/api/v1/settings/cookies")
+        assert r.status_code == 200
+        assert not target.exists()
+
+        r = await ac.get("/api/v1/settings/cookies/preview")
+        assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_invalid_format(cookies_file):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/settings/cookies", json={"content": "# only a comment\nnot\ta\tcookie\n"})
+        assert r.status_code == 400
+        assert not cookies_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_cookies_status_and_check_follow_file_changes(cookies_file):
+    cookies_file.write_text(_cookies_content(["SID"]), encoding="utf-8")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        assert (await ac.get("/api/v1/settings/cookies")).json()["line_count"] == 1
+        assert (await ac.get("/api/v1/settings/cookies/check")).json()["total_cookies"] == 1
+        # Repeated reads of an unchanged file are served from the cache
+        assert (await ac.get("/api/v1/settings/cookies")).json()["line_count"] == 1
+
+        # Rewriting the file (new size) invalidates the cached results
+        cookies_file.write_text(_cookies_content(["SID", "HSID", "LOGIN_INFO"]), encoding="utf-8")
+        assert (await ac.get("/api/v1/settings/cookies")).json()["line_count"] == 3
+        check = (await ac.get("/api/v1/settings/cookies/check")).json()
+        assert check["total_cookies"] == 3
+        assert check["found_required"] == ["LOGIN_INFO"]
+
+        r = await ac.post("/api/v1/settings/cookies", json={"content": _cookie_line("APISID") + "\n"})
+        assert r.status_code == 200
+        assert (await ac.get("/api/v1/settings/cookies")).json()["line_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_counts_only_netscape_lines(cookies_file):
+    content = "\n".join([
+        "# Netscape HTTP Cookie File",
+        "  " + _cookie_line("SID") + "  ",
+        _cookie_line("HSID") + "\r",
+        "short\tline\tonly",
+        "\t".join([".youtube.com", "TRUE", "/", "TRUE", "0", "EMPTY"]) + "\t",
+        "",
+    ])
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/settings/cookies", json={"content": content})
+        assert r.status_code == 200
+        assert r.json()["cookie_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_preview_is_limited_to_first_lines(cookies_file):
+    names = [f"C{i}" for i in range(50)]
+    cookies_file.write_text(_cookies_content(names), encoding="utf-8")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/settings/cookies/preview")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["total_lines"] == 20
+        assert len(data["lines"]) == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shell script as fake yt-dlp")
+async def test_cookies_test_runs_resolved_ytdlp(cookies_file, tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "yt-dlp"
+    fake.write_text("#!/bin/sh\necho 'ERROR: Sign in to confirm your age' >&2\nexit 1\n", encoding="utf-8")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setattr(settings_api, "_YTDLP_PATH", None)
+    cookies_file.write_text(_cookies_content(["SID"]), encoding="utf-8")
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/settings/cookies/test")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["success"] is False
+        assert "Sign in to confirm your age" in data["details"]
+    assert settings_api._YTDLP_PATH == str(fake)
+
+
+@pytest.mark.asyncio
+async def test_cookies_test_reports_timeout(cookies_file, monkeypatch):
+    import subprocess
+
+    calls = []
+
+    def _timeout(cmd, **kwargs):
+        calls.append(kwargs["timeout"])
+        raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+    monkeypatch.setattr(settings_api.subprocess, "run", _timeout)
+    cookies_file.write_text(_cookies_content(["SID"]), encoding="utf-8")
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/settings/cookies/test")
+    assert r.json() == {"success": False, "error": "Test timed out"}
+    assert calls == [60]
+
+
+@pytest.mark.asyncio
+async def test_cookies_path_is_resolved_once_and_updated_on_delete(tmp_path, monkeypatch):
+    first = tmp_path / "first.txt"
+    monkeypatch.setenv("YT_DLP_COOKIES_FILE", str(first))
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    assert settings_api._get_cookies_file_path() == first
+    monkeypatch.setenv("YT_DLP_COOKIES_FILE", str(tmp_path / "ignored.txt"))
+    assert settings_api._get_cookies_file_path() == first
+
+    first.write_text(_cookies_content(["SID"]), encoding="utf-8")
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.delete("/api/v1/settings/cookies")
+        assert r.status_code == 200
+    assert settings_api._get_cookies_file_path() == tmp_path / "data" / "cookies.txt"
@@ -75,8 +75,13 @@ async def test_docs_redirect_works():
     """Test that /docs redirects to /api/docs."""
     async with AsyncClient(app=app, base_url="http://test") as ac:
         response = await ac.get("/docs", follow_redirects=False)
-        assert response.status_code in [307, 302]
+        assert response.status_code == 308
         assert response.headers["location"] == "/api/docs"
+        again = await ac.get("/docs", follow_redirects=False)
+        assert again.status_code == 308 and again.headers["location"] == "/api/docs"
+        redoc = await ac.get("/redoc", follow_redirects=False)
+        assert redoc.status_code == 308
+        assert redoc.headers["location"] == "/api/redoc"
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,83 @@
+import gzip
+
+from httpx import AsyncClient
+
+try:
+    from backend.app.utils.static_files import (  # type: ignore
+        PrecompressedStaticFiles,
+        accepted_encodings,
+        index_response,
+        list_static_files,
+        load_index,
+    )
+except Exception:  # pragma: no cover
+    from app.utils.static_files import PrecompressedStaticFiles, accepted_encodings, index_response, list_static_files, load_index  # type: ignore
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def test_accepted_encodings_skips_zero_quality():
+    assert accepted_encodings("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert accepted_encodings(" BR ; q=0.5 ,gzip;q=0.000") == {"br"}
+    assert accepted_encodings("") == set()
+
+
+async def test_precompressed_siblings_are_preferred(tmp_path):
+    body = b"console.log('hello');\n" * 50
+    (tmp_path / "app-1a2b.js").write_bytes(body)
+    (tmp_path / "app-1a2b.js.gz").write_bytes(gzip.compress(body))
+    (tmp_path / "app-1a2b.js.br").write_bytes(b"not-really-brotli")
+    (tmp_path / "plain.css").write_bytes(b"body{}")
+    files = PrecompressedStaticFiles(directory=str(tmp_path), cache_control=IMMUTABLE)
+
+    async with AsyncClient(app=files, base_url="http://test") as ac:
+        br = await ac.get("/app-1a2b.js", headers={"accept-encoding": "br, gzip"})
+        gz = await ac.get("/app-1a2b.js", headers={"accept-encoding": "gzip"})
+        identity = await ac.get("/app-1a2b.js", headers={"accept-encoding": "identity"})
+        plain = await ac.get("/plain.css", headers={"accept-encoding": "br, gzip"})
+        revalidate = await ac.get("/app-1a2b.js", headers={"accept-encoding": "gzip", "if-none-match": gz.headers["etag"]})
+
+    assert br.headers["content-encoding"] == "br"
+    assert br.headers["content-length"] == str(len(b"not-really-brotli"))
+    assert gz.headers["content-encoding"] == "gzip" and gz.content == body
+    assert gz.headers["content-type"].startswith(("text/javascript", "application/javascript"))
+    assert int(gz.headers["content-length"]) < len(body)
+    assert "content-encoding" not in identity.headers and identity.content == body
+    assert "content-encoding" not in plain.headers and plain.content == b"body{}"
+    for r in (br, gz, identity, plain):
+        assert r.headers["cache-control"] == IMMUTABLE
+        assert r.headers["vary"] == "Accept-Encoding"
+    assert revalidate.status_code == 304
+
+
+def test_index_is_served_from_memory_with_content_etag(tmp_path):
+    index = tmp_path / "index.html"
+    index.write_bytes(b"<!doctype html><div id=root></div>")
+    body, etag = load_index(index)
+    assert body == index.read_bytes()
+    assert etag.startswith('"') and etag.endswith('"') and len(etag) == 46
+    index.write_bytes(b"<!doctype html><div id=app></div>")
+    assert load_index(index)[1] != etag
+
+    full = index_response(body, etag, None)
+    assert full.status_code == 200 and full.body == body
+    assert full.headers["etag"] == etag and full.headers["cache-control"] == "no-cache"
+    assert full.headers["content-type"].startswith("text/html")
+    for header in (etag, f'"other", W/{etag}', "*"):
+        cached = index_response(body, etag, header)
+        assert cached.status_code == 304 and cached.body == b""
+        assert cached.headers["etag"] == etag
+    assert index_response(body, etag, '"stale"').status_code == 200
+
+
+def test_static_file_listing_skips_assets_and_stays_inside_root(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "app-1a2b.js").write_text("x")
+    (tmp_path / "icons").mkdir()
+    (tmp_path / "icons" / "logo.svg").write_text("<svg/>")
+    (tmp_path / "favicon.ico").write_bytes(b"\0")
+    (tmp_path / "index.html").write_text("<html></html>")
+
+    files = list_static_files(tmp_path)
+    assert files == frozenset({"favicon.ico", "index.html", "icons/logo.svg"})
+    assert "../index.html" not in files and "icons" not in files
@@ -108,3 +108,33 @@ async def test_cover_refresh_endpoint_noop_without_spotify():
         body = r.json()
         # Should pick up chosen youtube thumbnail as fallback
         assert isinstance(body.get("cover_url"), str) and "/img.youtube.com/vi/" in body["cover_url"]
+
+
+class _FakeSpotifyClient:
+    def __init__(self):
+        self.urls = []
+
+    async def get(self, url, headers=None):
+        import httpx
+
+        self.urls.append(url)
+        return httpx.Response(200, json={"album": {"images": [{"url": "https://i.scdn.co/image/cover"}]}})
+
+
+@pytest.mark.asyncio
+async def test_cover_refresh_uses_shared_http_client(monkeypatch):
+    monkeypatch.setenv("SPOTIFY_ACCESS_TOKEN", "token")
+    fake = _FakeSpotifyClient()
+    monkeypatch.setattr(app.state, "httpx", fake, raising=False)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        tid, _ = await _create_track(ac, title="Delta", artists="Artist D")
+        r1 = await ac.post(
+            "/api/v1/identities/",
+            json={"track_id": tid, "provider": "spotify", "provider_track_id": "sp-delta"},
+        )
+        assert r1.status_code == 200, r1.text
+
+        r = await ac.post(f"/api/v1/tracks/{tid}/cover/refresh")
+        assert r.status_code == 200
+        assert r.json()["cover_url"] == "https://i.scdn.co/image/cover"
+    assert fake.urls == ["https://api.spotify.com/v1/tracks/sp-delta"]
@@ -0,0 +1,155 @@
+import os
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+try:
+    from backend.app.main import app  # type: ignore
+    from backend.app.db.session import async_session  # type: ignore
+    from backend.app.db.models.models import (  # type: ignore
+        Download,
+        DownloadProvider,
+        DownloadStatus,
+        LibraryFile,
+        Playlist,
+        PlaylistTrack,
+        SourceProvider,
+    )
+except Exception:  # pragma: no cover
+    from app.main import app  # type: ignore
+    from app.db.session import async_session  # type: ignore
+    from app.db.models.models import (  # type: ignore
+        Download,
+        DownloadProvider,
+        DownloadStatus,
+        LibraryFile,
+        Playlist,
+        PlaylistTrack,
+        SourceProvider,
+    )
+
+
+@pytest.mark.asyncio
+async def test_with_playlist_info_returns_one_row_per_track():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ids = []
+        for i in range(3):
+            r = await ac.post("/api/v1/tracks/", json={"title": f"Info Song {i}", "artists": "Info Artist"})
+            ids.append(r.json()["id"])
+
+        async with async_session() as s:
+            pl_a = Playlist(provider=SourceProvider.manual, name="Info A")
+            pl_b = Playlist(provider=SourceProvider.manual, name="Info B")
+            s.add_all([pl_a, pl_b])
+            await s.flush()
+            s.add_all([
+                PlaylistTrack(playlist_id=pl_a.id, track_id=ids[0], position=1, added_at=datetime(2024, 1, 1)),
+                PlaylistTrack(playlist_id=pl_b.id, track_id=ids[0], position=2, added_at=datetime(2024, 3, 1)),
+                PlaylistTrack(playlist_id=pl_a.id, track_id=ids[1], position=2, added_at=datetime(2024, 2, 1)),
+            ])
+            # Several done downloads and files must not duplicate playlist entries
+            for finished in (datetime(2024, 4, 1), datetime(2024, 5, 1)):
+                s.add(Download(track_id=ids[0], provider=DownloadProvider.yt_dlp, status=DownloadStatus.done, finished_at=finished))
+            for n in range(2):
+                s.add(LibraryFile(track_id=ids[0], filepath=f"/tmp/info-{n}.mp3", file_mtime=datetime(2024, 1, 1), file_size=1, actual_duration_ms=1000 + n))
+            await s.commit()
+            pl_a_id = pl_a.id
+
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params={"q": "info song"})
+        assert r.status_code == 200
+        rows = {t["id"]: t for t in r.json()}
+        assert sorted(rows) == sorted(ids)
+        first = rows[ids[0]]
+        assert sorted(p["playlist_name"] for p in first["playlists"]) == ["Info A", "Info B"]
+        assert sorted(p["playlist_added_at"] for p in first["playlists"]) == ["2024-01-01T00:00:00", "2024-03-01T00:00:00"]
+        assert first["downloaded_at"] == "2024-05-01T00:00:00"
+        assert first["actual_duration_ms"] == 1001
+        assert rows[ids[2]]["playlists"] == []
+        assert rows[ids[2]]["downloaded_at"] is None
+
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params={"playlist_id": pl_a_id, "q": "info song"})
+        rows = r.json()
+        assert sorted(t["id"] for t in rows) == sorted(ids[:2])
+        assert all([p["playlist_name"] for p in t["playlists"]] == ["Info A"] for t in rows)
+
+        # Playlist listings order by position
+        r = await ac.get("/api/v1/tracks/", params={"playlist_id": pl_a_id})
+        assert r.status_code == 200
+        assert [t["id"] for t in r.json()] == [ids[0], ids[1]]
+
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params={"q": "info song", "sort_by": "release_date"})
+        assert r.status_code == 200
+
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params={"q": "info song", "sort_by": "playlist_added_at"})
+        assert [t["id"] for t in r.json()][:2] == [ids[0], ids[1]]
+        r = await ac.get(
+            "/api/v1/tracks/with_playlist_info",
+            params={"q": "info song", "sort_by": "playlist_added_at", "sort_order": "asc"},
+        )
+        assert [t["id"] for t in r.json()] == [ids[0], ids[1], ids[2]]
+
+        # Keyset cursor walks the default updated_at ordering
+        seen = []
+        params = {"q": "info song", "limit": 2}
+        while True:
+            r = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+            seen.extend(t["id"] for t in r.json())
+            cursor = r.headers.get("x-next-cursor")
+            if not cursor:
+                break
+            params = {"q": "info song", "limit": 2, "cursor": cursor}
+        assert sorted(seen) == sorted(ids) and len(seen) == 3
+
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params={"cursor": "x", "sort_by": "release_date"})
+        assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_with_playlist_info_cache_is_cleared_by_writes():
+    try:
+        from backend.app.api.v1 import tracks as tracks_api  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.api.v1 import tracks as tracks_api  # type: ignore
+    from sqlalchemy import insert
+
+    params = {"q": "cached info"}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.post("/api/v1/tracks/", json={"title": "Cached Info 1", "artists": "Cache"})
+        tid = r.json()["id"]
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+        assert [t["id"] for t in r.json()] == [tid]
+        assert len(tracks_api._PLAYLIST_INFO_CACHE._data) >= 1
+
+        # Repeated reads are served from the cache
+        generation = tracks_api._PLAYLIST_INFO_CACHE.generation
+        r2 = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+        assert r2.content == r.content
+        assert tracks_api._PLAYLIST_INFO_CACHE.generation == generation
+
+        # ORM write to a joined table
+        async with async_session() as s:
+            pl = Playlist(provider=SourceProvider.manual, name="Cached Info PL")
+            s.add(pl)
+            await s.flush()
+            s.add(PlaylistTrack(playlist_id=pl.id, track_id=tid, position=1, added_at=datetime(2024, 1, 1)))
+            await s.commit()
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+        assert [p["playlist_name"] for p in r.json()[0]["playlists"]] == ["Cached Info PL"]
+
+        # Core bulk insert through a session
+        async with async_session() as s:
+            await s.execute(insert(LibraryFile), [{
+                "track_id": tid, "filepath": "/tmp/cached-info.mp3", "file_mtime": datetime(2024, 1, 1),
+                "file_size": 1, "exists": True, "actual_duration_ms": 4242,
+            }])
+            await s.commit()
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+        assert r.json()[0]["actual_duration_ms"] == 4242
+
+        r = await ac.delete(f"/api/v1/tracks/{tid}")
+        assert r.status_code == 204
+        r = await ac.get("/api/v1/tracks/with_playlist_info", params=params)
+        assert r.json() == []
@@ -48,6 +48,9 @@ async def test_youtube_search_persist_and_prefer_extended():
         assert r2.status_code == 200
         transient = r2.json()
         titles = [c["title"].lower() for c in transient]
+        for c in transient:
+            if c["duration_sec"]:
+                assert c["duration_delta_sec"] == abs(duration_ms - c["duration_sec"] * 1000) / 1000.0
         # Ensure an extended mix candidate exists
         assert any("extended" in t for t in titles)
         # Highest score should be extended or contain extended mix keyword
@@ -62,3 +65,115 @@ async def test_youtube_search_persist_and_prefer_extended():
         assert r3.status_code == 200
         data_again = r3.json()
         assert len(data_again) == count_before
+        assert len({c["external_id"] for c in data_again}) == count_before
+        # Column defaults still apply to bulk-inserted candidates
+        assert all(c["chosen"] is False and c["created_at"] for c in data_again)
+
+
+@pytest.mark.asyncio
+async def test_search_youtube_async_runs_off_loop_with_bounded_workers(monkeypatch):
+    import threading
+    import time
+    import asyncio
+
+    try:
+        from backend.app.utils import youtube_search as ys  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils import youtube_search as ys  # type: ignore
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    threads = set()
+
+    def fake_search(artists, title, track_duration_ms, prefer_extended=False, limit=15):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return [title]
+
+    monkeypatch.setattr(ys, "search_youtube", fake_search)
+    monkeypatch.setenv("YOUTUBE_SEARCH_CACHE_TTL", "0")
+    workers = ys._SEARCH_EXECUTOR._max_workers
+    results = await asyncio.gather(
+        *(ys.search_youtube_async("A", f"T{i}", None) for i in range(workers * 2))
+    )
+    assert results == [[f"T{i}"] for i in range(workers * 2)]
+    assert peak <= workers
+    assert all(name.startswith("yt-search") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_search_youtube_async_memoizes_by_normalized_key(monkeypatch):
+    try:
+        from backend.app.utils import youtube_search as ys  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.utils import youtube_search as ys  # type: ignore
+
+    calls = []
+
+    def fake_search(artists, title, track_duration_ms, prefer_extended=False, limit=15):
+        calls.append((artists, title, track_duration_ms))
+        if title == "Nothing":
+            return []
+        return [ys.ScoredResult(external_id="x1", title=title, url="u", channel=None, duration_sec=1, score=1.0)]
+
+    monkeypatch.setattr(ys, "search_youtube", fake_search)
+    monkeypatch.setenv("YOUTUBE_SEARCH_CACHE_TTL", "600")
+    ys.clear_search_cache()
+
+    first = await ys.search_youtube_async("Memo Artist", "Memo Song", 180400)
+    second = await ys.search_youtube_async("memo artist", "MEMO SONG", 180900)
+    assert first == second
+    assert len(calls) == 1
+
+    await ys.search_youtube_async("Memo Artist", "Memo Song", 180400, prefer_extended=True)
+    assert len(calls) == 2
+
+    await ys.search_youtube_async("Memo Artist", "Nothing", 1000)
+    await ys.search_youtube_async("Memo Artist", "Nothing", 1000)
+    assert len(calls) == 4
+
+    # Search settings are snapshotted: a change takes effect (as a new key) once the cache is cleared
+    key = ys._result_cache_key("Memo Artist", "Memo Song", 180400, False, 15)
+    monkeypatch.setenv("YOUTUBE_SEARCH_MIN_SCORE", "0.5")
+    assert ys._result_cache_key("Memo Artist", "Memo Song", 180400, False, 15) == key
+    await ys.search_youtube_async("Memo Artist", "Memo Song", 180400)
+    assert len(calls) == 4
+    ys.clear_search_cache()
+    assert ys._result_cache_key("Memo Artist", "Memo Song", 180400, False, 15) != key
+    await ys.search_youtube_async("Memo Artist", "Memo Song", 180400)
+    assert len(calls) == 5
+    ys.clear_search_cache()
+
+
+@pytest.mark.asyncio
+async def test_youtube_search_persist_merges_stored_youtube_candidates():
+    try:
+        from backend.app.db.session import async_session  # type: ignore
+        from backend.app.db.models.models import SearchCandidate, SearchProvider  # type: ignore
+    except Exception:  # pragma: no cover
+        from app.db.session import async_session  # type: ignore
+        from app.db.models.models import SearchCandidate, SearchProvider  # type: ignore
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        tid, _ = await _create_track(ac, title="Merge Song", artists="Merge Artist")
+        first = await ac.get(f"/api/v1/tracks/{tid}/youtube/search", params={"persist": True})
+        assert first.status_code == 200
+        stored = first.json()
+
+        async with async_session() as s:
+            s.add(SearchCandidate(track_id=tid, provider=SearchProvider.other, external_id="o1", url="u", title="Other", score=99.0))
+            await s.commit()
+
+        again = await ac.get(f"/api/v1/tracks/{tid}/youtube/search", params={"persist": True})
+        assert again.status_code == 200
+        data = again.json()
+    assert sorted(d["id"] for d in data) == sorted(d["id"] for d in stored)
+    assert all(d["provider"] == "youtube" for d in data)
+    assert [d["score"] for d in data] == sorted((d["score"] for d in data), reverse=True)
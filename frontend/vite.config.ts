@@ -1,6 +1,10 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Set API_UDS to the socket path the backend listens on (see run_api.py) to proxy
+// over a Unix domain socket instead of TCP loopback
+const apiSocket = process.env.API_UDS
+
 export default defineConfig({
   plugins: [react()],
   base: '/',
@@ -9,7 +13,7 @@ export default defineConfig({
     proxy: {
       // Proxy API requests to the FastAPI backend during dev
       '/api': {
-        target: 'http://localhost:8000',
+        target: apiSocket ? { host: 'localhost', port: 80, socketPath: apiSocket } : 'http://localhost:8000',
         changeOrigin: true,
       },
     },
@@ -24,15 +24,19 @@ if __name__ == "__main__":
   # Run uvicorn with reload and limit watch dirs to backend/app for stability
   log_level = os.environ.get("APP_LOG_LEVEL", "info").lower()
   log_config = get_uvicorn_log_config(log_level)
+  # API_UDS=/tmp/musicdl.sock listens on a Unix domain socket instead of host/port
+  uds = os.environ.get("API_UDS") or None
   run(
     "backend.app.main:app",
     host="0.0.0.0",
     port=8000,
+    uds=uds,
     reload=True,
     reload_dirs=[BACKEND_APP_DIR],
     log_level=log_level,
     log_config=log_config,
-    access_log=True,
+    # Same switch as the uvicorn CLI (UVICORN_ACCESS_LOG=false / --no-access-log)
+    access_log=os.environ.get("UVICORN_ACCESS_LOG", "true").lower() not in {"0", "false", "no", "off"},
     # Set the working directory so relative file paths (like music.db) resolve at repo root
     # Note: uvicorn's run() doesn't take cwd, but our sys.path/PYTHONPATH adjustments above suffice
   )